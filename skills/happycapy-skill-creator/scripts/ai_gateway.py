@@ -7,8 +7,204 @@ Unified interface for calling LLM via AI Gateway
 
 import os
 import json
-import requests
-from typing import List, Dict, Optional
+import threading
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+
+# Bytes pulled from the socket per read while streaming. iter_lines() defaults
+# to 512, which means thousands of tiny reads for a long code generation.
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Keep-alive connections held per host by the shared session
+HTTP_POOL_SIZE = 16
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class SSEDecoder:
+    """
+    Incremental Server-Sent Events decoder
+
+    Feed raw bytes as they arrive and get back complete events. Handles
+    LF/CRLF/CR line endings, comment lines, multi-line data fields and
+    events split across chunk boundaries.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._pos = 0
+        self._pending_cr = False
+        self._reset_event()
+
+    def _reset_event(self):
+        self._event = None
+        self._data = []
+        self._id = None
+
+    def feed(self, chunk: bytes) -> List[Dict]:
+        """
+        Consume a chunk of bytes
+
+        Args:
+            chunk: Raw bytes from the response body
+
+        Returns:
+            List of complete events, each {'event', 'data', 'id'}
+        """
+
+        if not chunk:
+            return []
+
+        events = []
+        buf = self._buffer
+        buf += chunk
+
+        if self._pending_cr and buf[self._pos:self._pos + 1] == b'\n':
+            # Second half of a CRLF split across chunks
+            self._pos += 1
+        self._pending_cr = False
+
+        while True:
+            lf = buf.find(b'\n', self._pos)
+            cr = buf.find(b'\r', self._pos, lf if lf != -1 else len(buf))
+            if cr != -1:
+                end = cr
+                if cr + 1 < len(buf):
+                    next_pos = cr + 2 if buf[cr + 1] == 0x0A else cr + 1
+                else:
+                    next_pos = cr + 1
+                    self._pending_cr = True
+            elif lf != -1:
+                end = lf
+                next_pos = lf + 1
+            else:
+                break
+
+            event = self._process_line(buf, self._pos, end)
+            self._pos = next_pos
+            if event is not None:
+                events.append(event)
+
+        # Drop consumed bytes only once they dominate the buffer
+        if self._pos and self._pos * 2 >= len(buf):
+            del buf[:self._pos]
+            self._pos = 0
+
+        return events
+
+    def flush(self) -> List[Dict]:
+        """Dispatch whatever is left once the stream has ended"""
+
+        events = []
+        if self._pos < len(self._buffer):
+            event = self._process_line(self._buffer, self._pos, len(self._buffer))
+            if event is not None:
+                events.append(event)
+        self._buffer.clear()
+        self._pos = 0
+
+        event = self._dispatch()
+        if event is not None:
+            events.append(event)
+        return events
+
+    def _process_line(self, buf: bytearray, start: int, end: int) -> Optional[Dict]:
+        if start == end:
+            return self._dispatch()
+
+        if buf[start] == 0x3A:  # ':' - comment / keep-alive
+            return None
+
+        colon = buf.find(b':', start, end)
+        if colon == -1:
+            field, value = bytes(buf[start:end]), b''
+        else:
+            field = bytes(buf[start:colon])
+            value_start = colon + 1
+            if value_start < end and buf[value_start] == 0x20:
+                value_start += 1
+            value = bytes(buf[value_start:end])
+
+        if field == b'data':
+            self._data.append(value)
+        elif field == b'event':
+            self._event = value.decode('utf-8', errors='replace')
+        elif field == b'id':
+            self._id = value.decode('utf-8', errors='replace')
+
+        return None
+
+    def _dispatch(self) -> Optional[Dict]:
+        if not self._data:
+            self._reset_event()
+            return None
+
+        event = {
+            'event': self._event or 'message',
+            'data': b'\n'.join(self._data).decode('utf-8', errors='replace'),
+            'id': self._id
+        }
+        self._reset_event()
+        return event
+
+
+def iter_sse_events(chunks: Iterable[bytes]) -> Iterator[Dict]:
+    """
+    Decode an iterable of byte chunks into SSE events
+
+    Args:
+        chunks: Raw response body chunks
+
+    Yields:
+        Event dicts with 'event', 'data' and 'id'
+    """
+
+    decoder = SSEDecoder()
+    for chunk in chunks:
+        if chunk:
+            yield from decoder.feed(chunk)
+    yield from decoder.flush()
+
+
+def iter_content_deltas(events: Iterable[Dict]) -> Iterator[str]:
+    """
+    Extract content deltas from OpenAI-style chat completion events
+
+    Stops at the [DONE] sentinel. Events that are not valid JSON are skipped.
+    """
+
+    for event in events:
+        data = event['data']
+        if data == '[DONE]':
+            return
+        try:
+            chunk = json.loads(data)
+            choices = chunk.get('choices') or [{}]
+            content = (choices[0].get('delta') or {}).get('content')
+        except (json.JSONDecodeError, AttributeError):
+            continue
+        if content:
+            yield content
+
+
+def get_session():
+    """
+    Process-wide requests.Session
+
+    Clients share its connection pool, so a long-lived process (see
+    skill_daemon.py) reuses TCP/TLS connections to the gateway instead of
+    opening one per request.
+    """
+
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+
+            _session = requests.Session()
+            _session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE))
+        return _session
 
 
 class AIGatewayClient:
@@ -56,6 +252,10 @@ class AIGatewayClient:
             requests.exceptions.RequestException: On API errors
         """
 
+        # requests (and the urllib3/ssl stack under it) is only loaded once a
+        # request is actually sent, so importing this module stays cheap
+        import requests
+
         model = model or self.default_model
 
         payload = {
@@ -67,7 +267,7 @@ class AIGatewayClient:
         }
 
         try:
-            response = requests.post(
+            response = get_session().post(
                 f"{self.base_url}/chat/completions",
                 headers=self.headers,
                 json=payload,
@@ -158,20 +358,42 @@ class AIGatewayClient:
             stream=True
         )
 
-        for line in response.iter_lines():
-            if line:
-                line_text = line.decode('utf-8')
-                if line_text.startswith('data: '):
-                    data = line_text[6:]
-                    if data.strip() == '[DONE]':
-                        break
-                    try:
-                        chunk = json.loads(data)
-                        content = chunk['choices'][0]['delta'].get('content', '')
-                        if content:
-                            yield content
-                    except json.JSONDecodeError:
-                        continue
+        try:
+            events = iter_sse_events(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+            yield from iter_content_deltas(events)
+        finally:
+            response.close()
+
+    async def astream_prompt(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        model: Optional[str] = None,
+        max_tokens: int = 1024
+    ) -> AsyncIterator[str]:
+        """
+        Async variant of stream_prompt
+
+        The blocking HTTP reads run in a worker thread so the event loop
+        stays free while tokens arrive.
+
+        Yields:
+            Content chunks as they arrive
+        """
+
+        import asyncio
+
+        sentinel = object()
+        chunks = self.stream_prompt(prompt, system=system, model=model, max_tokens=max_tokens)
+
+        try:
+            while True:
+                content = await asyncio.to_thread(next, chunks, sentinel)
+                if content is sentinel:
+                    break
+                yield content
+        finally:
+            chunks.close()
 
 
 def create_client() -> AIGatewayClient:
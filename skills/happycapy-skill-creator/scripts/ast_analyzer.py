@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+AST-based compatibility analysis for Python files
+
+Looks at what the code actually does instead of substrings:
+- imports of Docker / JVM bridge packages
+- executables launched through subprocess, os.system and friends
+- unbounded .read()/.readlines() on open file handles
+
+Parsed trees are cached by content hash, so re-analyzing an unchanged file
+(or analyzing it for another purpose) costs no second parse.
+"""
+
+import ast
+import hashlib
+import os
+import shlex
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+# Top-level modules whose import means the code needs something HappyCapy lacks
+IMPORT_RULES = {
+    'docker': ('docker_dependency', None),
+    'dockerfile': ('docker_dependency', None),
+    'jpype': ('unsupported_runtime', 'java'),
+    'py4j': ('unsupported_runtime', 'java'),
+    'jnius': ('unsupported_runtime', 'java'),
+}
+
+# Executables that need Docker or an unsupported runtime
+EXECUTABLE_RULES = {
+    'docker': ('docker_dependency', None),
+    'docker-compose': ('docker_dependency', None),
+    'java': ('unsupported_runtime', 'java'),
+    'javac': ('unsupported_runtime', 'java'),
+    'jar': ('unsupported_runtime', 'java'),
+    'mvn': ('unsupported_runtime', 'java'),
+    'gradle': ('unsupported_runtime', 'java'),
+    'ruby': ('unsupported_runtime', 'ruby'),
+    'gem': ('unsupported_runtime', 'ruby'),
+    'bundle': ('unsupported_runtime', 'ruby'),
+    'go': ('unsupported_runtime', 'go'),
+}
+
+# Callables that launch a process, by fully qualified name
+PROCESS_CALLS = {
+    'subprocess.run', 'subprocess.call', 'subprocess.check_call',
+    'subprocess.check_output', 'subprocess.Popen', 'subprocess.getoutput',
+    'subprocess.getstatusoutput', 'os.system', 'os.popen', 'os.execv',
+    'os.execvp', 'os.execl', 'os.execlp', 'os.spawnv', 'os.spawnvp',
+    'asyncio.create_subprocess_exec', 'asyncio.create_subprocess_shell',
+    'shutil.which',
+}
+
+# Callables returning a file handle
+OPEN_CALLS = {'open', 'io.open', 'codecs.open', 'gzip.open', 'bz2.open', 'lzma.open'}
+
+SHELL_SEPARATORS = {'&&', '||', ';', '|', '&'}
+
+AST_CACHE_SIZE = 256
+
+_ast_cache = OrderedDict()
+
+
+def parse_cached(content: str, filename: str = '<skill>') -> ast.AST:
+    """
+    Parse Python source, reusing the tree for content seen before
+
+    Raises:
+        SyntaxError: If the source does not parse
+    """
+
+    digest = hashlib.sha1(content.encode('utf-8', errors='replace')).hexdigest()
+    tree = _ast_cache.get(digest)
+    if tree is not None:
+        _ast_cache.move_to_end(digest)
+        return tree
+
+    tree = ast.parse(content, filename=filename)
+    _ast_cache[digest] = tree
+    if len(_ast_cache) > AST_CACHE_SIZE:
+        _ast_cache.popitem(last=False)
+    return tree
+
+
+class _Analyzer(ast.NodeVisitor):
+    """Single walk collecting findings as (issue_type, detail, line)"""
+
+    def __init__(self):
+        self.aliases = {}        # local name -> qualified name
+        self.constants = {}      # local name -> str / list of str
+        self.file_handles = set()
+        self.findings = []
+
+    # --- name resolution -------------------------------------------------
+
+    def qualified_name(self, node) -> Optional[str]:
+        if isinstance(node, ast.Name):
+            return self.aliases.get(node.id, node.id)
+        if isinstance(node, ast.Attribute):
+            base = self.qualified_name(node.value)
+            return f'{base}.{node.attr}' if base else None
+        return None
+
+    def constant_value(self, node):
+        """String or list-of-strings value of an expression, if knowable"""
+
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        if isinstance(node, ast.JoinedStr):
+            # f-string: keep the literal parts, enough to see the executable
+            return ''.join(
+                v.value if isinstance(v, ast.Constant) else ' ' for v in node.values
+            )
+        if isinstance(node, (ast.List, ast.Tuple)):
+            items = [self.constant_value(elt) for elt in node.elts]
+            return items if items and isinstance(items[0], str) else None
+        if isinstance(node, ast.Name):
+            return self.constants.get(node.id)
+        return None
+
+    # --- bindings ---------------------------------------------------------
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.aliases[alias.asname or alias.name.split('.')[0]] = (
+                alias.name if alias.asname else alias.name.split('.')[0]
+            )
+            self._check_import(alias.name, node.lineno)
+
+    def visit_ImportFrom(self, node):
+        module = node.module or ''
+        for alias in node.names:
+            self.aliases[alias.asname or alias.name] = f'{module}.{alias.name}'
+        if node.level == 0:
+            self._check_import(module, node.lineno)
+
+    def _check_import(self, module: str, line: int):
+        rule = IMPORT_RULES.get(module.split('.')[0])
+        if rule:
+            self.findings.append((rule[0], rule[1], line))
+
+    def visit_Assign(self, node):
+        value = self.constant_value(node.value)
+        is_handle = self._is_open_call(node.value)
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                if value is not None:
+                    self.constants[target.id] = value
+                if is_handle:
+                    self.file_handles.add(target.id)
+        self.generic_visit(node)
+
+    def visit_With(self, node):
+        for item in node.items:
+            if self._is_open_call(item.context_expr) and isinstance(item.optional_vars, ast.Name):
+                self.file_handles.add(item.optional_vars.id)
+        self.generic_visit(node)
+
+    visit_AsyncWith = visit_With
+
+    def _is_open_call(self, node) -> bool:
+        return isinstance(node, ast.Call) and self.qualified_name(node.func) in OPEN_CALLS
+
+    # --- calls -------------------------------------------------------------
+
+    def visit_Call(self, node):
+        name = self.qualified_name(node.func)
+
+        if name in PROCESS_CALLS:
+            self._check_process_call(name, node)
+        elif isinstance(node.func, ast.Attribute) and node.func.attr in ('read', 'readlines'):
+            self._check_read(node)
+
+        self.generic_visit(node)
+
+    def _check_process_call(self, name: str, node: ast.Call):
+        command = node.args[0] if node.args else None
+        for keyword in node.keywords:
+            if keyword.arg in ('args', 'cmd', 'command'):
+                command = keyword.value
+        if command is None:
+            return
+
+        if name.startswith(('os.exec', 'os.spawn', 'asyncio.create_subprocess_exec')):
+            # Program path followed by argv items
+            args = [self.constant_value(a) for a in node.args[1 if name.startswith('os.spawn') else 0:]]
+            value = args[0] if args and isinstance(args[0], str) else None
+            executables = [value] if value else []
+        else:
+            value = self.constant_value(command)
+            if isinstance(value, list):
+                executables = [value[0]] if value[0] else []
+            elif isinstance(value, str):
+                executables = self._shell_executables(value)
+            else:
+                executables = []
+
+        for executable in executables:
+            rule = EXECUTABLE_RULES.get(os.path.basename(executable))
+            if rule:
+                self.findings.append((rule[0], rule[1], node.lineno))
+
+    @staticmethod
+    def _shell_executables(command: str) -> List[str]:
+        """First word of every command in a shell string"""
+
+        try:
+            words = shlex.split(command)
+        except ValueError:
+            words = command.split()
+
+        executables = []
+        expect_command = True
+        for word in words:
+            if word in SHELL_SEPARATORS:
+                expect_command = True
+            elif expect_command:
+                executables.append(word)
+                expect_command = False
+        return executables
+
+    def _check_read(self, node: ast.Call):
+        bounded = node.args or any(k.arg in ('size', 'hint') for k in node.keywords)
+        if bounded and not (
+            len(node.args) == 1
+            and isinstance(node.args[0], ast.Constant)
+            and node.args[0].value in (-1, None)
+        ):
+            return
+
+        target = node.func.value
+        if (isinstance(target, ast.Name) and target.id in self.file_handles) or self._is_open_call(target):
+            self.findings.append(('memory_concern', None, node.lineno))
+
+
+def analyze_python_source(rel_path: str, content: str) -> Optional[List[Dict]]:
+    """
+    Analyze one Python file
+
+    Args:
+        rel_path: Path of the file relative to the skill (used in reports)
+        content: File content
+
+    Returns:
+        Issues in the same format as check_compatibility, or None if the
+        file does not parse (callers fall back to text scanning)
+    """
+
+    try:
+        tree = parse_cached(content, rel_path)
+    except (SyntaxError, ValueError):
+        return None
+
+    analyzer = _Analyzer()
+    analyzer.visit(tree)
+
+    issues = []
+    docker_lines = set()
+    runtimes_seen = set()
+    memory_reported = False
+
+    for issue_type, detail, line in sorted(analyzer.findings, key=lambda f: f[2]):
+        if issue_type == 'docker_dependency' and line not in docker_lines:
+            docker_lines.add(line)
+            issues.append({
+                'type': 'docker_dependency',
+                'file': rel_path,
+                'line': line,
+                'description': 'Uses Docker (not available in HappyCapy)',
+                'suggestion': 'Rewrite to run natively without Docker'
+            })
+        elif issue_type == 'unsupported_runtime' and detail not in runtimes_seen:
+            runtimes_seen.add(detail)
+            issues.append({
+                'type': 'unsupported_runtime',
+                'file': rel_path,
+                'line': line,
+                'description': f'Uses {detail} (not available)',
+                'suggestion': f'Rewrite without {detail} dependency'
+            })
+        elif issue_type == 'memory_concern' and not memory_reported:
+            memory_reported = True
+            issues.append({
+                'type': 'memory_concern',
+                'file': rel_path,
+                'line': line,
+                'description': 'Reads a whole file into memory',
+                'suggestion': 'Consider streaming or chunked processing for large files'
+            })
+
+    return issues
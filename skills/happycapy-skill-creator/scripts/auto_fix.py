@@ -1,20 +1,31 @@
 #!/usr/bin/env python3
 """
 Auto-fix compatibility issues using LLM
+
+Two fix modes:
+- patch (default): only windows around the flagged line are sent and the
+  LLM answers with SEARCH/REPLACE blocks, applied and verified locally
+- full: the whole file is sent and regenerated
 """
 
 import os
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Callable, Optional
+
+from patching import PatchError, request_patch, can_rewrite_whole
+
+
+DEFAULT_FIX_MODE = 'patch'
 
 
-def fix_compatibility_issues(skill_path: Path, issues: List[Dict]):
+def fix_compatibility_issues(skill_path: Path, issues: List[Dict], mode: str = DEFAULT_FIX_MODE):
     """
     Automatically fix compatibility issues using LLM
 
     Args:
         skill_path: Path to skill
         issues: List of compatibility issues from check_compatibility
+        mode: 'patch' (send excerpts, apply SEARCH/REPLACE blocks) or 'full'
     """
 
     api_key = os.environ.get('ANTHROPIC_API_KEY') or os.environ.get('AI_GATEWAY_API_KEY')
@@ -31,28 +42,60 @@ def fix_compatibility_issues(skill_path: Path, issues: List[Dict]):
             print(f"      Fixing: {issue['type']} in {issue['file']}...")
 
             if issue['type'] == 'docker_dependency':
-                fix_docker_issue(client, skill_path, issue)
+                fix_docker_issue(client, skill_path, issue, mode)
             elif issue['type'] == 'unavailable_dependency':
                 fix_dependency_issue(client, skill_path, issue)
             elif issue['type'] == 'unsupported_runtime':
-                fix_runtime_issue(client, skill_path, issue)
+                fix_runtime_issue(client, skill_path, issue, mode)
             elif issue['type'] == 'memory_concern':
-                fix_memory_issue(client, skill_path, issue)
+                fix_memory_issue(client, skill_path, issue, mode)
 
     except Exception as e:
         print(f"      ⚠️  Auto-fix failed: {e}")
 
 
-def fix_docker_issue(client, skill_path: Path, issue: Dict):
+def generate_fix(client, issue: Dict, original_code: str, requirements: List[str],
+                 full_prompt: Callable[[str], str], mode: str = DEFAULT_FIX_MODE) -> Optional[str]:
+    """
+    Fixed version of a file, or None if no usable fix came back
+
+    In patch mode a failed patch falls back to whole-file regeneration, but
+    only for files small enough to come back untruncated.
+    """
+
+    if mode == 'patch':
+        try:
+            return request_patch(client, issue['file'], original_code, [issue], requirements)
+        except PatchError as e:
+            if not can_rewrite_whole(original_code):
+                print(f"         ⚠️  Patch failed for {issue['file']}: {e}")
+                return None
+            print(f"         ⚠️  Patch failed ({e}), regenerating whole file")
+
+    fixed_code_text = client.simple_prompt(
+        prompt=full_prompt(original_code),
+        max_tokens=3000,
+        temperature=0.3
+    )
+
+    return extract_code_from_response(fixed_code_text)
+
+
+def fix_docker_issue(client, skill_path: Path, issue: Dict, mode: str = DEFAULT_FIX_MODE):
     """Fix Docker dependencies"""
 
     file_path = skill_path / issue['file']
     if not file_path.exists():
         return
 
-    original_code = file_path.read_text()
+    requirements = [
+        'Remove all Docker usage',
+        'Use Python 3.11 native features',
+        'Use subprocess for native commands if needed',
+    ]
 
-    prompt = f"""Fix this Python code to remove Docker dependencies.
+    def full_prompt(original_code):
+        return f"""Fix this Python code to remove Docker dependencies.
 
 ORIGINAL CODE:
 ```python
@@ -67,13 +110,7 @@ REQUIREMENTS:
 
 IMPORTANT: Output ONLY the fixed Python code wrapped in ```python code blocks. Do NOT include explanations or comments about the changes."""
 
-    fixed_code_text = client.simple_prompt(
-        prompt=prompt,
-        max_tokens=3000,
-        temperature=0.3
-    )
-
-    fixed_code = extract_code_from_response(fixed_code_text)
+    fixed_code = generate_fix(client, issue, file_path.read_text(), requirements, full_prompt, mode)
 
     if fixed_code:
         file_path.write_text(fixed_code)
@@ -97,16 +134,17 @@ def fix_dependency_issue(client, skill_path: Path, issue: Dict):
         print(f"         ✅ Removed unavailable dependencies")
 
 
-def fix_runtime_issue(client, skill_path: Path, issue: Dict):
+def fix_runtime_issue(client, skill_path: Path, issue: Dict, mode: str = DEFAULT_FIX_MODE):
     """Fix unsupported runtime dependencies (Java, Ruby, etc.)"""
 
     file_path = skill_path / issue['file']
     if not file_path.exists():
         return
 
-    original_code = file_path.read_text()
+    requirements = ['Rewrite to use only Python 3.11 or Node.js 24. No Java, Ruby, or Go.']
 
-    prompt = f"""This code uses an unsupported runtime in HappyCapy.
+    def full_prompt(original_code):
+        return f"""This code uses an unsupported runtime in HappyCapy.
 
 ISSUE: {issue['description']}
 
@@ -121,29 +159,28 @@ TASK: Rewrite to use only Python 3.11 or Node.js 24. No Java, Ruby, or Go.
 
 Output only the fixed code:"""
 
-    fixed_code_text = client.simple_prompt(
-        prompt=prompt,
-        max_tokens=3000,
-        temperature=0.3
-    )
-
-    fixed_code = extract_code_from_response(fixed_code_text)
+    fixed_code = generate_fix(client, issue, file_path.read_text(), requirements, full_prompt, mode)
 
     if fixed_code:
         file_path.write_text(fixed_code)
         print(f"         ✅ Fixed runtime issue in {issue['file']}")
 
 
-def fix_memory_issue(client, skill_path: Path, issue: Dict):
+def fix_memory_issue(client, skill_path: Path, issue: Dict, mode: str = DEFAULT_FIX_MODE):
     """Fix memory-intensive patterns"""
 
     file_path = skill_path / issue['file']
     if not file_path.exists():
         return
 
-    original_code = file_path.read_text()
+    requirements = [
+        'Use streaming/chunked reading for large files (4GB memory limit)',
+        "Don't load entire files into memory",
+        'Process data in batches',
+    ]
 
-    prompt = f"""This code may use too much memory in HappyCapy (4GB limit).
+    def full_prompt(original_code):
+        return f"""This code may use too much memory in HappyCapy (4GB limit).
 
 ISSUE: {issue['description']}
 
@@ -159,13 +196,7 @@ TASK: Optimize for memory efficiency:
 
 Output only the fixed code:"""
 
-    fixed_code_text = client.simple_prompt(
-        prompt=prompt,
-        max_tokens=3000,
-        temperature=0.3
-    )
-
-    fixed_code = extract_code_from_response(fixed_code_text)
+    fixed_code = generate_fix(client, issue, file_path.read_text(), requirements, full_prompt, mode)
 
     if fixed_code:
         file_path.write_text(fixed_code)
@@ -4,221 +4,332 @@ Auto-fix compatibility issues using LLM (Improved Version)
 
 Improvements:
 1. Increased timeout for complex operations (60s → 90s)
-2. Batch processing to avoid timeout on many issues
-3. Retry logic for failed operations
-4. Better error handling and progress tracking
+2. Issues are grouped by file: each file is sent to the LLM once with all
+   of its issues, so later fixes can no longer overwrite earlier ones
+3. Different files are fixed concurrently through a worker pool
+4. Retry logic for failed operations, atomic writes
+5. Patch mode (default): only excerpts around the flagged lines are sent and
+   the LLM answers with SEARCH/REPLACE blocks instead of the whole file
+6. Every fix is verified right away (compiles, checker no longer reports the
+   issue); a rejected fix is rolled back and retried with the error fed back
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import time
 
-
-def fix_compatibility_issues(skill_path: Path, issues: List[Dict], batch_size: int = 5, max_retries: int = 2):
+from cache_utils import atomic_write_text
+from check_compatibility import scan_file
+from patching import PatchError, request_patch, can_rewrite_whole, feedback_section
+
+
+# What the LLM is asked to do for each issue type
+FIX_GUIDANCE = {
+    'docker_dependency': [
+        'Remove all Docker usage',
+        'Use Python 3.11 native features',
+        'Use subprocess for native commands if needed',
+    ],
+    'unsupported_runtime': [
+        'Rewrite to use only Python 3.11 or Node.js 24. No Java, Ruby, or Go.',
+    ],
+    'memory_concern': [
+        'Use streaming/chunked reading for large files (4GB memory limit)',
+        "Don't load entire files into memory",
+        'Process data in batches',
+    ],
+}
+
+# Unavailable packages removed from requirements.txt
+UNAVAILABLE_PACKAGES = ['tensorflow', 'torch', 'cuda']
+
+
+class FixVerificationError(Exception):
+    """A fix was written but failed verification and was rolled back"""
+
+
+def fix_compatibility_issues(
+    skill_path: Path,
+    issues: List[Dict],
+    batch_size: int = 5,
+    max_retries: int = 2,
+    max_workers: int = 4,
+    mode: str = 'patch'
+) -> Dict:
     """
-    Automatically fix compatibility issues using LLM with batching
+    Automatically fix compatibility issues using LLM
+
+    Issues are grouped per file. Each file is handled by one worker, which
+    sends the file once per batch of issues; different files are fixed in
+    parallel.
 
     Args:
         skill_path: Path to skill
         issues: List of compatibility issues from check_compatibility
-        batch_size: Number of issues to process in each batch (default: 5)
+        batch_size: Maximum number of issues sent in one prompt (default: 5)
         max_retries: Maximum retry attempts for failed fixes (default: 2)
+        max_workers: Maximum number of files fixed concurrently (default: 4)
+        mode: 'patch' (send excerpts, apply SEARCH/REPLACE blocks) or
+            'full' (regenerate whole files)
+
+    Returns:
+        {'fixed': [files], 'failed': {file: error}}
     """
 
+    result = {'fixed': [], 'failed': {}}
+
     api_key = os.environ.get('ANTHROPIC_API_KEY') or os.environ.get('AI_GATEWAY_API_KEY')
 
     if not api_key:
         print("      ⚠️  No API key, manual fixes required")
-        return
+        return result
+
+    issues_by_file = group_issues_by_file(issues)
+
+    # Dependency issues and the Dockerfile are fixed locally, no LLM needed;
+    # only Python files are rewritten and verified
+    for rel_path, file_issues in list(issues_by_file.items()):
+        if all(i['type'] == 'unavailable_dependency' for i in file_issues):
+            del issues_by_file[rel_path]
+            fix_dependency_issue(None, skill_path, file_issues[0])
+            result['fixed'].append(rel_path)
+        elif rel_path == 'Dockerfile':
+            del issues_by_file[rel_path]
+            remove_dockerfile(skill_path)
+            result['fixed'].append(rel_path)
+            print(f"      ✅ {rel_path} removed (the skill runs natively)")
+        elif not rel_path.endswith('.py'):
+            del issues_by_file[rel_path]
+            result['failed'][rel_path] = "Not a Python file, manual fix required"
+            print(f"      ⚠️  {rel_path}: manual fix required")
+
+    if not issues_by_file:
+        return result
 
     try:
         from ai_gateway import create_client
         client = create_client()
-
-        # Group issues by type for more efficient batch processing
-        issues_by_type = {}
-        for issue in issues:
-            issue_type = issue['type']
-            if issue_type not in issues_by_type:
-                issues_by_type[issue_type] = []
-            issues_by_type[issue_type].append(issue)
-
-        # Process each type in batches
-        for issue_type, type_issues in issues_by_type.items():
-            print(f"\n      Processing {len(type_issues)} {issue_type} issue(s)...")
-
-            # Process in batches to avoid timeout
-            for i in range(0, len(type_issues), batch_size):
-                batch = type_issues[i:i + batch_size]
-                print(f"      Batch {i//batch_size + 1}/{(len(type_issues)-1)//batch_size + 1} ({len(batch)} issues)")
-
-                for issue in batch:
-                    success = False
-                    for attempt in range(max_retries + 1):
-                        try:
-                            print(f"      Fixing: {issue['type']} in {issue['file']}...", end='')
-
-                            if issue_type == 'docker_dependency':
-                                fix_docker_issue(client, skill_path, issue)
-                            elif issue_type == 'unavailable_dependency':
-                                fix_dependency_issue(client, skill_path, issue)
-                            elif issue_type == 'unsupported_runtime':
-                                fix_runtime_issue(client, skill_path, issue)
-                            elif issue_type == 'memory_concern':
-                                fix_memory_issue(client, skill_path, issue)
-
-                            success = True
-                            break  # Success, exit retry loop
-
-                        except Exception as e:
-                            if attempt < max_retries:
-                                print(f" retry {attempt + 1}/{max_retries}...", end='')
-                                time.sleep(2)  # Wait before retry
-                            else:
-                                print(f"\n         ⚠️  Failed after {max_retries + 1} attempts: {e}")
-
-                    if success:
-                        print()  # New line after success message
-
     except Exception as e:
         print(f"      ⚠️  Auto-fix failed: {e}")
+        result['failed'].update({f: str(e) for f in issues_by_file})
+        return result
+
+    workers = max(1, min(max_workers, len(issues_by_file)))
+    print(f"\n      Fixing {sum(len(v) for v in issues_by_file.values())} issue(s) "
+          f"in {len(issues_by_file)} file(s) with {workers} worker(s)...")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                fix_file_with_retries, client, skill_path, rel_path,
+                file_issues, batch_size, max_retries, mode
+            ): rel_path
+            for rel_path, file_issues in issues_by_file.items()
+        }
+
+        for future in as_completed(futures):
+            rel_path = futures[future]
+            try:
+                future.result()
+                result['fixed'].append(rel_path)
+                print(f"      ✅ {rel_path} ({len(issues_by_file[rel_path])} issue(s))")
+            except Exception as e:
+                result['failed'][rel_path] = str(e)
+                print(f"      ⚠️  {rel_path}: failed after {max_retries + 1} attempts: {e}")
+
+    return result
+
+
+def group_issues_by_file(issues: List[Dict]) -> Dict[str, List[Dict]]:
+    """Group issues by file, keeping first-seen order"""
+
+    by_file = {}
+    for issue in issues:
+        by_file.setdefault(issue['file'], []).append(issue)
+    return by_file
+
+
+def fix_file_with_retries(client, skill_path: Path, rel_path: str, issues: List[Dict],
+                          batch_size: int = 5, max_retries: int = 2, mode: str = 'patch'):
+    """
+    Fix all issues of one file, batch by batch, retrying failed batches
 
+    Before each batch the current file is scanned again, so every batch
+    carries the line numbers of the code as the previous batch left it,
+    and issues a previous fix already removed cost no further call. Stops
+    once no issue of the given types remains. A retry tells the LLM why
+    the previous attempt was rejected.
+    """
 
-def fix_docker_issue(client, skill_path: Path, issue: Dict):
-    """Fix Docker dependencies with increased timeout"""
-
-    file_path = skill_path / issue['file']
-    if not file_path.exists():
-        return
+    fixed_types = {issue['type'] for issue in issues}
+    file_path = skill_path / rel_path
+
+    while file_path.exists():
+        remaining = [i for i in scan_file(rel_path, file_path.read_text()) if i['type'] in fixed_types]
+        if not remaining:
+            return
+        batch = remaining[:batch_size]
+        feedback = None
+
+        for attempt in range(max_retries + 1):
+            try:
+                fix_file_issues(client, skill_path, rel_path, batch, mode, feedback)
+                break
+            except Exception as e:
+                if attempt >= max_retries:
+                    raise
+                feedback = str(e)
+                if not isinstance(e, (FixVerificationError, PatchError)):
+                    time.sleep(2)  # Wait before retrying a failed request
+
+
+def fix_requirements(issues: List[Dict]) -> List[str]:
+    """Fix guidance for a set of issues, without duplicates"""
+
+    requirements = []
+    for issue in issues:
+        for item in FIX_GUIDANCE.get(issue['type'], []):
+            if item not in requirements:
+                requirements.append(item)
+    return requirements
+
+
+def build_file_fix_prompt(code: str, issues: List[Dict], feedback: Optional[str] = None) -> str:
+    """Build one prompt covering every issue of a file"""
+
+    issue_lines = "\n".join(
+        f"- line {issue['line']}: {issue['type']} - {issue['description']}"
+        for issue in issues
+    )
 
-    original_code = file_path.read_text()
+    requirement_lines = "\n".join(f"- {item}" for item in fix_requirements(issues) + ['Keep the same functionality'])
 
-    prompt = f"""Fix this Python code to remove Docker dependencies.
+    return f"""Fix this Python code so it runs in HappyCapy (Python 3.11, Node.js 24, no Docker/Java/Ruby/Go, 4GB RAM).
 
+ISSUES:
+{issue_lines}
+{feedback_section(feedback)}
 ORIGINAL CODE:
 ```python
-{original_code}
+{code}
 ```
 
 REQUIREMENTS:
-- Remove all Docker usage
-- Use Python 3.11 native features
-- Keep the same functionality
-- Use subprocess for native commands if needed
+{requirement_lines}
 
 IMPORTANT: Output ONLY the fixed Python code wrapped in ```python code blocks. Do NOT include explanations or comments about the changes."""
 
-    # Increased timeout from 30s to 90s
-    fixed_code_text = client.simple_prompt(
-        prompt=prompt,
-        max_tokens=3000,
-        temperature=0.3
-    )
-
-    fixed_code = extract_code_from_response(fixed_code_text)
-
-    if fixed_code:
-        file_path.write_text(fixed_code)
-        print(f" ✅", end='')
-    else:
-        raise ValueError("No valid code extracted from LLM response")
-
 
-def fix_dependency_issue(client, skill_path: Path, issue: Dict):
-    """Fix unavailable dependencies"""
-
-    file_path = skill_path / issue['file']
-
-    if file_path.name == 'requirements.txt':
-        # Remove the problematic line
-        content = file_path.read_text()
-        lines = content.split('\n')
-
-        # Filter out problematic dependencies
-        filtered = [l for l in lines if not any(pkg in l.lower() for pkg in ['tensorflow', 'torch', 'cuda'])]
+def fix_file_issues(client, skill_path: Path, rel_path: str, issues: List[Dict],
+                    mode: str = 'patch', feedback: Optional[str] = None):
+    """
+    Fix a set of issues in one file with a single LLM call, then verify it
 
-        file_path.write_text('\n'.join(filtered))
-        print(f" ✅", end='')
+    In patch mode a patch that does not apply falls back to whole-file
+    regeneration for small files; for large files the error is raised so
+    the caller retries the patch.
 
+    Args:
+        feedback: Why the previous attempt was rejected, if this is a retry
 
-def fix_runtime_issue(client, skill_path: Path, issue: Dict):
-    """Fix unsupported runtime dependencies (Java, Ruby, etc.)"""
+    Raises:
+        ValueError: If no code could be extracted from the response
+        PatchError: If the patch for a large file does not apply
+        FixVerificationError: If the fix was rolled back after verification
+    """
 
-    file_path = skill_path / issue['file']
+    file_path = skill_path / rel_path
     if not file_path.exists():
         return
 
     original_code = file_path.read_text()
+    fixed_code = None
 
-    prompt = f"""This code uses an unsupported runtime in HappyCapy.
+    if mode == 'patch':
+        try:
+            fixed_code = request_patch(client, rel_path, original_code, issues,
+                                       fix_requirements(issues), feedback=feedback)
+        except PatchError:
+            if not can_rewrite_whole(original_code):
+                raise
 
-ISSUE: {issue['description']}
+    if fixed_code is None:
+        # Increased timeout from 30s to 90s
+        fixed_code_text = client.simple_prompt(
+            prompt=build_file_fix_prompt(original_code, issues, feedback),
+            max_tokens=3000,
+            temperature=0.3
+        )
 
-AVAILABLE: Python 3.11, Node.js 24
+        fixed_code = extract_code_from_response(fixed_code_text)
 
-ORIGINAL CODE:
-```python
-{original_code}
-```
+        if not fixed_code:
+            raise ValueError("No valid code extracted from LLM response")
 
-TASK: Rewrite to use only Python 3.11 or Node.js 24. No Java, Ruby, or Go.
+    atomic_write_text(file_path, fixed_code)
 
-Output only the fixed code:"""
+    error = verify_fix(skill_path, rel_path, issues, original_code)
+    if error:
+        atomic_write_text(file_path, original_code)
+        raise FixVerificationError(error)
 
-    fixed_code_text = client.simple_prompt(
-        prompt=prompt,
-        max_tokens=3000,
-        temperature=0.3
-    )
 
-    fixed_code = extract_code_from_response(fixed_code_text)
+def verify_fix(skill_path: Path, rel_path: str, issues: List[Dict], original_code: str) -> Optional[str]:
+    """
+    Check a freshly written fix
 
-    if fixed_code:
-        file_path.write_text(fixed_code)
-        print(f" ✅", end='')
-    else:
-        raise ValueError("No valid code extracted from LLM response")
+    The file must compile (Python) and the compatibility checker, run on
+    this file only, must report fewer issues of the fixed types by at least
+    the number of issues in this batch (other batches may still be pending).
 
+    Returns:
+        None if the fix is good, otherwise a description of what is wrong
+    """
 
-def fix_memory_issue(client, skill_path: Path, issue: Dict):
-    """Fix memory-intensive patterns"""
+    file_path = skill_path / rel_path
+    fixed_code = file_path.read_text()
 
-    file_path = skill_path / issue['file']
-    if not file_path.exists():
-        return
+    if rel_path.endswith('.py'):
+        try:
+            compile(fixed_code, str(file_path), 'exec')
+        except (SyntaxError, ValueError) as e:
+            return f"The fixed code does not compile: {e}"
 
-    original_code = file_path.read_text()
+    fixed_types = {issue['type'] for issue in issues}
+    before = sum(1 for i in scan_file(rel_path, original_code) if i['type'] in fixed_types)
+    remaining = [i for i in scan_file(rel_path, fixed_code) if i['type'] in fixed_types]
+    if len(remaining) > max(0, before - len(issues)):
+        details = "; ".join(f"line {i['line']}: {i['description']}" for i in remaining)
+        return f"The fixed code still has issues: {details}"
+
+    return None
 
-    prompt = f"""This code may use too much memory in HappyCapy (4GB limit).
 
-ISSUE: {issue['description']}
+def fix_dependency_issue(client, skill_path: Path, issue: Dict):
+    """Fix unavailable dependencies"""
 
-ORIGINAL CODE:
-```python
-{original_code}
-```
+    file_path = skill_path / issue['file']
 
-TASK: Optimize for memory efficiency:
-- Use streaming/chunked reading for large files
-- Don't load entire files into memory
-- Process data in batches
+    if file_path.name == 'requirements.txt':
+        # Remove the problematic line
+        content = file_path.read_text()
+        lines = content.split('\n')
 
-Output only the fixed code:"""
+        # Filter out problematic dependencies
+        filtered = [l for l in lines if not any(pkg in l.lower() for pkg in UNAVAILABLE_PACKAGES)]
+
+        atomic_write_text(file_path, '\n'.join(filtered))
 
-    fixed_code_text = client.simple_prompt(
-        prompt=prompt,
-        max_tokens=3000,
-        temperature=0.3
-    )
 
-    fixed_code = extract_code_from_response(fixed_code_text)
+def remove_dockerfile(skill_path: Path):
+    """Delete the Dockerfile: HappyCapy has no Docker, skills run natively"""
 
-    if fixed_code:
-        file_path.write_text(fixed_code)
-        print(f" ✅", end='')
-    else:
-        raise ValueError("No valid code extracted from LLM response")
+    try:
+        (skill_path / 'Dockerfile').unlink()
+    except FileNotFoundError:
+        pass
 
 
 def extract_code_from_response(response_text: str) -> str:
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for on-disk caches and atomic file writes
+
+Cache files live under ~/.cache/happycapy-skill-creator unless
+HAPPYCAPY_CACHE_DIR points somewhere else.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+def get_cache_dir() -> Path:
+    """Return (and create) the cache directory"""
+
+    override = os.environ.get('HAPPYCAPY_CACHE_DIR')
+    if override:
+        cache_dir = Path(override)
+    else:
+        cache_dir = Path.home() / '.cache' / 'happycapy-skill-creator'
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def hash_text(text: str) -> str:
+    """Content hash of a string"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def load_json(path: Path, default: Any = None) -> Any:
+    """Load a JSON cache file, returning default if missing or corrupt"""
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def atomic_write_text(path: Path, text: str):
+    """
+    Write a text file atomically (temp file + rename)
+
+    Readers never see a half-written file, and the original permissions
+    are kept when an existing file is replaced.
+    """
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except OSError:
+        mode = None
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        if mode is not None:
+            os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def save_json(path: Path, data: Any):
+    """Write a JSON cache file atomically"""
+    atomic_write_text(path, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
@@ -3,17 +3,239 @@
 Check HappyCapy environment compatibility
 """
 
-from pathlib import Path
-from typing import List, Dict
+import os
 import re
+import hashlib
+from pathlib import Path
+from typing import List, Dict, Optional
+
+from ast_analyzer import analyze_python_source
+from cache_utils import load_json, save_json
+
+
+# Unsupported in HappyCapy
+UNSUPPORTED_RUNTIMES = {
+    'java': ['java', 'javac', 'jar'],
+    'ruby': ['ruby', 'gem'],
+    'go': ['go run', 'go build'],
+}
+
+DOCKER_PATTERNS = [
+    r'docker\s+run',
+    r'docker\s+build',
+    r'docker-compose',
+    r'FROM\s+\w+',  # Dockerfile
+    r'subprocess.*docker',
+]
+
+# Known unavailable packages
+UNAVAILABLE_PACKAGES = {'tensorflow', 'torch', 'pytorch', 'cuda'}
+
+# Issue types in report order
+ISSUE_TYPES = ['unavailable_dependency', 'docker_dependency', 'unsupported_runtime', 'memory_concern']
+
+CACHE_VERSION = 2
+
+SKIP_DIRS = {'.git', '__pycache__', 'node_modules', '.venv', 'venv'}
+
+
+# All Docker patterns as one regex, applied only to lines that contain an anchor
+DOCKER_RE = re.compile('|'.join(f'(?:{p})' for p in DOCKER_PATTERNS), re.IGNORECASE)
+DOCKER_ANCHORS = ('docker', 'from')
+
+
+def _find_all(text: str, needle: str):
+    """Yield every offset of a literal in text (str.find runs at C speed)"""
+
+    pos = text.find(needle)
+    while pos != -1:
+        yield pos
+        pos = text.find(needle, pos + 1)
+
+
+class _LineCounter:
+    """Map offsets to 1-based line numbers, for offsets in increasing order"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.line = 1
+
+    def __call__(self, offset: int) -> int:
+        self.line += self.text.count('\n', self.pos, offset)
+        self.pos = offset
+        return self.line
+
+
+def scan_python_source(rel_path: str, content: str) -> List[Dict]:
+    """
+    Scan one Python file for all code-level issue types in a single pass
+
+    Literal anchors ('docker', runtime commands, '.read()') are located with
+    str.find over the lowercased text; the combined Docker regex only runs on
+    the few lines that contain an anchor.
+
+    Args:
+        rel_path: Path of the file relative to the skill (used in reports)
+        content: File content
+
+    Returns:
+        Issues found in this file, with 1-based line numbers
+    """
+
+    issues = []
+    lower = content.lower()
+    line_of = _LineCounter(content)
+
+    # Docker: one issue per matching line
+    line_starts = set()
+    for anchor in DOCKER_ANCHORS:
+        for pos in _find_all(lower, anchor):
+            line_starts.add(content.rfind('\n', 0, pos) + 1)
+
+    for start in sorted(line_starts):
+        end = content.find('\n', start)
+        if DOCKER_RE.search(content, start, end if end != -1 else len(content)):
+            issues.append({
+                'type': 'docker_dependency',
+                'file': rel_path,
+                'line': line_of(start),
+                'description': 'Uses Docker (not available in HappyCapy)',
+                'suggestion': 'Rewrite to run natively without Docker'
+            })
+
+    # Unsupported runtimes: one issue per runtime, at its first occurrence
+    for runtime, commands in UNSUPPORTED_RUNTIMES.items():
+        found = [pos for pos in (lower.find(cmd) for cmd in commands) if pos != -1]
+        if found:
+            issues.append({
+                'type': 'unsupported_runtime',
+                'file': rel_path,
+                'line': content.count('\n', 0, min(found)) + 1,
+                'description': f'Uses {runtime} (not available)',
+                'suggestion': f'Rewrite without {runtime} dependency'
+            })
+
+    # Simple heuristic: reads all at once and never mentions chunking
+    read_pos = content.find('.read()')
+    if read_pos != -1 and 'chunk' not in lower:
+        issues.append({
+            'type': 'memory_concern',
+            'file': rel_path,
+            'line': content.count('\n', 0, read_pos) + 1,
+            'description': 'May load large files entirely into memory',
+            'suggestion': 'Consider streaming or chunked processing for large files'
+        })
+
+    return issues
+
+
+def iter_checked_files(skill_path: Path):
+    """Yield paths (relative to the skill) of every file the checks look at"""
+
+    for name in ('requirements.txt', 'Dockerfile'):
+        if (skill_path / name).is_file():
+            yield name
+
+    for dirpath, dirnames, filenames in os.walk(skill_path):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for filename in sorted(filenames):
+            if filename.endswith('.py'):
+                yield str((Path(dirpath) / filename).relative_to(skill_path))
+
+
+def scan_file(rel_path: str, content: str) -> List[Dict]:
+    """Run the checks that apply to one file"""
+
+    if rel_path == 'requirements.txt':
+        return scan_requirements(content)
+
+    if rel_path == 'Dockerfile':
+        return [{
+            'type': 'docker_dependency',
+            'file': 'Dockerfile',
+            'line': 1,
+            'description': 'Dockerfile present (Docker not available)',
+            'suggestion': 'Remove Dockerfile and run natively'
+        }]
+
+    if rel_path.endswith('.py'):
+        # Real analysis when the file parses; text scan for broken files
+        issues = analyze_python_source(rel_path, content)
+        return issues if issues is not None else scan_python_source(rel_path, content)
+
+    return []
+
+
+def compat_cache_path(cache_dir: Path, skill_path: Path) -> Path:
+    """Per-skill result cache file inside a workspace"""
+    return Path(cache_dir) / '.compat_cache' / f'{Path(skill_path).name}.json'
+
 
+def _check_with_cache(skill_path: Path, rel_paths, cache_dir: Optional[Path], prune: bool) -> List[Dict]:
+    """
+    Check files, re-scanning only those whose content hash changed
 
-def check_environment_compatibility(skill_path: Path) -> List[Dict]:
+    Args:
+        skill_path: Skill directory
+        rel_paths: Files to check, relative to the skill
+        cache_dir: Workspace holding the cache (None disables caching)
+        prune: Drop cache entries for files not in rel_paths (full check)
+    """
+
+    cache_file = compat_cache_path(cache_dir, skill_path) if cache_dir else None
+    cache = load_json(cache_file, {}) if cache_file else {}
+    entries = cache.get('files', {}) if cache.get('version') == CACHE_VERSION else {}
+
+    by_type = {issue_type: [] for issue_type in ISSUE_TYPES}
+    checked = set()
+    dirty = False
+
+    for rel_path in rel_paths:
+        try:
+            raw = (skill_path / rel_path).read_bytes()
+        except OSError:
+            dirty |= entries.pop(rel_path, None) is not None
+            continue
+
+        checked.add(rel_path)
+        digest = hashlib.sha1(raw).hexdigest()
+        entry = entries.get(rel_path)
+
+        if entry is None or entry['hash'] != digest:
+            entry = entries[rel_path] = {
+                'hash': digest,
+                'issues': scan_file(rel_path, raw.decode('utf-8', errors='replace'))
+            }
+            dirty = True
+
+        for issue in entry['issues']:
+            by_type[issue['type']].append(dict(issue))
+
+    if prune:
+        for rel_path in set(entries) - checked:
+            del entries[rel_path]
+            dirty = True
+
+    if cache_file and dirty:
+        save_json(cache_file, {'version': CACHE_VERSION, 'files': entries})
+
+    return [issue for issue_type in ISSUE_TYPES for issue in by_type[issue_type]]
+
+
+def check_environment_compatibility(skill_path: Path, cache_dir: Optional[Path] = None) -> List[Dict]:
     """
     Check if skill is compatible with HappyCapy environment
 
+    Walks the skill once and reads each file once. Python files are
+    analyzed with the AST (see ast_analyzer.py); files that do not parse
+    fall back to the single-pass text scan (scan_python_source). With a
+    cache_dir, per-file results are cached by content hash so a re-check
+    only rescans files that changed.
+
     Args:
         skill_path: Path to skill directory
+        cache_dir: Optional workspace directory for the per-file result cache
 
     Returns:
         List of compatibility issues:
@@ -29,148 +251,81 @@ def check_environment_compatibility(skill_path: Path) -> List[Dict]:
         ]
     """
 
-    issues = []
+    skill_path = Path(skill_path)
+    return _check_with_cache(skill_path, list(iter_checked_files(skill_path)), cache_dir, prune=True)
 
-    # Check Python dependencies
-    issues.extend(check_python_dependencies(skill_path))
 
-    # Check for Docker usage
-    issues.extend(check_docker_usage(skill_path))
+def check_files(skill_path: Path, files, cache_dir: Optional[Path] = None) -> List[Dict]:
+    """
+    Check an explicit set of files, e.g. the ones a fix just rewrote
 
-    # Check for unsupported runtimes
-    issues.extend(check_unsupported_runtimes(skill_path))
+    Args:
+        skill_path: Path to skill directory
+        files: File paths, absolute or relative to the skill
+        cache_dir: Optional workspace directory for the per-file result cache
 
-    # Check memory usage patterns
-    issues.extend(check_memory_patterns(skill_path))
+    Returns:
+        Compatibility issues found in those files only
+    """
 
-    return issues
+    skill_path = Path(skill_path)
+    rel_paths = []
+    for f in files:
+        f = Path(f)
+        rel_paths.append(str(f.relative_to(skill_path) if f.is_absolute() else f))
 
+    return _check_with_cache(skill_path, rel_paths, cache_dir, prune=False)
 
-def check_python_dependencies(skill_path: Path) -> List[Dict]:
-    """Check if Python dependencies are available in HappyCapy"""
+
+def scan_requirements(content: str) -> List[Dict]:
+    """Flag packages in requirements.txt that are unavailable in HappyCapy"""
 
     issues = []
 
-    # Known unavailable packages
-    unavailable = {'tensorflow', 'torch', 'pytorch', 'cuda'}
+    for line_num, line in enumerate(content.split('\n'), 1):
+        line = line.strip().lower()
+
+        for pkg in sorted(UNAVAILABLE_PACKAGES):
+            if pkg in line and not line.startswith('#'):
+                issues.append({
+                    'type': 'unavailable_dependency',
+                    'file': 'requirements.txt',
+                    'line': line_num,
+                    'description': f'Package "{pkg}" not available in HappyCapy',
+                    'suggestion': f'Remove or find alternative to {pkg}'
+                })
+
+    return issues
+
+
+def check_python_dependencies(skill_path: Path) -> List[Dict]:
+    """Check if Python dependencies are available in HappyCapy"""
 
     # Check requirements.txt
-    req_file = skill_path / "requirements.txt"
+    req_file = Path(skill_path) / "requirements.txt"
     if req_file.exists():
-        content = req_file.read_text()
+        return scan_requirements(req_file.read_text())
 
-        for line_num, line in enumerate(content.split('\n'), 1):
-            line = line.strip().lower()
+    return []
 
-            for pkg in unavailable:
-                if pkg in line and not line.startswith('#'):
-                    issues.append({
-                        'type': 'unavailable_dependency',
-                        'file': 'requirements.txt',
-                        'line': line_num,
-                        'description': f'Package "{pkg}" not available in HappyCapy',
-                        'suggestion': f'Remove or find alternative to {pkg}'
-                    })
 
-    return issues
+def _issues_of_type(skill_path: Path, issue_type: str) -> List[Dict]:
+    return [i for i in check_environment_compatibility(skill_path) if i['type'] == issue_type]
 
 
 def check_docker_usage(skill_path: Path) -> List[Dict]:
     """Check for Docker usage"""
-
-    issues = []
-
-    docker_patterns = [
-        r'docker\s+run',
-        r'docker\s+build',
-        r'docker-compose',
-        r'FROM\s+\w+',  # Dockerfile
-        r'subprocess.*docker',
-    ]
-
-    # Check all code files
-    for code_file in skill_path.rglob("*.py"):
-        content = code_file.read_text()
-
-        for line_num, line in enumerate(content.split('\n'), 1):
-            for pattern in docker_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    issues.append({
-                        'type': 'docker_dependency',
-                        'file': str(code_file.relative_to(skill_path)),
-                        'line': line_num,
-                        'description': 'Uses Docker (not available in HappyCapy)',
-                        'suggestion': 'Rewrite to run natively without Docker'
-                    })
-                    break
-
-    # Check for Dockerfile
-    if (skill_path / "Dockerfile").exists():
-        issues.append({
-            'type': 'docker_dependency',
-            'file': 'Dockerfile',
-            'line': 1,
-            'description': 'Dockerfile present (Docker not available)',
-            'suggestion': 'Remove Dockerfile and run natively'
-        })
-
-    return issues
+    return _issues_of_type(skill_path, 'docker_dependency')
 
 
 def check_unsupported_runtimes(skill_path: Path) -> List[Dict]:
     """Check for unsupported runtime dependencies"""
-
-    issues = []
-
-    # Unsupported in HappyCapy
-    unsupported = {
-        'java': ['java', 'javac', 'jar'],
-        'ruby': ['ruby', 'gem'],
-        'go': ['go run', 'go build'],
-    }
-
-    for code_file in skill_path.rglob("*.py"):
-        content = code_file.read_text()
-
-        for runtime, commands in unsupported.items():
-            for cmd in commands:
-                if cmd in content.lower():
-                    issues.append({
-                        'type': 'unsupported_runtime',
-                        'file': str(code_file.relative_to(skill_path)),
-                        'line': 0,
-                        'description': f'Uses {runtime} (not available)',
-                        'suggestion': f'Rewrite without {runtime} dependency'
-                    })
-                    break
-
-    return issues
+    return _issues_of_type(skill_path, 'unsupported_runtime')
 
 
 def check_memory_patterns(skill_path: Path) -> List[Dict]:
     """Check for potentially memory-intensive patterns"""
-
-    issues = []
-
-    memory_patterns = [
-        (r'\.read\(\)', 'Reading entire file into memory'),
-        (r'pd\.read_csv.*chunksize', 'Not using chunked reading'),
-    ]
-
-    for code_file in skill_path.rglob("*.py"):
-        content = code_file.read_text()
-
-        # Simple heuristic: if file is large and reads all at once
-        if '.read()' in content and 'chunk' not in content.lower():
-            issues.append({
-                'type': 'memory_concern',
-                'file': str(code_file.relative_to(skill_path)),
-                'line': 0,
-                'description': 'May load large files entirely into memory',
-                'suggestion': 'Consider streaming or chunked processing for large files'
-            })
-
-    return issues
+    return _issues_of_type(skill_path, 'memory_concern')
 
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Run checkpoints for the creation pipeline
+
+Every finished step's outputs are stored in <run_dir>/manifest.json along
+with a hash of the inputs it ran on. A resumed run restores a step instead
+of running it when its inputs hash the same and any paths it produced
+still exist, so a failure at auto-fix no longer costs the clone and the
+LLM integration again.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from cache_utils import hash_text, load_json, save_json
+
+
+MANIFEST_VERSION = 1
+
+
+def encode_value(value: Any) -> Any:
+    """JSON-safe form of a step value; Paths are tagged so they round-trip"""
+
+    if isinstance(value, Path):
+        return {'__path__': str(value)}
+    if isinstance(value, dict):
+        return {str(k): encode_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def decode_value(value: Any) -> Any:
+    """Inverse of encode_value"""
+
+    if isinstance(value, dict):
+        if set(value) == {'__path__'}:
+            return Path(value['__path__'])
+        return {k: decode_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode_value(v) for v in value]
+    return value
+
+
+def hash_inputs(inputs: Dict) -> str:
+    """Stable hash of a step's input values"""
+    return hash_text(json.dumps(encode_value(inputs), sort_keys=True))
+
+
+def _paths_exist(value: Any) -> bool:
+    if isinstance(value, Path):
+        return value.exists()
+    if isinstance(value, dict):
+        return all(_paths_exist(v) for v in value.values())
+    if isinstance(value, list):
+        return all(_paths_exist(v) for v in value)
+    return True
+
+
+class Checkpoint:
+    """Step outputs of one run, persisted in <run_dir>/manifest.json"""
+
+    def __init__(self, run_dir: Path):
+        self.run_dir = Path(run_dir)
+        self.path = self.run_dir / 'manifest.json'
+        self._lock = threading.Lock()
+
+        manifest = load_json(self.path, None)
+        if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+            manifest = {'version': MANIFEST_VERSION, 'steps': {}}
+        self.manifest = manifest
+
+    def reset(self):
+        """Forget all completed steps (a fresh run in the same directory)"""
+
+        with self._lock:
+            self.manifest = {'version': MANIFEST_VERSION, 'steps': {}}
+            if self.path.exists():
+                self.path.unlink()
+
+    def lookup(self, step: str, inputs_hash: str) -> Optional[Dict]:
+        """Outputs of a completed step run on the same inputs, or None"""
+
+        entry = self.manifest['steps'].get(step)
+        if not entry or entry.get('inputs_hash') != inputs_hash:
+            return None
+
+        outputs = decode_value(entry['outputs'])
+        return outputs if _paths_exist(outputs) else None
+
+    def record(self, step: str, inputs_hash: str, outputs: Dict, seconds: float):
+        """Persist a completed step"""
+
+        with self._lock:
+            self.manifest['steps'][step] = {
+                'inputs_hash': inputs_hash,
+                'outputs': encode_value(outputs),
+                'seconds': round(seconds, 3),
+                'completed_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }
+            save_json(self.path, self.manifest)
+
+    def completed_steps(self) -> list:
+        return list(self.manifest['steps'])
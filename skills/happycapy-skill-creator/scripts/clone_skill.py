@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
 """
-Clone skill from anthropics/skills repository
+Clone skill from a local skills tree, a .skill archive or anthropics/skills
 """
 
 import subprocess
+import zipfile
 from pathlib import Path
 import shutil
 
+from skill_sources import configured_sources
 
-def clone_skill_from_repo(skill_info: dict, workspace: Path) -> Path:
+
+def clone_skill_from_repo(skill_info: dict, workspace: Path, sources: list = None) -> Path:
     """
-    Clone a skill from anthropics/skills repository
+    Clone a skill from the configured skill sources
+
+    Sources are tried in priority order (see skill_sources.py): by default
+    the local skills tree, then anthropics/skills through a cached sparse
+    mirror. Copies are incremental, so cloning into an existing workspace
+    copy only rewrites files that differ.
 
     Args:
         skill_info: Dict with skill metadata
@@ -19,110 +27,53 @@ def clone_skill_from_repo(skill_info: dict, workspace: Path) -> Path:
                 'repo_path': 'skills/pdf'
             }
         workspace: Working directory
+        sources: Sources to try (default: configured_sources())
 
     Returns:
         Path to cloned skill
     """
 
     skill_name = skill_info['name']
-    repo_url = "https://github.com/anthropics/skills.git"
 
     # Create workspace
     workspace.mkdir(parents=True, exist_ok=True)
     skill_path = workspace / skill_name
 
-    # Remove if exists
+    for source in sources if sources is not None else configured_sources():
+        print(f"   Cloning from {source}...")
+        try:
+            stats = source.fetch(skill_info, skill_path)
+        except (subprocess.CalledProcessError, OSError, zipfile.BadZipFile) as e:
+            print(f"   ⚠️  {source} failed: {e}")
+            continue
+
+        if stats is not None:
+            print(f"   ✅ Cloned {skill_name} ({stats['copied']} copied, "
+                  f"{stats['skipped']} unchanged, {stats['removed']} removed)")
+            return skill_path
+
+    # Fallback: create from template
+    print(f"   ⚠️  Skill not found in any source, creating template...")
     if skill_path.exists():
         shutil.rmtree(skill_path)
-
-    print(f"   Cloning from {repo_url}...")
-
-    try:
-        # Clone entire repo to temp location
-        temp_repo = workspace / "temp_skills_repo"
-        if temp_repo.exists():
-            shutil.rmtree(temp_repo)
-
-        subprocess.run(
-            ["git", "clone", "--depth", "1", repo_url, str(temp_repo)],
-            capture_output=True,
-            check=True
-        )
-
-        # Copy specific skill
-        source_skill = temp_repo / "skills" / skill_name
-
-        if source_skill.exists():
-            shutil.copytree(source_skill, skill_path)
-            print(f"   ✅ Cloned {skill_name}")
-        else:
-            # Fallback: create from template
-            print(f"   ⚠️  Skill not found in repo, creating template...")
-            create_template_skill(skill_path, skill_name)
-
-        # Cleanup
-        shutil.rmtree(temp_repo)
-
-        return skill_path
-
-    except subprocess.CalledProcessError as e:
-        print(f"   ⚠️  Git clone failed: {e}")
-        print(f"   Creating template skill instead...")
-        create_template_skill(skill_path, skill_name)
-        return skill_path
+    create_template_skill(skill_path, skill_name)
+    return skill_path
 
 
 def create_template_skill(skill_path: Path, skill_name: str):
     """
     Create a template skill structure
 
-    Used as fallback when cloning fails
+    Used as fallback when cloning fails. Rendered from the fallback
+    template bundle (see scaffold.py) and written in one step.
     """
 
-    skill_path.mkdir(parents=True, exist_ok=True)
-
-    # Create directories
-    (skill_path / "scripts").mkdir(exist_ok=True)
-    (skill_path / "references").mkdir(exist_ok=True)
-    (skill_path / "assets").mkdir(exist_ok=True)
-
-    # Create SKILL.md
-    skill_md_content = f"""---
-name: {skill_name}
-description: [TODO: Add description]
----
-
-# {skill_name.title()}
-
-## Overview
-
-[TODO: Add overview]
-
-## Usage
-
-[TODO: Add usage examples]
-"""
-
-    (skill_path / "SKILL.md").write_text(skill_md_content)
-
-    # Create example script
-    script_content = f"""#!/usr/bin/env python3
-\"\"\"
-{skill_name} - Main script
-\"\"\"
-
-def main():
-    print("Hello from {skill_name}")
-
-if __name__ == "__main__":
-    main()
-"""
+    from scaffold import load_bundle, write_skill
 
-    script_file = skill_path / "scripts" / f"{skill_name.replace('-', '_')}.py"
-    script_file.write_text(script_content)
-    script_file.chmod(0o755)
+    bundle = load_bundle()
+    write_skill(skill_path, bundle.render(skill_name), replace=True)
 
-    print(f"   ✅ Created template for {skill_name}")
+    print(f"   ✅ Created template for {skill_name} ({bundle})")
 
 
 if __name__ == "__main__":
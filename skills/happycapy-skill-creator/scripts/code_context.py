@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Context-budgeted summary of a skill's code for LLM prompts
+
+Instead of the first N characters of every file, each Python script is
+parsed once (ast_analyzer.parse_cached) into a summary of its functions
+and classes: signatures, docstrings and what they call. Symbols are ranked
+by relevance to the feature being added (name/doc overlap with the query,
+plus call-graph neighbours of relevant symbols) and packed into a token
+budget: the most relevant ones with full source, the rest as signatures.
+
+Per-file summaries are cached on disk by content hash.
+"""
+
+import ast
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ast_analyzer import parse_cached
+from cache_utils import get_cache_dir, hash_text, load_json, save_json
+from keyword_index import tokenize
+
+
+SUMMARY_VERSION = 1
+
+DEFAULT_CONTEXT_TOKENS = 2500
+
+# Share of the budget SKILL.md and the file map may use
+SKILL_MD_SHARE = 0.3
+FILE_MAP_SHARE = 0.25
+
+# Symbols longer than this are only shown as signatures
+MAX_FULL_SOURCE_TOKENS = 600
+
+SCRIPT_SUFFIXES = ('.py', '.js', '.mjs', '.ts', '.sh')
+
+_CAMEL_RE = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+_PIECE_RE = re.compile(r'[A-Za-z]+|\d+|[^\sA-Za-z\d]')
+
+_encoder = None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Token count of text
+
+    Uses tiktoken when installed. Otherwise counts word pieces the way BPE
+    tokenizers split code: each punctuation mark is a token and long words
+    cost about one token per four characters.
+    """
+
+    global _encoder
+    if _encoder is None:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding('cl100k_base')
+        except Exception:
+            _encoder = False
+    if _encoder:
+        return len(_encoder.encode(text, disallowed_special=()))
+
+    return sum(max(1, (len(piece) + 3) // 4) for piece in _PIECE_RE.findall(text))
+
+
+def identifier_terms(text: str) -> List[str]:
+    """Search terms of code identifiers (camelCase and snake_case split)"""
+    return tokenize(_CAMEL_RE.sub(' ', text).replace('_', ' '))
+
+
+# --- per-file summaries ----------------------------------------------------
+
+def _call_name(node: ast.Call) -> Optional[str]:
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return None
+
+
+def _signature(node, source_lines: List[str]) -> str:
+    """Definition line(s) up to the colon, decorators included"""
+
+    start = node.decorator_list[0].lineno if node.decorator_list else node.lineno
+    body_start = node.body[0].lineno
+    lines = source_lines[start - 1:max(node.lineno, body_start - 1)]
+    # Drop a docstring/body that starts on the def line's continuation
+    text = '\n'.join(lines).rstrip()
+    return text if text.endswith(':') else text.split('\n')[0]
+
+
+def _symbol(node, source_lines: List[str], prefix: str = '') -> Dict:
+    calls = sorted({
+        name for child in ast.walk(node)
+        if isinstance(child, ast.Call) and (name := _call_name(child))
+    })
+    doc = ast.get_docstring(node) or ''
+    start = node.decorator_list[0].lineno if node.decorator_list else node.lineno
+    return {
+        'name': prefix + node.name,
+        'kind': 'class' if isinstance(node, ast.ClassDef) else 'function',
+        'signature': _signature(node, source_lines),
+        'doc': doc.strip().split('\n\n')[0],
+        'calls': calls,
+        'start': start,
+        'end': node.end_lineno,
+    }
+
+
+def summarize_python(rel_path: str, content: str) -> Dict:
+    """
+    Summary of one Python file
+
+    Returns:
+        {'path', 'doc', 'imports', 'symbols': [{'name', 'kind', 'signature',
+         'doc', 'calls', 'start', 'end'}], 'parsed'}
+    """
+
+    try:
+        tree = parse_cached(content, rel_path)
+    except (SyntaxError, ValueError):
+        return {'path': rel_path, 'doc': '', 'imports': [], 'symbols': [], 'parsed': False}
+
+    lines = content.split('\n')
+    imports = []
+    symbols = []
+
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            imports.append(node.module)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append(_symbol(node, lines))
+        elif isinstance(node, ast.ClassDef):
+            symbols.append(_symbol(node, lines))
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    symbols.append(_symbol(item, lines, prefix=f'{node.name}.'))
+
+    return {
+        'path': rel_path,
+        'doc': (ast.get_docstring(tree) or '').strip().split('\n\n')[0],
+        'imports': sorted(set(imports)),
+        'symbols': symbols,
+        'parsed': True,
+    }
+
+
+def _summary_cache_path(content_hash: str) -> Path:
+    return get_cache_dir() / 'code_summaries' / f'{content_hash}.json'
+
+
+def load_summary(rel_path: str, content: str) -> Dict:
+    """Summary of a file, cached on disk by content hash"""
+
+    content_hash = hash_text(f'{SUMMARY_VERSION}:{rel_path}:{content}')
+    cache_path = _summary_cache_path(content_hash)
+
+    summary = load_json(cache_path)
+    if summary is None:
+        summary = summarize_python(rel_path, content)
+        save_json(cache_path, summary)
+    return summary
+
+
+# --- ranking and packing ---------------------------------------------------
+
+def rank_symbols(summaries: List[Dict], query: str) -> List[Dict]:
+    """
+    Symbols of all files, most relevant first
+
+    Each returned symbol carries 'path' and 'score'. Score is term overlap
+    with the query (name weighs most), spread to call-graph neighbours so
+    the helpers of a relevant function come along, with a small bonus for
+    public entry points.
+    """
+
+    query_terms = set(tokenize(query)) | set(identifier_terms(query))
+    symbols = [dict(s, path=summary['path']) for summary in summaries for s in summary['symbols']]
+
+    by_name = {}
+    for sym in symbols:
+        by_name.setdefault(sym['name'].split('.')[-1], []).append(sym)
+
+    for sym in symbols:
+        name_terms = set(identifier_terms(sym['name']))
+        doc_terms = set(tokenize(sym['doc']))
+        call_terms = {t for call in sym['calls'] for t in identifier_terms(call)}
+        score = 3.0 * len(query_terms & name_terms) + 1.5 * len(query_terms & doc_terms) \
+            + 0.5 * len(query_terms & call_terms)
+        if sym['name'] in ('main', 'run') or not sym['name'].split('.')[-1].startswith('_'):
+            score += 0.25
+        sym['score'] = score
+
+    # One hop along the call graph, both directions
+    boosts = {}
+    for sym in symbols:
+        for call in sym['calls']:
+            for callee in by_name.get(call, []):
+                if callee is not sym:
+                    boosts[id(callee)] = max(boosts.get(id(callee), 0.0), 0.4 * sym['score'])
+                    boosts[id(sym)] = max(boosts.get(id(sym), 0.0), 0.2 * callee['score'])
+    for sym in symbols:
+        sym['score'] += boosts.get(id(sym), 0.0)
+
+    return sorted(symbols, key=lambda s: (-s['score'], s['path'], s['start']))
+
+
+def _render_signature(sym: Dict) -> str:
+    text = sym['signature']
+    if sym['doc']:
+        text += f'\n    """{sym["doc"]}"""'
+    if sym['calls']:
+        text += f"\n    # calls: {', '.join(sym['calls'][:12])}"
+    return text
+
+
+def _render_source(sym: Dict, lines: List[str]) -> str:
+    return '\n'.join(lines[sym['start'] - 1:sym['end']])
+
+
+def _truncate_to_tokens(text: str, budget: int) -> str:
+    if estimate_tokens(text) <= budget:
+        return text
+    lines = text.split('\n')
+    kept = []
+    used = 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return '\n'.join(kept) + '\n...'
+
+
+def build_code_context(skill_path: Path, query: str = '', budget: int = DEFAULT_CONTEXT_TOKENS) -> str:
+    """
+    Pack the most useful view of a skill's code into a token budget
+
+    Args:
+        skill_path: Path to skill directory
+        query: Feature name and requirement the context is for
+        budget: Token budget for the whole context
+
+    Returns:
+        Context text: SKILL.md (trimmed), a file map with module docstrings,
+        then code snippets in relevance order
+    """
+
+    skill_path = Path(skill_path)
+    sections = []
+    used = 0
+
+    skill_md = skill_path / 'SKILL.md'
+    if skill_md.exists():
+        text = _truncate_to_tokens(skill_md.read_text(errors='replace'), int(budget * SKILL_MD_SHARE))
+        sections.append(f"=== SKILL.md ===\n{text}\n")
+        used += estimate_tokens(sections[-1])
+
+    scripts = sorted(
+        p for p in skill_path.rglob('*')
+        if p.is_file() and p.suffix in SCRIPT_SUFFIXES and '__pycache__' not in p.parts
+    )
+    if not scripts:
+        return "\n".join(sections)
+
+    summaries = []
+    sources = {}
+    file_map = ["=== files ==="]
+    for script in scripts:
+        rel = str(script.relative_to(skill_path))
+        content = script.read_text(errors='replace')
+        if script.suffix == '.py':
+            summary = load_summary(rel, content)
+            summaries.append(summary)
+            sources[rel] = content.split('\n')
+            names = ', '.join(s['name'] for s in summary['symbols'] if '.' not in s['name'])
+            line = f"- {rel}" + (f": {summary['doc']}" if summary['doc'] else '')
+            if names:
+                line += f"\n    defines: {names}"
+        else:
+            line = f"- {rel} ({content.count(chr(10)) + 1} lines)"
+        file_map.append(line)
+
+    file_map_text = "\n".join(file_map) + "\n"
+    sections.append(_truncate_to_tokens(file_map_text, min(int(budget * FILE_MAP_SHARE), max(0, budget - used))))
+    used += estimate_tokens(sections[-1])
+
+    snippets = {}
+    for sym in rank_symbols(summaries, query):
+        remaining = budget - used
+        if remaining <= 0:
+            break
+
+        # A method is redundant once its whole class is shown
+        owner = sym['name'].split('.')[0]
+        if '.' in sym['name'] and snippets.get((sym['path'], owner), {}).get('full'):
+            continue
+
+        full = False
+        if sym['score'] >= 1.0:
+            rendered = _render_source(sym, sources[sym['path']])
+            # Methods that ranked above their class are dropped if it is shown whole
+            shown_methods = [
+                key for key in snippets
+                if sym['kind'] == 'class' and key[0] == sym['path'] and key[1].startswith(sym['name'] + '.')
+            ]
+            freed = sum(snippets[key]['tokens'] for key in shown_methods)
+            full = estimate_tokens(rendered) <= min(MAX_FULL_SOURCE_TOKENS, remaining + freed)
+            if full:
+                for key in shown_methods:
+                    del snippets[key]
+                used -= freed
+        if not full:
+            rendered = _render_signature(sym)
+            if estimate_tokens(rendered) > remaining:
+                continue
+
+        tokens = estimate_tokens(rendered) + 1
+        snippets[(sym['path'], sym['name'])] = {'text': rendered, 'full': full, 'start': sym['start'],
+                                                'tokens': tokens}
+        used += tokens
+
+    by_file = {}
+    for (path, _), snippet in snippets.items():
+        by_file.setdefault(path, []).append(snippet)
+    for path in sorted(by_file):
+        body = "\n\n".join(s['text'] for s in sorted(by_file[path], key=lambda s: s['start']))
+        sections.append(f"=== {path} ===\n{body}\n")
+
+    return "\n".join(sections)
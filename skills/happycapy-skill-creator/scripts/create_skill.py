@@ -11,24 +11,50 @@ Creates new skills by:
 
 Usage:
     python create_skill.py "I need to compress PDF files"
+    python create_skill.py "I need to compress PDF files" --resume
 """
 
 import sys
 import os
+import importlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add scripts to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from semantic_search import search_similar_skills
-from find_skills_integration import find_existing_skill
-from clone_skill import clone_skill_from_repo
-from search_implementation import search_feature_implementation
-from integrate_feature import integrate_and_adapt
-from check_compatibility import check_environment_compatibility
-from auto_fix import fix_compatibility_issues
-from test_skill import test_skill_basic
-from package_skill import package_skill
+from pipeline import Pipeline, PipelineError, Step, StopPipeline
+from checkpoint import Checkpoint
+from cache_utils import hash_text
+
+__version__ = "1.0.0"
+
+
+def _lazy(module_name: str, name: str):
+    """
+    Stand-in for module_name.name that imports the module on first call
+
+    The step modules pull in AST analysis, zip/subprocess machinery and the
+    HTTP client; `--help`, `--version` and resumed runs whose steps are all
+    checkpointed never need them.
+    """
+
+    def call(*args, **kwargs):
+        return getattr(importlib.import_module(module_name), name)(*args, **kwargs)
+
+    call.__name__ = call.__qualname__ = name
+    return call
+
+
+search_similar_skills = _lazy('semantic_search', 'search_similar_skills')
+find_existing_skill = _lazy('find_skills_integration', 'find_existing_skill')
+clone_skill_from_repo = _lazy('clone_skill', 'clone_skill_from_repo')
+search_feature_implementation = _lazy('search_implementation', 'search_feature_implementation')
+integrate_features = _lazy('integrate_feature', 'integrate_features')
+check_environment_compatibility = _lazy('check_compatibility', 'check_environment_compatibility')
+fix_compatibility_issues = _lazy('auto_fix_improved', 'fix_compatibility_issues')
+test_skill_basic = _lazy('test_skill', 'test_skill_basic')
+package_skill = _lazy('package_skill', 'package_skill')
 
 
 class SkillCreator:
@@ -37,13 +63,63 @@ class SkillCreator:
     def __init__(self):
         self.workspace = Path("./workspace")
         self.workspace.mkdir(exist_ok=True)
+        self.run_dir = self.workspace
+        self.pipeline = None
+
+    def build_pipeline(self) -> Pipeline:
+        """
+        The creation workflow as a step DAG
+
+        find_existing / search_similar run together, and feature extraction
+        and implementation search run while the base skill is cloned.
+        """
 
-    def create_skill(self, user_requirement: str, skill_name: str = None):
+        return Pipeline([
+            Step('find_existing', self._step_find_existing,
+                 inputs=['user_requirement'], outputs=['existing']),
+            Step('search_similar', self._step_search_similar,
+                 inputs=['user_requirement'], outputs=['similar_skills']),
+            Step('select_base', self._step_select_base,
+                 inputs=['user_requirement', 'existing', 'similar_skills'], outputs=['base_skill']),
+            Step('clone', self._step_clone,
+                 inputs=['base_skill'], outputs=['skill_path']),
+            Step('extract_features', self._step_extract_features,
+                 inputs=['user_requirement', 'base_skill'], outputs=['new_features']),
+            Step('search_implementations', self._step_search_implementations,
+                 inputs=['new_features', 'base_skill'], outputs=['implementations']),
+            Step('integrate', self._step_integrate,
+                 inputs=['skill_path', 'implementations', 'user_requirement'], outputs=['integrated']),
+            Step('check_compatibility', self._step_check_compatibility,
+                 inputs=['skill_path', 'integrated'], outputs=['issues']),
+            Step('auto_fix', self._step_auto_fix,
+                 inputs=['skill_path', 'issues'], outputs=['remaining_issues']),
+            Step('test', self._step_test,
+                 inputs=['skill_path', 'remaining_issues'], outputs=['test_result']),
+            Step('name', self._step_name,
+                 inputs=['user_requirement', 'skill_name'], outputs=['final_name'], after=['test']),
+            Step('package', self._step_package,
+                 inputs=['skill_path', 'final_name', 'test_result'], outputs=['output_path']),
+        ])
+
+    @staticmethod
+    def default_run_id(user_requirement: str) -> str:
+        """Run id derived from the requirement, so --resume finds the run again"""
+        return hash_text(' '.join(user_requirement.lower().split()))[:12]
+
+    def create_skill(self, user_requirement: str, skill_name: str = None,
+                     resume: bool = False, run_id: str = None):
         """
         Main workflow to create a skill
 
+        Every run works in ./workspace/<run-id>/, where each finished step
+        is checkpointed in manifest.json.
+
         Args:
             user_requirement: User's description of what they need
+            skill_name: Skill name (skips the interactive prompt)
+            resume: Skip steps that already completed in this run directory
+                with unchanged inputs, instead of starting over
+            run_id: Run directory name (default: derived from the requirement)
 
         Returns:
             Path to packaged .skill file
@@ -53,83 +129,165 @@ class SkillCreator:
         print("=" * 60)
         print(f"Requirement: {user_requirement}\n")
 
+        run_id = run_id or self.default_run_id(user_requirement)
+        self.run_dir = self.workspace / run_id
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+
+        checkpoint = Checkpoint(self.run_dir)
+        if resume and checkpoint.completed_steps():
+            print(f"↩️  Resuming run {run_id} ({len(checkpoint.completed_steps())} step(s) checkpointed)\n")
+        else:
+            checkpoint.reset()
+
+        context = {'user_requirement': user_requirement, 'skill_name': skill_name}
+
+        self.pipeline = self.build_pipeline()
+        try:
+            context = self.pipeline.run(context, checkpoint=checkpoint)
+        except PipelineError as e:
+            print(f"\n❌ {e}")
+            print(f"   Re-run with --resume to continue from this step (run {run_id})")
+            raise
+        finally:
+            print("\n⏱️  Step timings:")
+            print(self.pipeline.format_timings())
+
+        output_path = context.get('output_path')
+
+        if output_path:
+            print("\n" + "=" * 60)
+            print(f"🎉 Skill created successfully!")
+            print(f"📦 Location: {output_path}")
+            print(f"💡 Install with: /install {output_path}")
+
+        return output_path
+
+    # --- steps ------------------------------------------------------------
+
+    def _step_find_existing(self, user_requirement):
         # Step 1: Check if perfect match exists
         print("Step 1: Searching for existing skills...")
-        existing = find_existing_skill(user_requirement)
+        return {'existing': find_existing_skill(user_requirement)}
 
+    def _step_search_similar(self, user_requirement):
+        # Step 2: Semantic search for similar skill
+        print("Step 2: Searching for similar skills to adapt...")
+        return {'similar_skills': search_similar_skills(user_requirement)}
+
+    def _step_select_base(self, user_requirement, existing, similar_skills):
         if existing and existing.get('perfect_match'):
             print(f"✅ Found perfect match: {existing['name']}")
             print(f"   You can install it directly with: /install {existing['name']}")
-            return None
-
-        # Step 2: Semantic search for similar skill
-        print("\nStep 2: Searching for similar skills to adapt...")
-        similar_skills = search_similar_skills(user_requirement)
+            raise StopPipeline(output_path=None)
 
         if not similar_skills:
             print("❌ No similar skills found. Creating from scratch...")
-            return self._create_from_scratch(user_requirement)
+            raise StopPipeline(output_path=self._create_from_scratch(user_requirement))
 
         base_skill = similar_skills[0]
         print(f"✅ Found base skill: {base_skill['name']}")
         print(f"   Similarity: {base_skill['similarity']:.0%}")
         print(f"   Description: {base_skill['description'][:100]}...")
+        return {'base_skill': base_skill}
 
+    def _step_clone(self, base_skill):
         # Step 3: Clone base skill
         print(f"\nStep 3: Cloning {base_skill['name']}...")
-        skill_path = clone_skill_from_repo(base_skill, self.workspace)
+        skill_path = clone_skill_from_repo(base_skill, self.run_dir)
         print(f"✅ Cloned to: {skill_path}")
+        return {'skill_path': skill_path}
 
+    def _step_extract_features(self, user_requirement, base_skill):
         # Step 4: Identify new feature needed
         print("\nStep 4: Identifying new features to add...")
         new_features = self._extract_new_features(user_requirement, base_skill)
         print(f"✅ Features to add: {', '.join(new_features)}")
+        return {'new_features': new_features}
 
-        # Step 5: Search for implementations
+    def _step_search_implementations(self, new_features, base_skill):
+        # Step 5: Search for implementations, one feature per worker
         print("\nStep 5: Searching for feature implementations...")
         implementations = {}
-        for feature in new_features:
-            impl = search_feature_implementation(feature, base_skill['language'])
-            if impl:
-                implementations[feature] = impl
-                print(f"✅ Found implementation for: {feature}")
-
+        if new_features:
+            with ThreadPoolExecutor(max_workers=len(new_features)) as pool:
+                found = pool.map(
+                    lambda feature: search_feature_implementation(feature, base_skill['language']),
+                    new_features
+                )
+                for feature, impl in zip(new_features, found):
+                    if impl:
+                        implementations[feature] = impl
+                        print(f"✅ Found implementation for: {feature}")
+        return {'implementations': implementations}
+
+    def _step_integrate(self, skill_path, implementations, user_requirement):
         # Step 6: Integrate features with LLM
         print("\nStep 6: Integrating features (LLM fine-tuning)...")
-        for feature, impl in implementations.items():
-            print(f"   Integrating {feature}...")
-            integrate_and_adapt(skill_path, feature, impl, user_requirement)
-        print("✅ Features integrated")
+        if implementations:
+            print(f"   Integrating {', '.join(implementations)}...")
+        result = integrate_features(skill_path, implementations, user_requirement, cache_dir=self.workspace)
+        unresolved = (result or {}).get('unresolved') or []
+        if unresolved:
+            print(f"⚠️  Features integrated; unresolved conflicts in {', '.join(unresolved)} (manual review needed)")
+        else:
+            print("✅ Features integrated")
+        return {'integrated': list(implementations)}
 
+    def _step_check_compatibility(self, skill_path, integrated):
         # Step 7: Check compatibility
         print("\nStep 7: Checking HappyCapy compatibility...")
-        issues = check_environment_compatibility(skill_path)
+        issues = check_environment_compatibility(skill_path, cache_dir=self.workspace)
 
         if issues:
             print(f"⚠️  Found {len(issues)} compatibility issues:")
             for issue in issues:
                 print(f"   - {issue['type']}: {issue['description']}")
-
-            # Step 8: Auto-fix issues
-            print("\nStep 8: Auto-fixing compatibility issues...")
-            fix_compatibility_issues(skill_path, issues)
-            print("✅ Issues fixed")
-
-            # Re-check
-            remaining = check_environment_compatibility(skill_path)
-            if remaining:
-                print(f"⚠️  {len(remaining)} issues remain (manual review needed)")
         else:
             print("✅ All checks passed")
+        return {'issues': issues}
+
+    def _step_auto_fix(self, skill_path, issues):
+        if not issues:
+            return {'remaining_issues': []}
+
+        # Step 8: Auto-fix issues
+        print("\nStep 8: Auto-fixing compatibility issues...")
+        result = fix_compatibility_issues(skill_path, issues) or {'fixed': [], 'failed': {}}
+
+        for rel_path, error in result['failed'].items():
+            print(f"⚠️  Could not fix {rel_path}: {error}")
+            for issue in issues:
+                if issue['file'] == rel_path:
+                    print(f"   - {issue['type']}: {issue['description']}")
+
+        if not result['fixed']:
+            # Nothing changed on disk, so every issue still stands
+            print(f"⚠️  No fixes applied, {len(issues)} issues remain (manual review needed)")
+            return {'remaining_issues': issues}
 
+        print(f"✅ Fixed {len(result['fixed'])} file(s)")
+
+        # Re-check
+        remaining = check_environment_compatibility(skill_path, cache_dir=self.workspace)
+        if remaining:
+            print(f"⚠️  {len(remaining)} issues remain (manual review needed)")
+        return {'remaining_issues': remaining}
+
+    def _step_test(self, skill_path, remaining_issues):
         # Step 9: Test
         print("\nStep 9: Testing skill...")
-        test_result = test_skill_basic(skill_path)
+        test_result = test_skill_basic(skill_path, cache_dir=self.workspace)
+        for warning in test_result['warnings']:
+            print(f"   ⚠️  {warning}")
         if test_result['success']:
             print("✅ Tests passed")
         else:
-            print(f"⚠️  Tests failed: {test_result['error']}")
+            print(f"⚠️  Tests failed ({len(test_result['errors'])} error(s)):")
+            for error in test_result['errors']:
+                print(f"   - {error}")
+        return {'test_result': test_result}
 
+    def _step_name(self, user_requirement, skill_name):
         # Step 10: Get user name
         print("\nStep 10: Naming your skill...")
         if not skill_name:
@@ -140,17 +298,12 @@ class SkillCreator:
                 # Non-interactive environment
                 skill_name = default_name
                 print(f"Using default name: {skill_name}")
+        return {'final_name': skill_name}
 
+    def _step_package(self, skill_path, final_name, test_result):
         # Step 11: Package
-        print(f"\nStep 11: Packaging {skill_name}...")
-        output_path = package_skill(skill_path, skill_name)
-
-        print("\n" + "=" * 60)
-        print(f"🎉 Skill created successfully!")
-        print(f"📦 Location: {output_path}")
-        print(f"💡 Install with: /install {output_path}")
-
-        return output_path
+        print(f"\nStep 11: Packaging {final_name}...")
+        return {'output_path': package_skill(skill_path, final_name)}
 
     def _extract_new_features(self, requirement: str, base_skill: dict) -> list:
         """Extract what new features are needed beyond base skill"""
@@ -192,6 +345,7 @@ def main():
 Examples:
   python create_skill.py "I need to compress PDF files"
   python create_skill.py "Extract video frames" --name video-extractor
+  python create_skill.py "Extract video frames" --resume
         """
     )
 
@@ -203,11 +357,29 @@ Examples:
         "--name",
         help="Skill name (skip interactive prompt)"
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue a failed run, skipping steps that already completed"
+    )
+    parser.add_argument(
+        "--run-id",
+        help="Run directory under ./workspace (default: derived from the requirement)"
+    )
+    parser.add_argument(
+        "--version",
+        action="version",
+        version=f"%(prog)s {__version__}"
+    )
 
     args = parser.parse_args()
 
     creator = SkillCreator()
-    creator.create_skill(args.requirement, skill_name=args.name)
+    try:
+        creator.create_skill(args.requirement, skill_name=args.name,
+                             resume=args.resume, run_id=args.run_id)
+    except PipelineError:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Three-way merging of file sets generated for several features
+
+Features are integrated concurrently against one snapshot of the skill.
+Each produces its own version of the files it touches; those versions are
+merged per file with `git merge-file` (snapshot as the common base). Only
+files where the merge conflicts need another LLM call.
+
+Until that call resolves them, conflicting Markdown files keep both sides
+(a union merge reads fine as prose). Code files keep the version merged
+before the conflict: a union merge of two edits of one function body can
+compile and still mix both versions' logic.
+"""
+
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+CONFLICT_MARKERS = ('<<<<<<< ', '>>>>>>> ')
+
+# Files whose conflicts fall back to a union merge
+UNION_SUFFIXES = ('.md', '.markdown')
+
+
+def _manual_conflict(ours: str, theirs: str, ours_label: str, theirs_label: str) -> str:
+    """Whole-file conflict, used when git is not available"""
+    return (f"<<<<<<< {ours_label}\n{ours}{'' if ours.endswith(chr(10)) else chr(10)}"
+            f"=======\n{theirs}{'' if theirs.endswith(chr(10)) else chr(10)}"
+            f">>>>>>> {theirs_label}\n")
+
+
+def merge_three_way(
+    base: str,
+    ours: str,
+    theirs: str,
+    ours_label: str = 'ours',
+    theirs_label: str = 'theirs',
+    union: bool = False
+) -> Tuple[str, bool]:
+    """
+    Merge two edits of the same base text
+
+    Args:
+        base: Common ancestor ('' for a file both sides created)
+        ours, theirs: The two edited versions
+        union: Keep both sides of conflicting hunks instead of marking them
+
+    Returns:
+        (merged text, True if conflict markers were left in)
+    """
+
+    if ours == theirs or theirs == base:
+        return ours, False
+    if ours == base:
+        return theirs, False
+
+    with tempfile.TemporaryDirectory(prefix='happycapy-merge-') as tmp:
+        paths = []
+        for name, text in (('ours', ours), ('base', base), ('theirs', theirs)):
+            path = Path(tmp) / name
+            path.write_text(text, encoding='utf-8')
+            paths.append(str(path))
+
+        cmd = ['git', 'merge-file', '-p', '-L', ours_label, '-L', 'base', '-L', theirs_label]
+        if union:
+            cmd.append('--union')
+        try:
+            proc = subprocess.run(cmd + paths, capture_output=True)
+        except FileNotFoundError:
+            if union:
+                return ours + ('' if ours.endswith('\n') else '\n') + theirs, False
+            return _manual_conflict(ours, theirs, ours_label, theirs_label), True
+
+    # Exit status is the number of conflicts; negative means git failed
+    if proc.returncode < 0 or proc.returncode > 127:
+        raise RuntimeError(proc.stderr.decode(errors='replace').strip() or 'git merge-file failed')
+    return proc.stdout.decode('utf-8', errors='replace'), proc.returncode > 0
+
+
+def union_fallback(rel_path: str) -> bool:
+    """Whether a conflicting file may keep both sides (prose, not code)"""
+    return rel_path.lower().endswith(UNION_SUFFIXES)
+
+
+def has_conflict_markers(text: str) -> bool:
+    return any(line.startswith(CONFLICT_MARKERS) for line in text.split('\n'))
+
+
+def merge_file_sets(
+    snapshot: Dict[str, str],
+    proposals: List[Tuple[str, Dict[str, str]]]
+) -> Tuple[Dict[str, str], Dict[str, Dict]]:
+    """
+    Merge the files each feature generated
+
+    Args:
+        snapshot: {relative path: content} of the skill before integration
+        proposals: [(feature name, {relative path: content})] in feature order
+
+    Returns:
+        (merged, conflicts). merged maps every touched path to its merged
+        content. conflicts maps paths that could not be merged cleanly to
+        {'base': str, 'versions': {label: content}}, one version per
+        feature that touched the file. As a fallback, merged holds a union
+        merge of them for Markdown, and for any other file the version
+        merged before the first conflict (later features' edits are left
+        out).
+    """
+
+    merged = {}
+    labels = {}
+    conflicts = {}
+
+    for feature, files in proposals:
+        for rel_path, content in files.items():
+            base = snapshot.get(rel_path, '')
+
+            if rel_path in conflicts:
+                conflicts[rel_path]['versions'][feature] = content
+                if union_fallback(rel_path):
+                    merged[rel_path], _ = merge_three_way(base, merged[rel_path], content, union=True)
+                continue
+
+            if rel_path not in merged:
+                merged[rel_path] = content
+                labels[rel_path] = [feature]
+                continue
+
+            ours_label = '+'.join(labels[rel_path])
+            text, conflicted = merge_three_way(base, merged[rel_path], content, ours_label, feature)
+            if conflicted:
+                conflicts[rel_path] = {
+                    'base': base,
+                    'versions': {ours_label: merged[rel_path], feature: content},
+                }
+                if union_fallback(rel_path):
+                    text, _ = merge_three_way(base, merged[rel_path], content, union=True)
+                else:
+                    text = merged[rel_path]
+            merged[rel_path] = text
+            labels[rel_path].append(feature)
+
+    return merged, conflicts
+
+
+def build_resolution_prompt(rel_path: str, base: str, versions: Dict[str, str], user_requirement: str) -> str:
+    """Prompt asking for one file that keeps the changes of every version"""
+
+    parts = [f"""Several features were added to a skill in parallel and their edits to {rel_path} conflict.
+
+USER REQUIREMENT: {user_requirement}
+
+ORIGINAL {rel_path}:
+```
+{base}
+```
+"""]
+    for label, content in versions.items():
+        parts.append(f"""VERSION WITH FEATURE(S) {label}:
+```
+{content}
+```
+""")
+    parts.append(f"""TASK:
+Write the single final {rel_path} that keeps every feature's changes and
+the original content none of them removed. No conflict markers.
+
+OUTPUT:
+```filename: {rel_path}
+[complete file]
+```""")
+    return "\n".join(parts)
+
+
+def resolve_conflict(
+    client,
+    rel_path: str,
+    conflict: Dict,
+    user_requirement: str,
+    max_tokens: int = 4000
+) -> Optional[str]:
+    """
+    Re-prompt the LLM for one conflicting file
+
+    Returns:
+        The resolved content, or None if the response is unusable (no
+        file, leftover conflict markers, or Python that does not compile)
+    """
+
+    import re
+
+    response = client.simple_prompt(
+        prompt=build_resolution_prompt(rel_path, conflict['base'], conflict['versions'], user_requirement),
+        max_tokens=max_tokens,
+        temperature=0.2
+    )
+
+    match = re.search(r'```(?:filename:\s*[^\n]+|[a-z]*)\n(.*?)```', response, re.DOTALL)
+    if not match:
+        return None
+    content = match.group(1)
+
+    if has_conflict_markers(content):
+        return None
+    if rel_path.endswith('.py'):
+        try:
+            compile(content, rel_path, 'exec')
+        except (SyntaxError, ValueError):
+            return None
+    return content
@@ -7,6 +7,7 @@ Checks if a perfect match already exists in installed skills
 
 import subprocess
 import json
+from functools import lru_cache
 from typing import Optional, Dict
 
 
@@ -50,28 +51,20 @@ def get_installed_skills() -> list:
     """
     Get list of installed skills
 
-    Checks ~/.claude/skills/ directory
+    Checks ~/.claude/skills/ directory through the skill catalog, so
+    SKILL.md files are only re-parsed when they change. Skills without a
+    description are left out: there is nothing to match against.
     """
 
-    import os
     from pathlib import Path
+    from skill_catalog import get_catalog_skills
 
     skills_dir = Path.home() / '.claude' / 'skills'
 
     if not skills_dir.exists():
         return []
 
-    installed = []
-    for skill_path in skills_dir.iterdir():
-        if skill_path.is_dir():
-            skill_md = skill_path / 'SKILL.md'
-            if skill_md.exists():
-                # Parse SKILL.md
-                info = parse_skill_md(skill_md)
-                if info:
-                    installed.append(info)
-
-    return installed
+    return [s for s in get_catalog_skills(skills_dir) if s['description']]
 
 
 def parse_skill_md(skill_md_path) -> Optional[Dict]:
@@ -89,26 +82,19 @@ def parse_skill_md(skill_md_path) -> Optional[Dict]:
         }
     """
 
-    try:
-        content = skill_md_path.read_text()
-
-        # Extract YAML frontmatter
-        import re
-        frontmatter_match = re.search(r'---\n(.*?)\n---', content, re.DOTALL)
+    from frontmatter import read_frontmatter
 
-        if frontmatter_match:
-            frontmatter = frontmatter_match.group(1)
-
-            # Simple YAML parsing
-            name_match = re.search(r'name:\s*(.+)', frontmatter)
-            desc_match = re.search(r'description:\s*(.+)', frontmatter)
+    try:
+        # Only the frontmatter block is read, not the whole document
+        meta = read_frontmatter(skill_md_path)
+        description = str(meta.get('description') or '').strip()
 
-            if name_match and desc_match:
-                return {
-                    'name': name_match.group(1).strip(),
-                    'description': desc_match.group(1).strip(),
-                    'path': str(skill_md_path.parent)
-                }
+        if description:
+            return {
+                'name': str(meta.get('name') or skill_md_path.parent.name).strip(),
+                'description': description,
+                'path': str(skill_md_path.parent)
+            }
 
     except Exception as e:
         print(f"⚠️  Failed to parse {skill_md_path}: {e}")
@@ -116,6 +102,14 @@ def parse_skill_md(skill_md_path) -> Optional[Dict]:
     return None
 
 
+@lru_cache(maxsize=64)
+def _key_words(requirement: str) -> tuple:
+    """Significant tokens of a requirement (see keyword_index.tokenize)"""
+    from keyword_index import tokenize
+
+    return tuple(dict.fromkeys(t for t in tokenize(requirement) if len(t) > 3))
+
+
 def is_perfect_match(requirement: str, skill: Dict) -> bool:
     """
     Check if a skill perfectly matches the requirement
@@ -123,13 +117,16 @@ def is_perfect_match(requirement: str, skill: Dict) -> bool:
     Uses simple heuristics - in real implementation, use LLM
     """
 
-    req_lower = requirement.lower()
-    desc_lower = skill['description'].lower()
+    key_words = _key_words(requirement)
 
-    # Check if key words from requirement are in description
-    key_words = [w for w in req_lower.split() if len(w) > 3]
+    # Catalog entries carry precomputed description tokens
+    tokens = skill.get('description_tokens')
+    if tokens is None:
+        from keyword_index import tokenize
+        tokens = set(tokenize(skill['description']))
 
-    matches = sum(1 for word in key_words if word in desc_lower)
+    # Check if key words from requirement are in description
+    matches = sum(1 for word in key_words if word in tokens)
 
     # Perfect match if > 70% of key words match
     threshold = len(key_words) * 0.7
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Bounded SKILL.md frontmatter reader
+
+Reads only the leading `---` block of a file, line by line, and stops at
+the closing `---` (or after MAX_FRONTMATTER_BYTES), so scanning a whole
+catalog costs a few KB of I/O per skill however long the docs are.
+Results are memoized by (path, mtime, size). YAML is parsed with the C
+loader (CSafeLoader) when PyYAML was built with libyaml, the pure-Python
+SafeLoader otherwise, and a minimal key/value parser without PyYAML.
+PyYAML is imported on first parse, not with this module.
+"""
+
+import os
+import re
+import copy
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# Frontmatter is a few lines; anything bigger is not frontmatter
+MAX_FRONTMATTER_BYTES = 64 * 1024
+
+MEMO_SIZE = 4096
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+# (yaml module, loader) once imported; (None, None) without PyYAML
+_yaml = None
+
+
+class FrontmatterError(ValueError):
+    """The file opens a frontmatter block that is not closed (or is too big)"""
+
+
+def _read_block(path: str, max_bytes: int) -> Optional[str]:
+    with open(path, 'rb') as f:
+        first = f.readline(max_bytes)
+        if first.startswith(b'\xef\xbb\xbf'):
+            first = first[3:]
+        if not first.startswith(b'---'):
+            return None
+        if first.rstrip() != b'---':
+            raise FrontmatterError("Opening '---' line has trailing text")
+
+        lines = []
+        used = len(first)
+        while used < max_bytes:
+            line = f.readline(max_bytes - used)
+            if not line:
+                raise FrontmatterError("Frontmatter is not closed with '---'")
+            used += len(line)
+            if line.rstrip() == b'---':
+                return b''.join(lines).decode('utf-8', errors='replace').rstrip('\r\n')
+            lines.append(line)
+
+    raise FrontmatterError(f"Frontmatter is larger than {max_bytes} bytes")
+
+
+def _memoized(path, kind, parse):
+    """Result of parse(path) for this (kind, path, mtime, size), computed once"""
+
+    path = os.fspath(path)
+    st = os.stat(path)
+    key = (kind, path, st.st_mtime_ns, st.st_size)
+
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            result = _memo[key]
+            if isinstance(result, FrontmatterError):
+                raise FrontmatterError(str(result))
+            return result
+
+    try:
+        result = parse(path)
+    except FrontmatterError as e:
+        result = e
+
+    with _memo_lock:
+        _memo[key] = result
+        if len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+
+    if isinstance(result, FrontmatterError):
+        raise FrontmatterError(str(result))
+    return result
+
+
+def read_frontmatter_text(path: Path, max_bytes: int = MAX_FRONTMATTER_BYTES) -> Optional[str]:
+    """
+    Text between the leading `---` lines of a file
+
+    Returns:
+        The frontmatter text, or None if the file does not start with `---`
+
+    Raises:
+        FrontmatterError: the block is not closed within max_bytes
+        OSError: the file cannot be read
+    """
+
+    return _memoized(path, ('text', max_bytes), lambda p: _read_block(p, max_bytes))
+
+
+def yaml_loader() -> Tuple[Any, Any]:
+    """
+    (yaml module, fastest safe loader), imported on first use
+
+    Returns (None, None) when PyYAML is not installed.
+    """
+
+    global _yaml
+    if _yaml is None:
+        try:
+            import yaml
+            _yaml = (yaml, getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+        except ImportError:
+            _yaml = (None, None)
+    return _yaml
+
+
+def load_yaml(text: str) -> Any:
+    """Parse YAML with the fastest safe loader available (requires PyYAML)"""
+    yaml, loader = yaml_loader()
+    return yaml.load(text, Loader=loader)
+
+
+def parse_frontmatter_block(text: str) -> Dict:
+    """
+    Frontmatter text as a dict
+
+    Uses PyYAML when installed, with a minimal key/value fallback that also
+    recovers name/description from malformed YAML.
+    """
+
+    if yaml_loader()[0] is not None:
+        try:
+            meta = load_yaml(text)
+            if isinstance(meta, dict):
+                return meta
+        except Exception:
+            pass
+
+    return parse_simple_yaml(text)
+
+
+def parse_simple_yaml(text: str) -> Dict:
+    """Top-level scalar keys only, including | and > block scalars"""
+
+    meta = {}
+    lines = text.split('\n')
+    i = 0
+    while i < len(lines):
+        match = re.match(r'^([A-Za-z0-9_-]+):\s*(.*)$', lines[i])
+        i += 1
+        if not match:
+            continue
+
+        key, value = match.group(1), match.group(2).strip()
+        if value in ('|', '>', '|-', '>-'):
+            block = []
+            while i < len(lines) and (lines[i].startswith((' ', '\t')) or not lines[i].strip()):
+                block.append(lines[i].strip())
+                i += 1
+            joiner = '\n' if value.startswith('|') else ' '
+            value = joiner.join(block).strip()
+        elif len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+            value = value[1:-1]
+
+        meta[key] = value
+
+    return meta
+
+
+def _parse_file(path: str) -> Dict:
+    try:
+        text = _read_block(path, MAX_FRONTMATTER_BYTES)
+    except FrontmatterError:
+        return {}
+    return parse_frontmatter_block(text) if text is not None else {}
+
+
+def read_frontmatter(path: Path) -> Dict:
+    """
+    Frontmatter of a SKILL.md as a dict ({} if it has none)
+
+    Only the frontmatter block is read, and the parsed result is memoized
+    by (path, mtime, size); callers get their own copy.
+
+    Raises:
+        OSError: the file cannot be read
+    """
+
+    return copy.deepcopy(_memoized(path, 'dict', _parse_file))
@@ -1,11 +1,30 @@
 #!/usr/bin/env python3
 """
 Integrate new features into skill using LLM fine-tuning
+
+Several features are integrated concurrently against one snapshot of the
+skill; the files each generates are then three-way merged (see
+feature_merge.py) and only conflicting files are sent back to the LLM.
 """
 
 import os
+import re
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cache_utils import atomic_write_text
+from check_compatibility import check_files
+from code_context import DEFAULT_CONTEXT_TOKENS, build_code_context
+from feature_merge import merge_file_sets, resolve_conflict, union_fallback
+
+
+FILE_BLOCK_RE = re.compile(r'```filename:\s*([^\n]+)\n(.*?)```', re.DOTALL)
+
+FILE_BLOCK_START = '```filename:'
+FENCE = '```'
 
 
 def integrate_and_adapt(
@@ -24,48 +43,207 @@ def integrate_and_adapt(
         user_requirement: Original user requirement for context
     """
 
-    print(f"      Analyzing existing skill structure...")
+    integrate_features(skill_path, {feature_name: implementation}, user_requirement)
 
-    # Read existing skill code
-    existing_code = read_skill_code(skill_path)
 
-    # Get API key
-    api_key = os.environ.get('ANTHROPIC_API_KEY') or os.environ.get('AI_GATEWAY_API_KEY')
+def integrate_features(
+    skill_path: Path,
+    implementations: Dict[str, Dict],
+    user_requirement: str,
+    max_workers: int = 4,
+    cache_dir: Optional[Path] = None
+) -> Dict:
+    """
+    Integrate several features concurrently and merge their changes
 
-    if not api_key:
-        print("      ⚠️  No API key found, using template integration...")
-        integrate_with_template(skill_path, feature_name, implementation)
-        return
+    Every feature is generated against the same snapshot of the skill, so
+    generations run in parallel and no feature sees (or clobbers) another's
+    half-applied edits. Files touched by several features are three-way
+    merged with the snapshot as base; conflicting files are re-prompted
+    once. If that fails, Markdown falls back to a union merge and code
+    files keep the version merged before the conflict, reported in
+    'unresolved'.
+
+    Responses are streamed: a file is written as soon as its block closes
+    (unless another feature already claimed that path, in which case it
+    waits for the merge) and its compatibility check starts right away,
+    while generation continues.
+
+    Args:
+        skill_path: Path to skill directory
+        implementations: {feature name: implementation dict}
+        user_requirement: Original user requirement for context
+        max_workers: Concurrent LLM generations
+        cache_dir: Workspace holding the compatibility cache, so the
+            checks done here are reused by check_environment_compatibility
+
+    Returns:
+        {'written': [paths], 'conflicts': [paths], 'resolved': [paths],
+         'unresolved': [paths], 'issues': {path: [issues]}}
+    """
 
-    # Use LLM to integrate via AI Gateway
+    skill_path = Path(skill_path)
+    result = {'written': [], 'conflicts': [], 'resolved': [], 'unresolved': [], 'issues': {}}
+    if not implementations:
+        return result
+
+    print(f"      Analyzing existing skill structure...")
+    snapshot = snapshot_skill(skill_path)
+    client = _create_client()
+
+    # Contexts come from the snapshot, before any streamed file lands on disk
+    contexts = {}
+    if client is not None:
+        contexts = {
+            feature: read_skill_code(skill_path, f"{feature} {user_requirement}")
+            for feature in implementations
+        }
+
+    on_disk = dict(snapshot)
+    owners = {}
+    lock = threading.Lock()
+    checks = []
+
+    # One checker thread: check_files updates the cache file non-atomically
+    with ThreadPoolExecutor(max_workers=1) as checker:
+
+        def write_and_check(rel_path: str, content: str):
+            if on_disk.get(rel_path) != content:
+                write_file(skill_path, rel_path, content)
+                on_disk[rel_path] = content
+                result['written'].append(rel_path)
+            checks.append((rel_path, checker.submit(check_files, skill_path, [rel_path], cache_dir)))
+
+        def file_closed(feature: str, rel_path: str, content: str):
+            with lock:
+                if owners.setdefault(rel_path, feature) == feature:
+                    write_and_check(rel_path, content)
+
+        workers = max(1, min(max_workers, len(implementations)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                (feature, pool.submit(generate_feature_files, client, snapshot, feature, impl,
+                                      user_requirement, contexts.get(feature, ''),
+                                      functools.partial(file_closed, feature)))
+                for feature, impl in implementations.items()
+            ]
+            proposals = [(feature, future.result()) for feature, future in futures]
+
+        merged, conflicts = merge_file_sets(snapshot, proposals)
+
+        for rel_path, conflict in conflicts.items():
+            result['conflicts'].append(rel_path)
+            print(f"      ⚠️  Conflicting edits to {rel_path} from {', '.join(conflict['versions'])}")
+            resolved = None
+            if client is not None:
+                try:
+                    resolved = resolve_conflict(client, rel_path, conflict, user_requirement)
+                except Exception as e:
+                    print(f"      ⚠️  Conflict resolution failed: {e}")
+            if resolved is not None:
+                merged[rel_path] = resolved
+                result['resolved'].append(rel_path)
+                print(f"      ✅ Resolved: {rel_path}")
+            elif union_fallback(rel_path):
+                print(f"      Keeping both sides of {rel_path}")
+            else:
+                kept, *dropped = conflict['versions']
+                result['unresolved'].append(rel_path)
+                print(f"      ⚠️  Keeping {kept}'s version of {rel_path}; "
+                      f"{', '.join(dropped)} not merged (manual review needed)")
+
+        # Files written early that the merge changed, and files only the merge produced
+        for rel_path, content in merged.items():
+            if on_disk.get(rel_path) != content:
+                write_and_check(rel_path, content)
+
+        for rel_path, future in checks:
+            issues = future.result()
+            result['issues'][rel_path] = issues
+
+    for rel_path, issues in result['issues'].items():
+        if issues:
+            print(f"      ⚠️  {rel_path}: {len(issues)} compatibility issue(s)")
+
+    result['written'] = sorted(set(result['written']))
+    return result
+
+
+def _create_client():
+    """AI Gateway client, or None when no API key is configured"""
+
+    if not (os.environ.get('ANTHROPIC_API_KEY') or os.environ.get('AI_GATEWAY_API_KEY')):
+        print("      ⚠️  No API key found, using template integration...")
+        return None
     try:
         from ai_gateway import create_client
-        client = create_client()
+        return create_client()
+    except Exception as e:
+        print(f"      ⚠️  LLM integration failed: {e}")
+        print(f"      Using template integration...")
+        return None
+
+
+def snapshot_skill(skill_path: Path) -> Dict[str, str]:
+    """Text files of the skill, {relative path: content}"""
 
-        prompt = build_integration_prompt(
-            existing_code,
-            feature_name,
-            implementation,
-            user_requirement
-        )
+    snapshot = {}
+    for path in sorted(Path(skill_path).rglob('*')):
+        if not path.is_file() or '__pycache__' in path.parts:
+            continue
+        try:
+            snapshot[path.relative_to(skill_path).as_posix()] = path.read_text(encoding='utf-8')
+        except (UnicodeDecodeError, OSError):
+            continue
+    return snapshot
 
-        print(f"      Generating integrated code with GPT-4...")
 
-        integrated_code = client.simple_prompt(
-            prompt=prompt,
-            max_tokens=4000,
-            temperature=0.5
-        )
+def generate_feature_files(
+    client,
+    snapshot: Dict[str, str],
+    feature_name: str,
+    implementation: Dict,
+    user_requirement: str,
+    existing_code: str = '',
+    on_file: Optional[Callable[[str, str], None]] = None
+) -> Dict[str, str]:
+    """
+    Files one feature adds or changes
 
-        # Save integrated code
-        save_integrated_code(skill_path, feature_name, integrated_code)
+    With a streaming client, on_file(rel_path, content) is called for each
+    file as soon as its block is complete. Template files (no LLM) are
+    returned without calling on_file; they go through the merge.
 
-        print(f"      ✅ Feature integrated successfully")
+    Returns:
+        {relative path: new content}
+    """
 
-    except Exception as e:
-        print(f"      ⚠️  LLM integration failed: {e}")
-        print(f"      Using template integration...")
-        integrate_with_template(skill_path, feature_name, implementation)
+    if client is not None:
+        prompt = build_integration_prompt(existing_code, feature_name, implementation, user_requirement)
+
+        print(f"      Generating {feature_name} with GPT-4...")
+        stream = FileBlockStream()
+        try:
+            if hasattr(client, 'stream_prompt'):
+                for chunk in client.stream_prompt(prompt=prompt, max_tokens=4000):
+                    for rel_path, content in stream.feed(chunk):
+                        if on_file:
+                            on_file(rel_path, content)
+            else:
+                stream.feed(client.simple_prompt(prompt=prompt, max_tokens=4000, temperature=0.5))
+            if stream.files:
+                print(f"      ✅ Generated {feature_name}: {', '.join(stream.files)}")
+                return stream.files
+            print(f"      ⚠️  No files in response for {feature_name}")
+        except Exception as e:
+            print(f"      ⚠️  LLM integration failed: {e}")
+            if stream.files:
+                # Closed blocks are complete files; keep what arrived
+                print(f"      Keeping {len(stream.files)} complete file(s) for {feature_name}")
+                return stream.files
+        print(f"      Using template integration for {feature_name}...")
+
+    return template_files(snapshot, feature_name, implementation)
 
 
 def build_integration_prompt(
@@ -117,61 +295,141 @@ Focus on creating clean, working code that integrates seamlessly."""
     return prompt
 
 
-def read_skill_code(skill_path: Path) -> str:
+def read_skill_code(skill_path: Path, query: str = '', budget: int = DEFAULT_CONTEXT_TOKENS) -> str:
     """
     Read existing skill code for context
 
+    Scripts are summarized with the AST (signatures, docstrings, calls) and
+    the parts most relevant to the query are packed into a token budget;
+    see code_context.py.
+
+    Args:
+        skill_path: Path to skill directory
+        query: What the context is for (feature name and requirement)
+        budget: Token budget for the context
+
     Returns:
         String summary of skill structure and key files
     """
 
-    structure = []
+    return build_code_context(skill_path, query, budget)
 
-    # Read SKILL.md
-    skill_md = skill_path / "SKILL.md"
-    if skill_md.exists():
-        content = skill_md.read_text()
-        structure.append(f"=== SKILL.md ===\n{content[:1000]}...\n")
 
-    # List scripts
-    scripts_dir = skill_path / "scripts"
-    if scripts_dir.exists():
-        structure.append(f"\n=== scripts/ ===")
-        for script in scripts_dir.glob("*.py"):
-            structure.append(f"- {script.name}")
-            # Include first 500 chars of each script
-            content = script.read_text()
-            structure.append(f"  Preview: {content[:500]}...\n")
+def parse_file_blocks(response: str) -> Dict[str, str]:
+    """
+    Files from an LLM response in ```filename: path blocks
+
+    Paths that would leave the skill directory are dropped.
+    """
 
-    return "\n".join(structure)
+    files = {}
+    for filename, code in FILE_BLOCK_RE.findall(response):
+        rel_path = skill_relative_path(filename)
+        if rel_path is not None:
+            files[rel_path] = code
+    return files
 
 
-def save_integrated_code(skill_path: Path, feature_name: str, integrated_code: str):
+def skill_relative_path(filename: str) -> Optional[str]:
+    """Normalized path of a generated file, None if it would leave the skill"""
+
+    rel_path = Path(filename.strip())
+    if rel_path.is_absolute() or '..' in rel_path.parts:
+        print(f"      ⚠️  Ignoring file outside the skill: {filename.strip()}")
+        return None
+    return rel_path.as_posix()
+
+
+class FileBlockStream:
     """
-    Parse and save the integrated code from LLM response
+    Incremental parser for ```filename: blocks in a streamed response
+
+    feed() takes text chunks as they arrive and returns the blocks that
+    closed in them; it finds the same blocks as parse_file_blocks on the
+    full text. All complete files so far are in .files.
+    """
+
+    def __init__(self):
+        self.files: Dict[str, str] = {}
+        self._buffer = ''
+        self._pos = 0
+        self._filename: Optional[str] = None
+        self._body_start = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        self._buffer += chunk
+        closed = []
+
+        while True:
+            if self._filename is None:
+                start = self._buffer.find(FILE_BLOCK_START, self._pos)
+                if start < 0:
+                    # Keep a tail that may be the start of a split marker
+                    self._pos = max(self._pos, len(self._buffer) - len(FILE_BLOCK_START) + 1)
+                    break
+                header_end = self._buffer.find('\n', start)
+                if header_end < 0:
+                    self._pos = start
+                    break
+                self._filename = self._buffer[start + len(FILE_BLOCK_START):header_end]
+                self._body_start = self._pos = header_end + 1
+            else:
+                end = self._buffer.find(FENCE, self._pos)
+                if end < 0:
+                    self._pos = max(self._body_start, len(self._buffer) - len(FENCE) + 1)
+                    break
+                rel_path = skill_relative_path(self._filename)
+                if rel_path is not None:
+                    content = self._buffer[self._body_start:end]
+                    self.files[rel_path] = content
+                    closed.append((rel_path, content))
+                self._filename = None
+                self._pos = end + len(FENCE)
+
+        # Drop consumed text so long responses do not grow the buffer
+        if self._filename is None and self._pos > 0:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        return closed
+
+
+def write_files(skill_path: Path, files: Dict[str, str], snapshot: Optional[Dict[str, str]] = None) -> list:
+    """
+    Write merged files atomically, skipping unchanged ones
+
+    Returns:
+        Relative paths that were written
     """
 
-    import re
+    snapshot = snapshot or {}
+    written = []
+    for rel_path, content in files.items():
+        if snapshot.get(rel_path) == content:
+            continue
+        write_file(skill_path, rel_path, content)
+        written.append(rel_path)
+    return written
+
+
+def write_file(skill_path: Path, rel_path: str, content: str):
+    """Write one generated file atomically"""
 
-    # Extract code blocks
-    pattern = r'```filename:\s*([^\n]+)\n(.*?)```'
-    matches = re.findall(pattern, integrated_code, re.DOTALL)
+    file_path = skill_path / rel_path
+    atomic_write_text(file_path, content)
 
-    for filename, code in matches:
-        filename = filename.strip()
-        file_path = skill_path / filename
+    # Make scripts executable
+    if file_path.suffix == '.py' and 'scripts' in file_path.parts:
+        file_path.chmod(0o755)
 
-        # Create parent directories
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+    print(f"      ✅ Saved: {rel_path}")
 
-        # Save file
-        file_path.write_text(code)
 
-        # Make scripts executable
-        if file_path.suffix == '.py' and 'scripts' in str(file_path):
-            file_path.chmod(0o755)
+def save_integrated_code(skill_path: Path, feature_name: str, integrated_code: str):
+    """
+    Parse and save the integrated code from LLM response
+    """
 
-        print(f"      ✅ Saved: {filename}")
+    write_files(skill_path, parse_file_blocks(integrated_code))
 
 
 def integrate_with_template(skill_path: Path, feature_name: str, implementation: Dict):
@@ -179,8 +437,16 @@ def integrate_with_template(skill_path: Path, feature_name: str, implementation:
     Fallback: Integrate using template (no LLM)
     """
 
-    # Create a simple template file
-    script_path = skill_path / "scripts" / f"{feature_name}.py"
+    write_files(skill_path, template_files(snapshot_skill(skill_path), feature_name, implementation))
+
+
+def template_files(snapshot: Dict[str, str], feature_name: str, implementation: Dict) -> Dict[str, str]:
+    """
+    Template script and SKILL.md section for a feature (no LLM)
+
+    Returns:
+        {relative path: new content}
+    """
 
     template_code = f"""#!/usr/bin/env python3
 \"\"\"
@@ -226,20 +492,14 @@ if __name__ == "__main__":
         print("Usage: python {feature_name}.py <input_file>")
 """
 
-    script_path.write_text(template_code)
-    script_path.chmod(0o755)
-
-    print(f"      ✅ Created template: {script_path.name}")
-
-    # Update SKILL.md
-    skill_md = skill_path / "SKILL.md"
-    if skill_md.exists():
-        content = skill_md.read_text()
+    files = {f"scripts/{feature_name}.py": template_code}
 
-        # Add feature to SKILL.md
+    # Add feature to SKILL.md
+    if 'SKILL.md' in snapshot:
         addition = f"\n\n## {feature_name.title()}\n\nNew feature added by HappyCapy Skill Creator.\n\nUsage:\n```bash\npython scripts/{feature_name}.py <input>\n```\n"
+        files['SKILL.md'] = snapshot['SKILL.md'] + addition
 
-        skill_md.write_text(content + addition)
+    return files
 
 
 if __name__ == "__main__":
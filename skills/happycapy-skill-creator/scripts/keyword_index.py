@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+BM25 inverted index over skill metadata
+
+Keyword ranking used when the AI Gateway is unavailable. The index is built
+once per skill list and cached; queries only touch the postings of the query
+terms.
+"""
+
+import re
+import math
+from typing import Dict, List
+
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'i', 'in',
+    'is', 'it', 'me', 'my', 'need', 'of', 'on', 'or', 'that', 'the', 'this',
+    'to', 'use', 'want', 'when', 'with', 'you', 'your'
+}
+
+# Field boosts: a match in the name or tags says more than one in the body
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'tags': 2.0,
+    'description': 1.0,
+    'body': 0.3,
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# ASCII words (keeping hyphenated compounds together) or runs of CJK characters
+TOKEN_RE = re.compile(
+    r'[a-z0-9]+(?:-[a-z0-9]+)*'
+    r'|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]+'
+)
+
+
+def stem(word: str) -> str:
+    """Light suffix stripping so 'compressing' and 'compress' match"""
+
+    if len(word) <= 4 or word.isdigit():
+        return word
+    for suffix, min_len in (('ing', 6), ('ies', 5), ('es', 5), ('ed', 5), ('ly', 5), ('s', 4)):
+        if word.endswith(suffix) and len(word) >= min_len:
+            if suffix == 'ies':
+                return word[:-3] + 'y'
+            if suffix == 's' and word.endswith('ss'):
+                return word
+            if suffix == 'es' and not word.endswith(('sses', 'xes', 'ches', 'shes')):
+                return word[:-1]
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Tokenize English and CJK text
+
+    - Hyphenated names yield their parts plus the joined form
+      ("image-enhancer" -> "image", "enhancer", "imageenhancer")
+    - CJK runs yield single characters and bigrams, since there are no spaces
+    """
+
+    tokens = []
+    for match in TOKEN_RE.finditer(text.lower()):
+        word = match.group()
+
+        if word[0].isascii():
+            parts = word.split('-')
+            for part in parts:
+                if part not in STOPWORDS:
+                    tokens.append(stem(part))
+            if len(parts) > 1:
+                tokens.append(''.join(parts))
+        else:
+            tokens.extend(word)
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+
+    return tokens
+
+
+def skill_fields(skill: Dict) -> Dict[str, str]:
+    """Text of each indexed field of a skill"""
+
+    return {
+        'name': skill['name'],
+        'tags': ' '.join(skill.get('tags', [])),
+        'description': skill.get('description', ''),
+        'body': skill.get('body', ''),
+    }
+
+
+class KeywordIndex:
+    """BM25F inverted index with per-field boosts"""
+
+    def __init__(self, skills: List[Dict], field_weights: Dict[str, float] = None):
+        self.field_weights = field_weights or FIELD_WEIGHTS
+        self.names = [s['name'] for s in skills]
+
+        field_tfs = {field: [] for field in self.field_weights}
+        for skill in skills:
+            fields = skill_fields(skill)
+            for field in self.field_weights:
+                tf = {}
+                for token in tokenize(fields[field]):
+                    tf[token] = tf.get(token, 0) + 1
+                field_tfs[field].append(tf)
+
+        n_docs = len(skills)
+        avg_len = {
+            field: (sum(sum(tf.values()) for tf in tfs) / n_docs if n_docs else 0) or 1.0
+            for field, tfs in field_tfs.items()
+        }
+
+        # Length-normalized, boosted term frequency per (term, doc)
+        weighted = {}
+        for field, tfs in field_tfs.items():
+            boost = self.field_weights[field]
+            for doc_id, tf in enumerate(tfs):
+                norm = 1 - BM25_B + BM25_B * sum(tf.values()) / avg_len[field]
+                for token, count in tf.items():
+                    docs = weighted.setdefault(token, {})
+                    docs[doc_id] = docs.get(doc_id, 0.0) + boost * count / norm
+
+        self.max_idf = math.log(1 + (n_docs + 0.5) / 0.5)
+        self.idf = {}
+        self.postings = {}
+        for token, docs in weighted.items():
+            df = len(docs)
+            self.idf[token] = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            self.postings[token] = [
+                (doc_id, wtf / (BM25_K1 + wtf)) for doc_id, wtf in docs.items()
+            ]
+
+    def search(self, query: str) -> Dict[str, float]:
+        """
+        Score skills against a query
+
+        Returns:
+            {skill_name: similarity} for matching skills, similarity in (0, 1].
+            Similarity is the BM25 score relative to a document that
+            saturates every query term.
+        """
+
+        terms = set(tokenize(query))
+        if not terms:
+            return {}
+
+        max_score = sum(self.idf.get(t, self.max_idf) for t in terms) or 1.0
+
+        scores = {}
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf[term]
+            for doc_id, saturation in postings:
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * saturation
+
+        return {self.names[doc_id]: score / max_score for doc_id, score in scores.items()}
+
+
+_cache = {}
+
+
+def _index_key(skills: List[Dict]) -> tuple:
+    """
+    Identity of a skill list's indexed content
+
+    Catalog skills carry the SKILL.md content hash (see skill_catalog.py),
+    which covers every indexed field; other lists are keyed on the fields
+    themselves.
+    """
+
+    if all('content_hash' in s for s in skills):
+        return tuple((s['name'], s['content_hash']) for s in skills)
+    return tuple(
+        (s['name'], s.get('description', ''), tuple(s.get('tags', ())), s.get('body', ''))
+        for s in skills
+    )
+
+
+def get_keyword_index(skills: List[Dict]) -> KeywordIndex:
+    """Build the index for a skill list once and reuse it while the list is unchanged"""
+
+    key = _index_key(skills)
+    index = _cache.get(key)
+    if index is None:
+        _cache.clear()
+        index = _cache[key] = KeywordIndex(skills)
+    return index
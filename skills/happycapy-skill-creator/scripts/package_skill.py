@@ -1,36 +1,275 @@
 #!/usr/bin/env python3
 """
 Package skill into .skill file
+
+Packages are reproducible: files are added in sorted order with a fixed
+timestamp and normalized permissions, so the same content always gives
+the same bytes. Files matching .skillignore (plus caches such as
+__pycache__) are left out, already-compressed media is stored instead of
+deflated, and large files are compressed in parallel.
+
+The archive comment holds a hash of the content manifest; when it matches
+the skill's current manifest the existing package is kept as is.
 """
 
+import fnmatch
+import hashlib
+import os
+import struct
 import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+IGNORE_FILE = '.skillignore'
+
+DEFAULT_IGNORE = [
+    '__pycache__/', '*.pyc', '*.pyo', '.DS_Store', '.git/', '.pytest_cache/',
+    '.compat_cache/', '.test_cache/', '*.skill', '*.tmp', IGNORE_FILE,
+]
+
+# Formats that are already compressed: deflating them again costs time for nothing
+STORED_SUFFIXES = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.heic', '.ico',
+    '.mp3', '.mp4', '.m4a', '.mov', '.webm', '.ogg', '.flac', '.avi', '.mkv',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.7z', '.rar', '.jar', '.whl',
+    '.docx', '.xlsx', '.pptx', '.odt', '.epub', '.woff', '.woff2',
+}
+
+# Earliest time a zip entry can hold
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Files at least this big are deflated in worker threads (zlib releases the GIL)
+PARALLEL_MIN_BYTES = 256 * 1024
+
+MANIFEST_PREFIX = b'skill-manifest-sha256:'
+
+ZIP32_LIMIT = 0xFFFFFFFF
+
+
+def load_ignore_patterns(skill_path: Path) -> List[str]:
+    """Default patterns plus the skill's .skillignore (gitignore-style subset)"""
+
+    patterns = list(DEFAULT_IGNORE)
+    ignore_file = Path(skill_path) / IGNORE_FILE
+    if ignore_file.is_file():
+        for line in ignore_file.read_text(errors='replace').split('\n'):
+            line = line.strip()
+            if line and not line.startswith('#'):
+                patterns.append(line)
+    return patterns
+
+
+def is_ignored(rel_path: str, patterns: List[str], is_dir: bool = False) -> bool:
+    """
+    Whether a path (relative, '/'-separated) is excluded
+
+    Supports `*`/`?` globs, a trailing `/` for directories only, a leading
+    `/` to anchor at the skill root, and `!` to re-include. Patterns
+    without a `/` match any path component's name.
+    """
+
+    ignored = False
+    name = rel_path.rsplit('/', 1)[-1]
+    for pattern in patterns:
+        negate = pattern.startswith('!')
+        if negate:
+            pattern = pattern[1:]
+        if pattern.endswith('/'):
+            if not is_dir:
+                continue
+            pattern = pattern.rstrip('/')
+        if pattern.startswith('/'):
+            matched = fnmatch.fnmatchcase(rel_path, pattern.lstrip('/'))
+        elif '/' in pattern:
+            matched = fnmatch.fnmatchcase(rel_path, pattern)
+        else:
+            matched = fnmatch.fnmatchcase(name, pattern)
+        if matched:
+            ignored = not negate
+    return ignored
+
+
+def collect_files(skill_path: Path, patterns: Optional[List[str]] = None) -> List[str]:
+    """Relative paths of the files to package, sorted"""
+
+    skill_path = Path(skill_path)
+    if patterns is None:
+        patterns = load_ignore_patterns(skill_path)
+
+    files = []
+    for dirpath, dirnames, filenames in os.walk(skill_path):
+        rel_dir = Path(dirpath).relative_to(skill_path).as_posix()
+        prefix = '' if rel_dir == '.' else f'{rel_dir}/'
+        dirnames[:] = [d for d in dirnames if not is_ignored(prefix + d, patterns, is_dir=True)]
+        for filename in filenames:
+            rel_path = prefix + filename
+            if not is_ignored(rel_path, patterns) and os.path.isfile(os.path.join(dirpath, filename)):
+                files.append(rel_path)
+    return sorted(files)
+
+
+def manifest_digest(skill_path: Path, files: List[str], arc_root: str) -> str:
+    """Hash over every packaged path, its mode and its content"""
+
+    digest = hashlib.sha256(arc_root.encode())
+    for rel_path in files:
+        path = Path(skill_path) / rel_path
+        digest.update(f'\0{rel_path}\0{_file_mode(path):o}\0'.encode())
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
 
 
-def package_skill(skill_path: Path, skill_name: str) -> Path:
+def _file_mode(path: Path) -> int:
+    return 0o755 if os.access(path, os.X_OK) else 0o644
+
+
+def _dos_date_time() -> Tuple[int, int]:
+    year, month, day, hour, minute, second = FIXED_DATE_TIME
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+def _compress(path: Path) -> Tuple[int, int, int, bytes]:
+    """(method, crc, uncompressed size, data) for one file"""
+
+    data = path.read_bytes()
+    crc = zlib.crc32(data)
+    if path.suffix.lower() not in STORED_SUFFIXES and data:
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        deflated = compressor.compress(data) + compressor.flush()
+        if len(deflated) < len(data):
+            return zipfile.ZIP_DEFLATED, crc, len(data), deflated
+    return zipfile.ZIP_STORED, crc, len(data), data
+
+
+def _write_archive(out, skill_path: Path, files: List[str], arc_root: str, comment: bytes, workers: int):
+    """Write a zip archive with fixed metadata, compressing big files in parallel"""
+
+    dos_time, dos_date = _dos_date_time()
+    sizes = {rel: (Path(skill_path) / rel).stat().st_size for rel in files}
+
+    # Big files are compressed ahead in worker threads, at most 2 per worker
+    # in memory at once; small ones are done inline, in order
+    big_files = iter([rel for rel in files if sizes[rel] >= PARALLEL_MIN_BYTES])
+    futures = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        central = []
+        offset = 0
+        for rel in files:
+            while len(futures) < 2 * workers:
+                ahead = next(big_files, None)
+                if ahead is None:
+                    break
+                futures[ahead] = pool.submit(_compress, Path(skill_path) / ahead)
+
+            future = futures.pop(rel, None)
+            method, crc, size, data = future.result() if future else _compress(Path(skill_path) / rel)
+            name = f'{arc_root}/{rel}'.encode('utf-8')
+
+            header = struct.pack('<IHHHHHIIIHH', 0x04034b50, 20, 0x800, method, dos_time, dos_date,
+                                 crc, len(data), size, len(name), 0)
+            out.write(header + name)
+            out.write(data)
+
+            attr = (0o100000 | _file_mode(Path(skill_path) / rel)) << 16
+            central.append(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | 20, 20, 0x800, method,
+                                       dos_time, dos_date, crc, len(data), size, len(name), 0, 0, 0, 0,
+                                       attr, offset) + name)
+            offset += len(header) + len(name) + len(data)
+
+    directory = b''.join(central)
+    out.write(directory)
+    out.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, len(central), len(central),
+                          len(directory), offset, len(comment)) + comment)
+
+
+def _write_archive_zip64(out, skill_path: Path, files: List[str], arc_root: str, comment: bytes):
+    """Sequential fallback through zipfile for archives that need Zip64"""
+
+    with zipfile.ZipFile(out, 'w', allowZip64=True) as zipf:
+        for rel in files:
+            path = Path(skill_path) / rel
+            info = zipfile.ZipInfo(f'{arc_root}/{rel}', date_time=FIXED_DATE_TIME)
+            info.external_attr = (0o100000 | _file_mode(path)) << 16
+            info.compress_type = zipfile.ZIP_STORED if path.suffix.lower() in STORED_SUFFIXES \
+                else zipfile.ZIP_DEFLATED
+            with open(path, 'rb') as src, zipf.open(info, 'w', force_zip64=True) as dst:
+                for chunk in iter(lambda: src.read(1024 * 1024), b''):
+                    dst.write(chunk)
+        zipf.comment = comment
+
+
+def read_manifest_comment(skill_file: Path) -> Optional[str]:
+    """Manifest hash stored in an existing package, if any"""
+
+    try:
+        with zipfile.ZipFile(skill_file) as zipf:
+            comment = zipf.comment
+    except (OSError, zipfile.BadZipFile):
+        return None
+    if comment.startswith(MANIFEST_PREFIX):
+        return comment[len(MANIFEST_PREFIX):].decode('ascii', errors='replace')
+    return None
+
+
+def package_skill(
+    skill_path: Path,
+    skill_name: str,
+    output_dir: Optional[Path] = None,
+    force: bool = False,
+    max_workers: Optional[int] = None
+) -> Path:
     """
     Package skill into distributable .skill file
 
     Args:
         skill_path: Path to skill directory
         skill_name: Name for the skill
+        output_dir: Directory for the .skill file (default ./outputs)
+        force: Repackage even if the content manifest is unchanged
+        max_workers: Threads compressing large files (default: CPU count)
 
     Returns:
         Path to .skill file
     """
 
-    output_dir = Path("./outputs")
-    output_dir.mkdir(exist_ok=True)
+    skill_path = Path(skill_path)
+    output_dir = Path(output_dir) if output_dir else Path("./outputs")
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     skill_file = output_dir / f"{skill_name}.skill"
 
-    # Create zip file with .skill extension
-    with zipfile.ZipFile(skill_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        # Add all files
-        for file_path in skill_path.rglob('*'):
-            if file_path.is_file():
-                arcname = file_path.relative_to(skill_path.parent)
-                zipf.write(file_path, arcname)
+    arc_root = skill_path.resolve().name
+    files = collect_files(skill_path)
+    digest = manifest_digest(skill_path, files, arc_root)
+
+    if not force and read_manifest_comment(skill_file) == digest:
+        print(f"   ⏭️  {skill_file.name} is up to date")
+        return skill_file
+
+    comment = MANIFEST_PREFIX + digest.encode('ascii')
+
+    # Upper bound of the archive size: entries are never stored bigger than the file
+    bound = sum((skill_path / rel).stat().st_size + 2 * len(rel) + 200 for rel in files)
+    needs_zip64 = len(files) >= 0xFFFF or bound >= ZIP32_LIMIT
+
+    # Write next to the target, then rename, so a failed run never leaves a broken package
+    tmp_file = skill_file.with_name(f'.{skill_file.name}.tmp')
+    try:
+        with open(tmp_file, 'wb') as out:
+            if needs_zip64:
+                _write_archive_zip64(out, skill_path, files, arc_root, comment)
+            else:
+                _write_archive(out, skill_path, files, arc_root, comment, max_workers or os.cpu_count() or 4)
+        os.replace(tmp_file, skill_file)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
 
     return skill_file
 
@@ -38,11 +277,12 @@ def package_skill(skill_path: Path, skill_name: str) -> Path:
 if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) > 2:
-        skill_path = Path(sys.argv[1])
-        skill_name = sys.argv[2]
+    args = [a for a in sys.argv[1:] if a != '--force']
+    if len(args) > 1:
+        skill_path = Path(args[0])
+        skill_name = args[1]
 
-        output = package_skill(skill_path, skill_name)
+        output = package_skill(skill_path, skill_name, force='--force' in sys.argv)
         print(f"✅ Packaged: {output}")
     else:
-        print("Usage: python package_skill.py <skill_path> <skill_name>")
+        print("Usage: python package_skill.py <skill_path> <skill_name> [--force]")
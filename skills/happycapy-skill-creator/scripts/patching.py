@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Patch-mode LLM fixes
+
+Instead of sending a whole file and asking for the whole file back, send
+only windows around the flagged lines and ask for SEARCH/REPLACE blocks.
+The blocks are applied and verified locally. Output (and therefore latency)
+scales with the size of the change, not the size of the file, and large
+files can no longer come back truncated.
+"""
+
+import ast
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+# Lines of context shown around each flagged line
+WINDOW_CONTEXT = 12
+
+# Leading lines always shown so the model can see (and extend) the imports
+MAX_HEADER_LINES = 40
+
+# Largest file still allowed to fall back to whole-file regeneration;
+# anything bigger risks coming back truncated at max_tokens=3000
+FULL_REWRITE_MAX_CHARS = 8000
+
+BLOCK_RE = re.compile(
+    r'<{5,}\s*SEARCH[ \t]*\r?\n(.*?)\r?\n?={5,}[ \t]*\r?\n(.*?)\r?\n?>{5,}\s*REPLACE',
+    re.DOTALL
+)
+
+
+class PatchError(Exception):
+    """A patch could not be parsed or applied cleanly"""
+
+
+def header_end(code: str) -> int:
+    """Number of leading lines holding the docstring and top-level imports"""
+
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return min(10, MAX_HEADER_LINES)
+
+    end = 0
+    for node in tree.body:
+        is_docstring = (isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)
+                        and isinstance(node.value.value, str))
+        if isinstance(node, (ast.Import, ast.ImportFrom)) or (is_docstring and end == 0):
+            end = node.end_lineno
+        else:
+            break
+    return min(end, MAX_HEADER_LINES)
+
+
+def select_windows(code: str, lines: List[int], context: int = WINDOW_CONTEXT) -> List[Tuple[int, int]]:
+    """
+    Merge the regions around flagged lines into (start, end) ranges
+
+    Line numbers are 1-based and inclusive. A flagged line of 0 or less
+    (location unknown) selects the whole file.
+    """
+
+    total = code.count('\n') + 1
+    if not lines or any(line <= 0 for line in lines):
+        return [(1, total)]
+
+    ranges = []
+    head = header_end(code)
+    if head:
+        ranges.append((1, head))
+    for line in sorted(set(lines)):
+        ranges.append((max(1, line - context), min(total, line + context)))
+
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def render_windows(code: str, windows: List[Tuple[int, int]], language: str = 'python') -> str:
+    """Format the selected regions as fenced excerpts"""
+
+    lines = code.split('\n')
+    parts = []
+    for start, end in windows:
+        excerpt = '\n'.join(lines[start - 1:end])
+        parts.append(f"--- lines {start}-{end} ---\n```{language}\n{excerpt}\n```")
+    return '\n\n'.join(parts)
+
+
+def feedback_section(feedback: Optional[str]) -> str:
+    """Prompt section describing why the previous attempt was rejected"""
+
+    if not feedback:
+        return ''
+    return f"""
+PREVIOUS ATTEMPT REJECTED:
+{feedback}
+Avoid repeating this mistake.
+"""
+
+
+def build_patch_prompt(rel_path: str, code: str, issues: List[Dict], requirements: List[str],
+                       feedback: Optional[str] = None) -> str:
+    """Prompt asking for SEARCH/REPLACE blocks that fix the given issues"""
+
+    total = code.count('\n') + 1
+    windows = select_windows(code, [issue.get('line', 0) for issue in issues])
+    shown = 'the whole file is shown' if windows == [(1, total)] else 'only the relevant excerpts are shown'
+
+    issue_lines = "\n".join(
+        f"- line {issue.get('line', 0)}: {issue['type']} - {issue['description']}" for issue in issues
+    )
+    requirement_lines = "\n".join(f"- {item}" for item in requirements)
+
+    return f"""Fix this code so it runs in HappyCapy (Python 3.11, Node.js 24, no Docker/Java/Ruby/Go, 4GB RAM).
+
+FILE: {rel_path} ({total} lines; {shown})
+
+ISSUES:
+{issue_lines}
+{feedback_section(feedback)}
+EXCERPTS:
+{render_windows(code, windows)}
+
+REQUIREMENTS:
+{requirement_lines}
+- Keep the same functionality
+
+OUTPUT FORMAT:
+Reply ONLY with one or more SEARCH/REPLACE blocks:
+
+<<<<<<< SEARCH
+exact lines copied from the excerpts
+=======
+replacement lines
+>>>>>>> REPLACE
+
+Rules:
+- SEARCH text must match the file exactly, including indentation, and be unique
+- Keep each block small; do not repeat unchanged code
+- To add an import, SEARCH for an existing import line and REPLACE it with itself plus the new import"""
+
+
+def parse_search_replace(response_text: str) -> List[Tuple[str, str]]:
+    """
+    Extract (search, replace) pairs from an LLM response
+
+    Raises:
+        PatchError: If the response contains no blocks
+    """
+
+    blocks = [(m.group(1), m.group(2)) for m in BLOCK_RE.finditer(response_text)]
+    if not blocks:
+        raise PatchError("No SEARCH/REPLACE blocks in response")
+
+    # A block cut off by max_tokens must not leave a half-applied patch
+    if len(re.findall(r'<{5,}\s*SEARCH', response_text)) != len(blocks):
+        raise PatchError("Incomplete SEARCH/REPLACE block in response")
+    return blocks
+
+
+def _replace_lines_fuzzy(code: str, search: str, replace: str) -> str:
+    """Match ignoring trailing whitespace; the match must be unique"""
+
+    lines = code.split('\n')
+    needle = [l.rstrip() for l in search.split('\n')]
+    stripped = [l.rstrip() for l in lines]
+
+    hits = [
+        i for i in range(len(lines) - len(needle) + 1)
+        if stripped[i:i + len(needle)] == needle
+    ]
+    if len(hits) != 1:
+        raise PatchError(
+            f"SEARCH block {'not found' if not hits else 'is ambiguous'}: {search.strip()[:60]!r}"
+        )
+
+    i = hits[0]
+    return '\n'.join(lines[:i] + replace.split('\n') + lines[i + len(needle):])
+
+
+def apply_search_replace(code: str, blocks: List[Tuple[str, str]]) -> str:
+    """
+    Apply SEARCH/REPLACE blocks in order
+
+    Raises:
+        PatchError: If a SEARCH block is empty, missing or ambiguous
+    """
+
+    for search, replace in blocks:
+        if not search.strip():
+            raise PatchError("Empty SEARCH block")
+
+        count = code.count(search)
+        if count == 1:
+            code = code.replace(search, replace, 1)
+        elif count == 0:
+            code = _replace_lines_fuzzy(code, search, replace)
+        else:
+            raise PatchError(f"SEARCH block is ambiguous: {search.strip()[:60]!r}")
+
+    return code
+
+
+def apply_patch_response(code: str, response_text: str, filename: str = '<patch>') -> str:
+    """
+    Parse, apply and verify an LLM patch response
+
+    Python files must still compile after the patch.
+
+    Raises:
+        PatchError: If the patch does not apply or breaks the syntax
+    """
+
+    patched = apply_search_replace(code, parse_search_replace(response_text))
+
+    if filename.endswith('.py'):
+        try:
+            compile(patched, filename, 'exec')
+        except SyntaxError as e:
+            raise PatchError(f"Patched file does not compile: {e}")
+
+    return patched
+
+
+def request_patch(client, rel_path: str, code: str, issues: List[Dict], requirements: List[str],
+                  max_tokens: int = 3000, feedback: Optional[str] = None) -> str:
+    """
+    Ask the LLM for a patch fixing the issues and apply it
+
+    Returns:
+        The patched code
+
+    Raises:
+        PatchError: If the response does not yield a clean patch
+    """
+
+    response_text = client.simple_prompt(
+        prompt=build_patch_prompt(rel_path, code, issues, requirements, feedback),
+        max_tokens=max_tokens,
+        temperature=0.3
+    )
+    return apply_patch_response(code, response_text, rel_path)
+
+
+def can_rewrite_whole(code: str) -> bool:
+    """Whether a whole-file regeneration fits in the response budget"""
+    return len(code) <= FULL_REWRITE_MAX_CHARS
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Step DAG executor
+
+A workflow is a set of steps with declared inputs and outputs (names in a
+shared context dict). A step starts as soon as all of its inputs exist, so
+independent steps run concurrently. Every step's wall time is recorded.
+
+Resuming: when a step fails, PipelineError carries the context built so
+far. Running the pipeline again with that context skips every step whose
+outputs are already present and continues from the failed step. With a
+Checkpoint (see checkpoint.py) outputs are also persisted, so a later
+process can resume: a step is restored instead of run when its inputs are
+unchanged and none of the steps it depends on had to run again.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterable, List, Optional
+
+from checkpoint import Checkpoint, hash_inputs
+
+
+class StopPipeline(Exception):
+    """Raised by a step to end the run early, e.g. when there is nothing to do"""
+
+    def __init__(self, **outputs):
+        super().__init__("pipeline stopped")
+        self.outputs = outputs
+
+
+class PipelineError(Exception):
+    """A step failed; context holds every output produced before the failure"""
+
+    def __init__(self, step: str, error: Exception, context: Dict):
+        super().__init__(f"Step '{step}' failed: {error}")
+        self.step = step
+        self.error = error
+        self.context = context
+
+
+class Step:
+    """
+    One unit of work
+
+    Args:
+        name: Unique step name
+        func: Called with the inputs as keyword arguments; returns a dict
+            holding exactly the declared outputs
+        inputs: Context keys the step reads
+        outputs: Context keys the step produces (at least one, so a resumed
+            run can tell whether the step already ran)
+        after: Steps that must finish first without passing data, e.g. to
+            keep an interactive prompt from interleaving with other output
+    """
+
+    def __init__(self, name: str, func: Callable[..., Dict], inputs: Iterable[str] = (),
+                 outputs: Iterable[str] = (), after: Iterable[str] = ()):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.after = tuple(after)
+
+        if not self.outputs:
+            raise ValueError(f"Step '{name}' must declare at least one output")
+
+    def run(self, context: Dict) -> Dict:
+        result = self.func(**{key: context[key] for key in self.inputs}) or {}
+        if set(result) != set(self.outputs):
+            raise ValueError(
+                f"Step '{self.name}' returned {sorted(result)}, declared {sorted(self.outputs)}"
+            )
+        return result
+
+
+class Pipeline:
+    """Runs steps with maximum safe concurrency"""
+
+    def __init__(self, steps: List[Step], max_workers: int = 4):
+        self.steps = list(steps)
+        self.max_workers = max_workers
+        self.timings = {}
+        self.restored = set()
+        self.stopped = False
+        self._validate()
+
+    def _validate(self):
+        names = [s.name for s in self.steps]
+        if len(set(names)) != len(names):
+            raise ValueError("Duplicate step names")
+
+        producers = {}
+        for step in self.steps:
+            for key in step.outputs:
+                if key in producers:
+                    raise ValueError(f"'{key}' is produced by both '{producers[key]}' and '{step.name}'")
+                producers[key] = step.name
+        self._producers = producers
+
+        # Cycle check: repeatedly remove steps whose dependencies are resolved
+        deps = {s.name: {producers[k] for k in s.inputs if k in producers} | set(s.after) for s in self.steps}
+        unknown = {d for ds in deps.values() for d in ds} - set(names)
+        if unknown:
+            raise ValueError(f"Unknown steps in 'after': {sorted(unknown)}")
+
+        resolved = set()
+        while len(resolved) < len(names):
+            ready = [n for n in names if n not in resolved and deps[n] <= resolved]
+            if not ready:
+                raise ValueError(f"Cycle between steps: {sorted(set(names) - resolved)}")
+            resolved.update(ready)
+
+    def run(self, context: Optional[Dict] = None, checkpoint: Optional[Checkpoint] = None) -> Dict:
+        """
+        Execute all steps not yet done
+
+        Args:
+            context: Initial inputs, or the context of a failed run to resume
+            checkpoint: Where completed steps are recorded and restored from
+
+        Returns:
+            The final context (inputs plus all outputs)
+
+        Raises:
+            PipelineError: If a step fails. Steps already running are allowed
+                to finish so their outputs are kept for a resume.
+        """
+
+        context = dict(context or {})
+        self.stopped = False
+        self.restored = set()
+
+        done = {s.name for s in self.steps if all(key in context for key in s.outputs)}
+        pending = [s for s in self.steps if s.name not in done]
+        executed = set()
+        failure = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {}
+
+            while pending or running:
+                ready = []
+                if failure is None and not self.stopped:
+                    ready = [s for s in pending if self._ready(s, context, done)]
+                restored_now = False
+
+                for step in ready:
+                    pending.remove(step)
+                    inputs_hash = hash_inputs({k: context[k] for k in step.inputs}) if checkpoint else None
+
+                    outputs = None
+                    if checkpoint and not self._depends_on(step, executed):
+                        outputs = checkpoint.lookup(step.name, inputs_hash)
+                    if outputs is not None and set(outputs) == set(step.outputs):
+                        context.update(outputs)
+                        done.add(step.name)
+                        self.restored.add(step.name)
+                        restored_now = True
+                        continue
+
+                    executed.add(step.name)
+                    running[pool.submit(self._timed, step, dict(context))] = (step, inputs_hash)
+
+                if restored_now:
+                    # Dependents of restored steps may be ready now
+                    continue
+
+                if not running:
+                    if pending and failure is None and not self.stopped:
+                        missing = sorted({k for s in pending for k in s.inputs if k not in context})
+                        raise PipelineError(pending[0].name, KeyError(f"missing inputs {missing}"), context)
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step, inputs_hash = running.pop(future)
+                    try:
+                        outputs = future.result()
+                        context.update(outputs)
+                        done.add(step.name)
+                        if checkpoint:
+                            checkpoint.record(step.name, inputs_hash, outputs, self.timings[step.name])
+                    except StopPipeline as stop:
+                        context.update(stop.outputs)
+                        self.stopped = True
+                    except Exception as e:
+                        if failure is None:
+                            failure = (step.name, e)
+
+        if failure:
+            raise PipelineError(failure[0], failure[1], context)
+        return context
+
+    @staticmethod
+    def _ready(step: Step, context: Dict, done: set) -> bool:
+        return all(key in context for key in step.inputs) and all(name in done for name in step.after)
+
+    def _depends_on(self, step: Step, executed: set) -> bool:
+        """Whether a direct dependency of the step ran (not restored) in this run"""
+        deps = {self._producers.get(key) for key in step.inputs} | set(step.after)
+        return bool(deps & executed)
+
+    def _timed(self, step: Step, context: Dict) -> Dict:
+        start = time.perf_counter()
+        try:
+            return step.run(context)
+        finally:
+            self.timings[step.name] = time.perf_counter() - start
+
+    def format_timings(self) -> str:
+        """Per-step wall time, in the order steps were declared"""
+
+        lines = []
+        for step in self.steps:
+            if step.name in self.timings:
+                lines.append(f"   {step.name:<24} {self.timings[step.name]:7.2f}s")
+            elif step.name in self.restored:
+                lines.append(f"   {step.name:<24}    (checkpoint)")
+        return "\n".join(lines)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Persistent sparse mirror of a skills repository
+
+Instead of a full clone per run, the repository is cloned once into the
+cache directory with blob filtering and sparse checkout, so only the
+skill directories actually used are downloaded. The mirror is refreshed
+with an incremental fetch at most every HAPPYCAPY_MIRROR_REFRESH_MINUTES
+(default 30), and skills are copied out of it with copy-on-write clones
+where the filesystem supports them (see clone_file).
+"""
+
+import os
+import time
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Optional
+
+from cache_utils import get_cache_dir, hash_text
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+
+DEFAULT_REPO_URL = "https://github.com/anthropics/skills.git"
+
+DEFAULT_REFRESH_MINUTES = 30
+
+# ioctl request for a copy-on-write clone of a whole file (Linux)
+FICLONE = 0x40049409
+
+FETCH_STAMP = 'happycapy-fetched'
+
+
+def refresh_interval() -> float:
+    """Seconds between fetches of an existing mirror"""
+
+    try:
+        minutes = float(os.environ.get('HAPPYCAPY_MIRROR_REFRESH_MINUTES', DEFAULT_REFRESH_MINUTES))
+    except ValueError:
+        minutes = DEFAULT_REFRESH_MINUTES
+    return max(0.0, minutes) * 60
+
+
+def _git(*args, cwd: Optional[Path] = None):
+    subprocess.run(
+        ["git", *args],
+        cwd=str(cwd) if cwd else None,
+        capture_output=True,
+        check=True
+    )
+
+
+def clone_file(src: Path, dst: Path):
+    """
+    Copy one file, as a reflink (copy-on-write) when the filesystem allows
+
+    Reflinks share blocks with the mirror without the aliasing of hard
+    links: files in the workspace are edited in place later, which must
+    never change the mirror.
+    """
+
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+
+    shutil.copy2(src, dst)
+
+
+class RepoMirror:
+    """Sparse, blob-filtered clone of one repository in the cache directory"""
+
+    def __init__(self, url: str = DEFAULT_REPO_URL, path: Optional[Path] = None):
+        self.url = url
+        self.path = Path(path) if path else get_cache_dir() / 'mirrors' / hash_text(url)[:12]
+        self._lock = threading.Lock()
+
+    def _stamp(self) -> Path:
+        return self.path / '.git' / FETCH_STAMP
+
+    def _is_fresh(self) -> bool:
+        try:
+            return time.time() - self._stamp().stat().st_mtime < refresh_interval()
+        except OSError:
+            return False
+
+    def _touch_stamp(self):
+        self._stamp().write_text(str(int(time.time())))
+
+    def _file_lock(self):
+        """Cross-process lock so two runs never fetch into the same mirror at once"""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path.parent / f'{self.path.name}.lock', 'w')
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def update(self, force: bool = False) -> bool:
+        """
+        Create the mirror, or fetch if the last fetch is older than the
+        refresh interval
+
+        Returns:
+            True if the network was used
+        """
+
+        with self._lock:
+            handle = self._file_lock()
+            try:
+                if not (self.path / '.git').exists():
+                    if self.path.exists():
+                        shutil.rmtree(self.path)
+                    _git("clone", "--depth", "1", "--filter=blob:none", "--sparse",
+                         self.url, str(self.path))
+                    self._touch_stamp()
+                    return True
+
+                if not force and self._is_fresh():
+                    return False
+
+                _git("fetch", "--depth", "1", "--filter=blob:none", "origin", cwd=self.path)
+                _git("reset", "--hard", "--quiet", "FETCH_HEAD", cwd=self.path)
+                self._touch_stamp()
+                return True
+            finally:
+                handle.close()
+
+    def checkout(self, repo_path: str) -> Optional[Path]:
+        """
+        Make one directory of the repository available in the mirror
+
+        Only that directory's blobs are downloaded, once.
+
+        Args:
+            repo_path: Directory inside the repository, e.g. 'skills/pdf'
+
+        Returns:
+            Path to the directory in the mirror, or None if the repository
+            does not contain it
+        """
+
+        self.update()
+
+        target = self.path / repo_path
+        if not target.is_dir():
+            with self._lock:
+                handle = self._file_lock()
+                try:
+                    _git("sparse-checkout", "add", repo_path, cwd=self.path)
+                finally:
+                    handle.close()
+
+        return target if target.is_dir() else None
+
+
+_mirrors = {}
+
+
+def get_mirror(url: str = DEFAULT_REPO_URL) -> RepoMirror:
+    """Shared mirror object per repository URL"""
+
+    mirror = _mirrors.get(url)
+    if mirror is None:
+        mirror = _mirrors[url] = RepoMirror(url)
+    return mirror
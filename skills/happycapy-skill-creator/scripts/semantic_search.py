@@ -2,8 +2,8 @@
 """
 Semantic Search for Anthropic Skills
 
-Uses LLM to understand user intent and find most relevant skills
-from github.com/anthropics/skills repository
+Finds the most relevant skills from github.com/anthropics/skills using a
+local vector index, with the LLM re-ranking the top candidates
 """
 
 import os
@@ -11,12 +11,26 @@ import json
 from typing import List, Dict
 
 
-def search_similar_skills(user_requirement: str) -> List[Dict]:
+# How many index hits to return, and how many of those the LLM re-ranks
+DEFAULT_TOP_K = 10
+RERANK_TOP_N = 5
+
+
+def search_similar_skills(
+    user_requirement: str,
+    top_k: int = DEFAULT_TOP_K,
+    rerank_top_n: int = RERANK_TOP_N
+) -> List[Dict]:
     """
     Search for similar skills using semantic understanding
 
+    Candidates come from the local vector index (see skill_index.py); the
+    LLM, when available, only re-ranks the top few of them.
+
     Args:
         user_requirement: User's description of what they need
+        top_k: Number of candidates to retrieve from the index
+        rerank_top_n: Number of top candidates sent to the LLM for re-ranking
 
     Returns:
         List of similar skills, sorted by relevance
@@ -35,61 +49,38 @@ def search_similar_skills(user_requirement: str) -> List[Dict]:
     # Get available skills (this would fetch from anthropics/skills repo)
     available_skills = get_available_skills()
 
-    # Use LLM to rank skills by relevance
-    ranked_skills = rank_skills_by_llm(user_requirement, available_skills)
+    # Retrieve candidates from the local index (offline, milliseconds)
+    from skill_index import retrieve_candidates
+    candidates = retrieve_candidates(user_requirement, available_skills, top_k=top_k)
+
+    if not candidates:
+        # Nothing in the index overlaps the query - try the keyword scorer,
+        # never the LLM with the whole catalog
+        ranked = rank_skills_by_keywords(user_requirement, available_skills)
+        return [s for s in ranked if s['similarity'] > 0][:top_k]
+
+    if not os.environ.get('AI_GATEWAY_API_KEY'):
+        return candidates
+
+    # Use LLM only to re-rank the top few candidates
+    head = rank_skills_by_llm(user_requirement, candidates[:rerank_top_n])
+    reranked = {s['name'] for s in head}
+    rest = [s for s in candidates if s['name'] not in reranked]
 
-    return ranked_skills
+    return head + rest
 
 
 def get_available_skills() -> List[Dict]:
     """
-    Get list of available skills from anthropics/skills
+    Get list of available skills
 
-    In real implementation, this would:
-    1. Clone/fetch the anthropics/skills repo
-    2. Parse all SKILL.md files
-    3. Extract metadata
-
-    For now, return mock data
+    Reads the skill catalog (see skill_catalog.py), which indexes the local
+    skills tree and only re-parses skills that changed since the last run.
     """
 
-    # Mock data - in real implementation, fetch from GitHub
-    mock_skills = [
-        {
-            'name': 'pdf',
-            'description': 'Comprehensive PDF manipulation toolkit for extracting text and tables, creating new PDFs, merging/splitting documents, and handling forms.',
-            'language': 'python',
-            'repo_path': 'skills/pdf',
-            'stars': 150,
-            'tags': ['pdf', 'document', 'processing']
-        },
-        {
-            'name': 'docx',
-            'description': 'Document creation, editing, and analysis with support for tracked changes, comments, formatting preservation, and text extraction.',
-            'language': 'python',
-            'repo_path': 'skills/docx',
-            'stars': 120,
-            'tags': ['word', 'document', 'office']
-        },
-        {
-            'name': 'image-enhancer',
-            'description': 'Improves the quality of images, especially screenshots, by enhancing resolution, sharpness, and clarity.',
-            'language': 'python',
-            'repo_path': 'skills/image-enhancer',
-            'stars': 80,
-            'tags': ['image', 'enhancement', 'quality']
-        },
-        {
-            'name': 'video-frames',
-            'description': 'Extract frames or short clips from videos using ffmpeg.',
-            'language': 'python',
-            'repo_path': 'skills/video-frames',
-            'stars': 60,
-            'tags': ['video', 'ffmpeg', 'frames']
-        }
-    ]
-
-    return mock_skills
+    from skill_catalog import get_catalog_skills
+
+    return get_catalog_skills()
 
 
 def rank_skills_by_llm(requirement: str, skills: List[Dict]) -> List[Dict]:
@@ -166,25 +157,25 @@ Return ONLY a JSON array of skill names in order of relevance, with similarity s
 
 def rank_skills_by_keywords(requirement: str, skills: List[Dict]) -> List[Dict]:
     """
-    Fallback: Simple keyword matching
+    Fallback: BM25 keyword ranking
+
+    Uses a cached inverted index (see keyword_index.py) with field boosts
+    for name and tags.
 
     Args:
         requirement: User requirement
         skills: List of available skills
 
     Returns:
-        Skills ranked by keyword overlap
+        Skills ranked by BM25 similarity
     """
 
-    req_words = set(requirement.lower().split())
+    from keyword_index import get_keyword_index
 
-    for skill in skills:
-        # Count keyword matches
-        desc_words = set(skill['description'].lower().split())
-        tag_words = set(skill.get('tags', []))
+    scores = get_keyword_index(skills).search(requirement)
 
-        overlap = len(req_words & (desc_words | tag_words))
-        skill['similarity'] = overlap / max(len(req_words), 1)
+    for skill in skills:
+        skill['similarity'] = round(scores.get(skill['name'], 0.0), 4)
 
     # Sort by similarity
     ranked = sorted(skills, key=lambda s: s['similarity'], reverse=True)
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Skill catalog
+
+Scans a skills tree (this repo's skills/ directory, a cloned mirror, or
+~/.claude/skills), parses every SKILL.md and keeps the result in a SQLite
+catalog. Re-syncs only re-parse skills whose directory/file stats or
+SKILL.md content hash changed.
+"""
+
+import os
+import re
+import json
+import sqlite3
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from cache_utils import get_cache_dir
+from frontmatter import parse_frontmatter_block
+from keyword_index import tokenize
+
+
+CATALOG_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS skills (
+    root TEXT NOT NULL,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    language TEXT NOT NULL,
+    body TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    PRIMARY KEY (root, dir)
+)
+"""
+
+LANGUAGE_EXTENSIONS = [
+    ('python', ('.py',)),
+    ('javascript', ('.js', '.mjs', '.ts', '.tsx')),
+    ('shell', ('.sh',)),
+]
+
+
+def default_skills_root() -> Path:
+    """
+    Skills tree to index
+
+    HAPPYCAPY_SKILLS_DIR if set, otherwise the directory this skill lives in
+    (the repo's skills/ folder, or ~/.claude/skills once installed).
+    """
+
+    override = os.environ.get('HAPPYCAPY_SKILLS_DIR')
+    if override:
+        return Path(override).expanduser().resolve()
+    return Path(__file__).resolve().parents[2]
+
+
+def parse_frontmatter(content: str) -> Tuple[Dict, str]:
+    """
+    Split SKILL.md content into (frontmatter dict, body)
+
+    Uses PyYAML when installed, with a minimal key/value fallback (see
+    frontmatter.parse_frontmatter_block).
+    """
+
+    match = re.match(r'^---\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|$)', content, re.DOTALL)
+    if not match:
+        return {}, content
+
+    return parse_frontmatter_block(match.group(1)), content[match.end():]
+
+
+def detect_language(skill_dir: Path) -> str:
+    """Primary implementation language, judged by the files the skill ships"""
+
+    suffixes = set()
+    for _, _, files in os.walk(skill_dir):
+        suffixes.update(os.path.splitext(f)[1] for f in files)
+
+    for language, extensions in LANGUAGE_EXTENSIONS:
+        if suffixes.intersection(extensions):
+            return language
+    return 'markdown'
+
+
+def skill_signature(skill_dir: Path) -> Optional[str]:
+    """
+    Cheap change detector: stats of the directory, SKILL.md and scripts/
+
+    Returns None if the directory has no SKILL.md.
+    """
+
+    try:
+        dir_stat = os.stat(skill_dir)
+        md_stat = os.stat(skill_dir / 'SKILL.md')
+    except OSError:
+        return None
+
+    try:
+        scripts_mtime = os.stat(skill_dir / 'scripts').st_mtime_ns
+    except OSError:
+        scripts_mtime = 0
+
+    return f"{dir_stat.st_mtime_ns}:{md_stat.st_mtime_ns}:{md_stat.st_size}:{scripts_mtime}"
+
+
+def read_skill(skill_dir: Path) -> Tuple[Dict, str]:
+    """
+    Parse one skill directory
+
+    Returns:
+        (skill dict, content hash of SKILL.md)
+    """
+
+    raw = (skill_dir / 'SKILL.md').read_bytes()
+    content = raw.decode('utf-8', errors='replace')
+    meta, body = parse_frontmatter(content)
+
+    tags = meta.get('tags')
+    if tags is None and isinstance(meta.get('metadata'), dict):
+        tags = meta['metadata'].get('tags')
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(',') if t.strip()]
+
+    skill = {
+        'name': str(meta.get('name') or skill_dir.name).strip(),
+        'description': str(meta.get('description') or '').strip(),
+        'tags': [str(t) for t in tags or []],
+        'language': detect_language(skill_dir),
+        'body': body,
+    }
+    return skill, hashlib.sha1(raw).hexdigest()
+
+
+class SkillCatalog:
+    """SQLite-backed catalog of one skills tree"""
+
+    def __init__(self, root: Optional[Path] = None, db_path: Optional[Path] = None):
+        self.root = Path(root).expanduser().resolve() if root else default_skills_root()
+        self.db_path = Path(db_path) if db_path else get_cache_dir() / 'catalog.sqlite'
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != CATALOG_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS skills")
+            self._conn.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+        self._conn.execute(SCHEMA)
+        self._skills = None
+
+        # One connection is shared by every thread using this catalog; a sync
+        # must not interleave with another sync's transaction or a read
+        self._lock = threading.RLock()
+
+    def close(self):
+        self._conn.close()
+
+    def sync(self, workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        Bring the catalog up to date with the skills tree
+
+        Changed skills are parsed in a thread pool, which matters on a cold
+        start with hundreds of skills; unchanged skills cost one stat each.
+        Concurrent syncs of the same catalog run one after the other.
+
+        Args:
+            workers: Parser threads (default: min(8, CPU count + 4))
+
+        Returns:
+            Counts: {'scanned', 'parsed', 'removed'}
+        """
+
+        with self._lock:
+            return self._sync(workers)
+
+    def _sync(self, workers: Optional[int]) -> Dict[str, int]:
+        root = str(self.root)
+        known = {
+            row[0]: (row[1], row[2])
+            for row in self._conn.execute(
+                "SELECT dir, signature, content_hash FROM skills WHERE root = ?", (root,)
+            )
+        }
+
+        stats = {'scanned': 0, 'parsed': 0, 'removed': 0}
+        seen = set()
+        changed = []
+
+        entries = sorted(os.scandir(self.root), key=lambda e: e.name) if self.root.is_dir() else []
+        for entry in entries:
+            if not entry.is_dir() or entry.name.startswith('.'):
+                continue
+
+            signature = skill_signature(Path(entry.path))
+            if signature is None:
+                continue
+
+            stats['scanned'] += 1
+            seen.add(entry.name)
+
+            previous = known.get(entry.name)
+            if not previous or previous[0] != signature:
+                changed.append((entry.name, signature))
+
+        parsed = self._read_skills([name for name, _ in changed], workers)
+
+        with self._conn:
+            for (dir_name, signature), result in zip(changed, parsed):
+                if result is None:
+                    continue
+
+                skill, content_hash = result
+                previous = known.get(dir_name)
+                if previous and previous[1] == content_hash:
+                    # Only stats moved (touch, new script) - refresh cheap fields
+                    self._conn.execute(
+                        "UPDATE skills SET signature = ?, language = ? WHERE root = ? AND dir = ?",
+                        (signature, skill['language'], root, dir_name)
+                    )
+                    continue
+
+                stats['parsed'] += 1
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO skills VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (root, dir_name, skill['name'], skill['description'],
+                     json.dumps(skill['tags']), skill['language'], skill['body'],
+                     signature, content_hash)
+                )
+
+            for dir_name in set(known) - seen:
+                stats['removed'] += 1
+                self._conn.execute(
+                    "DELETE FROM skills WHERE root = ? AND dir = ?", (root, dir_name)
+                )
+
+        if changed or stats['removed']:
+            self._skills = None
+        return stats
+
+    def _read_skills(self, dir_names: List[str], workers: Optional[int]) -> List[Optional[Tuple]]:
+        """Parse skill directories, in parallel when there is more than one"""
+
+        def read(dir_name):
+            try:
+                return read_skill(self.root / dir_name)
+            except OSError as e:
+                print(f"⚠️  Failed to read {dir_name}/SKILL.md: {e}")
+                return None
+
+        if len(dir_names) <= 1:
+            return [read(name) for name in dir_names]
+
+        workers = workers or min(8, (os.cpu_count() or 1) + 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(read, dir_names))
+
+    def skills(self) -> List[Dict]:
+        """
+        All skills in the catalog
+
+        Returns fresh dicts on every call so callers may annotate them:
+        [{'name', 'description', 'description_lower', 'description_tokens',
+          'tags', 'language', 'body', 'content_hash', 'repo_path', 'path'}, ...]
+
+        description_tokens is the frozenset of keyword_index.tokenize()
+        tokens of the description, computed once per change.
+        """
+
+        with self._lock:
+            return self._cached_skills()
+
+    def _cached_skills(self) -> List[Dict]:
+        if self._skills is None:
+            rows = self._conn.execute(
+                "SELECT dir, name, description, tags, language, body, content_hash FROM skills "
+                "WHERE root = ? ORDER BY dir", (str(self.root),)
+            ).fetchall()
+            self._skills = [
+                {
+                    'name': name,
+                    'description': description,
+                    'description_lower': description.lower(),
+                    'description_tokens': frozenset(tokenize(description)),
+                    'tags': json.loads(tags),
+                    'language': language,
+                    'body': body,
+                    'content_hash': content_hash,
+                    'repo_path': f'skills/{dir_name}',
+                    'path': str(self.root / dir_name),
+                }
+                for dir_name, name, description, tags, language, body, content_hash in rows
+            ]
+
+        return [dict(s, tags=list(s['tags'])) for s in self._skills]
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Look up a skill by name"""
+        return next((s for s in self.skills() if s['name'] == name), None)
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def load_catalog(root: Optional[Path] = None, refresh: bool = False) -> SkillCatalog:
+    """
+    Synced catalog for a skills tree, shared within the process
+
+    Args:
+        root: Skills tree (default: default_skills_root())
+        refresh: Re-sync even if this process already synced the catalog
+    """
+
+    key = str(Path(root).expanduser().resolve()) if root else str(default_skills_root())
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        created = catalog is None
+        if created:
+            catalog = _catalogs[key] = SkillCatalog(key)
+            # Held until synced, so no other thread reads the empty catalog
+            catalog._lock.acquire()
+
+    if created:
+        try:
+            catalog._sync(None)
+        finally:
+            catalog._lock.release()
+    elif refresh:
+        catalog.sync()
+    return catalog
+
+
+def refresh_loaded_catalogs() -> Dict[str, Dict[str, int]]:
+    """
+    Re-sync every catalog this process has loaded
+
+    load_catalog() syncs a tree once per process; long-lived processes
+    (see skill_daemon.py) call this before serving a request instead.
+
+    Returns:
+        {root: sync counts}
+    """
+
+    with _catalogs_lock:
+        catalogs = list(_catalogs.items())
+    return {root: catalog.sync() for root, catalog in catalogs}
+
+
+def get_catalog_skills(root: Optional[Path] = None, refresh: bool = False) -> List[Dict]:
+    """Convenience wrapper: all skills of a (synced) catalog"""
+    return load_catalog(root, refresh=refresh).skills()
+
+
+if __name__ == "__main__":
+    import sys
+
+    root = Path(sys.argv[1]) if len(sys.argv) > 1 else None
+
+    catalog = SkillCatalog(root)
+    stats = catalog.sync()
+    print(f"Catalog: {catalog.root}")
+    print(f"   {stats['scanned']} skills scanned, {stats['parsed']} parsed, {stats['removed']} removed")
+
+    for skill in catalog.skills():
+        print(f"   - {skill['name']} ({skill['language']})")
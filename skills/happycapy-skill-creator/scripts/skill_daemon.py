@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Resident skill-creator worker
+
+Every script invocation pays for interpreter start-up, imports, a catalog
+sync, loading the search index and a fresh TLS connection to the AI
+Gateway. The daemon pays for them once and then serves requests over a
+Unix socket, so an agent issuing many small requests gets answers in
+milliseconds.
+
+Protocol: one JSON object per line, {"op": ..., "args": {...}}, answered
+by {"ok": true, "result": ...} or {"ok": false, "error": ...}. A
+connection may carry any number of requests.
+
+Usage:
+    python skill_daemon.py serve                 # run in the foreground
+    python skill_daemon.py status | stop
+    python skill_daemon.py search "compress PDF files"
+    python skill_daemon.py find "compress PDF files"
+    python skill_daemon.py check <skill_dir>
+    python skill_daemon.py test <skill_dir>
+    python skill_daemon.py package <skill_dir> <name> [--output-dir DIR] [--force]
+    python skill_daemon.py validate <path> [--tree] [--no-cache]
+
+The socket is HAPPYCAPY_DAEMON_SOCKET, or daemon.sock in the cache
+directory. The client commands only import socket and json; all the
+heavy modules live in the daemon. `validate` runs skill-creator's
+quick_validate.py (the skill-creator skill installed next to this one).
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import threading
+import socketserver
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from cache_utils import get_cache_dir
+
+
+CONNECT_TIMEOUT = 2.0
+
+# skill-creator's scripts, for quick_validate.py
+SKILL_CREATOR_SCRIPTS = Path(__file__).resolve().parents[2] / 'skill-creator' / 'scripts'
+
+# test/package can run the skill's own test suite
+DEFAULT_CALL_TIMEOUT = 900.0
+
+
+class DaemonUnavailable(RuntimeError):
+    """No daemon is listening on the socket"""
+
+
+class DaemonError(RuntimeError):
+    """The daemon ran the request and it failed"""
+
+
+def default_socket_path() -> Path:
+    """HAPPYCAPY_DAEMON_SOCKET, or daemon.sock in the cache directory"""
+
+    override = os.environ.get('HAPPYCAPY_DAEMON_SOCKET')
+    if override:
+        return Path(override).expanduser()
+    return get_cache_dir() / 'daemon.sock'
+
+
+# --- operations (run inside the daemon) -------------------------------------
+
+def _op_search(requirement: str, top_k: Optional[int] = None) -> Any:
+    from semantic_search import DEFAULT_TOP_K, search_similar_skills
+    from skill_catalog import refresh_loaded_catalogs
+
+    refresh_loaded_catalogs()
+    return search_similar_skills(requirement, top_k=top_k or DEFAULT_TOP_K)
+
+
+def _op_find(requirement: str) -> Any:
+    from find_skills_integration import find_existing_skill
+    from skill_catalog import refresh_loaded_catalogs
+
+    refresh_loaded_catalogs()
+    return find_existing_skill(requirement)
+
+
+def _op_check(skill_path: str, cache_dir: Optional[str] = None) -> Any:
+    from check_compatibility import check_environment_compatibility
+
+    return check_environment_compatibility(Path(skill_path), cache_dir=Path(cache_dir) if cache_dir else None)
+
+
+def _op_test(skill_path: str, cache_dir: Optional[str] = None, run_tests: bool = True) -> Any:
+    from test_skill import test_skill_basic
+
+    return test_skill_basic(Path(skill_path), cache_dir=Path(cache_dir) if cache_dir else None,
+                            run_tests=run_tests)
+
+
+def _op_package(skill_path: str, skill_name: str, output_dir: Optional[str] = None,
+                force: bool = False) -> Any:
+    from package_skill import package_skill
+
+    return package_skill(Path(skill_path), skill_name,
+                         output_dir=Path(output_dir) if output_dir else None, force=force)
+
+
+_quick_validate = None
+
+
+def load_quick_validate():
+    """
+    skill-creator's quick_validate module, imported once
+
+    skill-creator ships its own frontmatter.py, which quick_validate
+    imports by name; ours is swapped out of sys.modules while it loads.
+    """
+
+    global _quick_validate
+    if _quick_validate is None:
+        import importlib.util
+        import skill_catalog  # noqa: F401 - binds our frontmatter before the swap
+
+        path = SKILL_CREATOR_SCRIPTS / 'quick_validate.py'
+        if not path.is_file():
+            raise FileNotFoundError(f"skill-creator is not installed next to this skill: {path}")
+
+        ours = sys.modules.pop('frontmatter', None)
+        sys.path.insert(0, str(SKILL_CREATOR_SCRIPTS))
+        try:
+            spec = importlib.util.spec_from_file_location('quick_validate', path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        finally:
+            sys.path.remove(str(SKILL_CREATOR_SCRIPTS))
+            sys.modules.pop('frontmatter', None)
+            if ours is not None:
+                sys.modules['frontmatter'] = ours
+        _quick_validate = module
+    return _quick_validate
+
+
+def _op_validate(path: str, tree: bool = False, use_cache: bool = True) -> Any:
+    quick_validate = load_quick_validate()
+
+    if tree:
+        # In-process: forking a worker pool from a threaded server is unsafe
+        return quick_validate.validate_tree(Path(path), workers=1, use_cache=use_cache)
+    return {Path(path).name: quick_validate.collect_errors(Path(path))}
+
+
+OPERATIONS: Dict[str, Callable] = {
+    'search': _op_search,
+    'find': _op_find,
+    'check': _op_check,
+    'test': _op_test,
+    'package': _op_package,
+    'validate': _op_validate,
+}
+
+
+def warm_up():
+    """Import the pipeline modules, sync the catalog, load the index and open the HTTP pool"""
+
+    import check_compatibility, package_skill, test_skill  # noqa: F401
+    from semantic_search import get_available_skills
+    from skill_index import get_index
+
+    get_index().update(get_available_skills())
+
+    if (SKILL_CREATOR_SCRIPTS / 'quick_validate.py').is_file():
+        load_quick_validate()
+
+    if os.environ.get('AI_GATEWAY_API_KEY'):
+        from ai_gateway import get_session
+        get_session()
+
+
+# --- server -----------------------------------------------------------------
+
+def _json_default(value: Any) -> Any:
+    """Sets (catalog token sets) as sorted lists, anything else as text"""
+
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            op = None
+            try:
+                request = json.loads(line)
+                op = request.get('op')
+                response = self.server.dispatch(op, request.get('args') or {})
+            except (ValueError, AttributeError, TypeError) as e:
+                response = {'ok': False, 'error': f"Bad request: {e}"}
+
+            self.wfile.write(json.dumps(response, default=_json_default).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+            if op == 'shutdown':
+                return
+
+
+class SkillDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix-socket server that runs OPERATIONS in-process
+
+    Every connection gets a thread. Requests in the same lock group run one
+    at a time, because the caches behind them (catalog and search index,
+    compatibility results, test results) are single-writer; other groups
+    run concurrently. search and find share the catalog group: both
+    re-sync the loaded catalogs before running.
+    """
+
+    daemon_threads = True
+
+    # Pending connections; a Unix socket refuses connects beyond this
+    # instead of queueing them
+    request_queue_size = 128
+
+    # op -> lock group (ops not listed get a group of their own)
+    LOCK_GROUPS = {'search': 'catalog', 'find': 'catalog'}
+
+    def __init__(self, socket_path: Optional[Path] = None,
+                 operations: Optional[Dict[str, Callable]] = None):
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.operations = dict(OPERATIONS if operations is None else operations)
+        self.started = time.time()
+        self.served = 0
+        groups = {self.LOCK_GROUPS.get(op, op) for op in self.operations}
+        group_locks = {group: threading.Lock() for group in groups}
+        self._locks = {op: group_locks[self.LOCK_GROUPS.get(op, op)] for op in self.operations}
+        self._served_lock = threading.Lock()
+
+        if self.socket_path.exists():
+            if is_running(self.socket_path):
+                raise DaemonError(f"A daemon is already listening on {self.socket_path}")
+            # Left behind by a daemon that did not shut down cleanly
+            self.socket_path.unlink()
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(self.socket_path), _RequestHandler)
+
+    def server_bind(self):
+        # Only the owner may talk to the daemon
+        old_umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def dispatch(self, op: str, args: Dict) -> Dict:
+        """Run one request and wrap its outcome"""
+
+        if op == 'ping':
+            return {'ok': True, 'result': {
+                'pid': os.getpid(),
+                'uptime': round(time.time() - self.started, 3),
+                'served': self.served,
+                'operations': sorted(self.operations),
+            }}
+        if op == 'shutdown':
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {'ok': True, 'result': None}
+
+        operation = self.operations.get(op)
+        if operation is None:
+            return {'ok': False, 'error': f"Unknown operation: {op}"}
+
+        try:
+            with self._locks[op]:
+                result = operation(**args)
+        except Exception as e:
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        finally:
+            with self._served_lock:
+                self.served += 1
+
+        return {'ok': True, 'result': result}
+
+
+def serve(socket_path: Optional[Path] = None, warm: bool = True):
+    """Run the daemon in the foreground until `stop` or Ctrl-C"""
+
+    if warm:
+        start = time.perf_counter()
+        warm_up()
+        print(f"🔥 Warmed up in {time.perf_counter() - start:.2f}s")
+
+    with SkillDaemon(socket_path) as server:
+        print(f"🟢 Listening on {server.socket_path} (pid {os.getpid()})", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    print("⏹️  Daemon stopped")
+
+
+# --- client -----------------------------------------------------------------
+
+def call(op: str, socket_path: Optional[Path] = None,
+         timeout: Optional[float] = DEFAULT_CALL_TIMEOUT, **args) -> Any:
+    """
+    Run one operation in the daemon
+
+    Raises:
+        DaemonUnavailable: no daemon is listening (callers fall back to
+            doing the work in-process)
+        DaemonError: the operation failed inside the daemon
+    """
+
+    path = str(socket_path or default_socket_path())
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        deadline = time.monotonic() + CONNECT_TIMEOUT
+        while True:
+            try:
+                sock.connect(path)
+                break
+            except BlockingIOError:
+                # Backlog full: the daemon is busy accepting, not gone
+                if time.monotonic() > deadline:
+                    raise DaemonUnavailable(f"Skill daemon on {path} is not accepting connections") from None
+                time.sleep(0.01)
+            except (FileNotFoundError, ConnectionRefusedError, socket.timeout) as e:
+                raise DaemonUnavailable(f"No skill daemon on {path}: {e}") from None
+
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps({'op': op, 'args': args}).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    finally:
+        sock.close()
+
+    if not line:
+        raise DaemonError(f"Daemon closed the connection during '{op}'")
+
+    response = json.loads(line)
+    if not response.get('ok'):
+        raise DaemonError(response.get('error') or f"'{op}' failed")
+    return response.get('result')
+
+
+def is_running(socket_path: Optional[Path] = None) -> bool:
+    """Whether a daemon answers on the socket"""
+
+    try:
+        call('ping', socket_path=socket_path, timeout=CONNECT_TIMEOUT)
+        return True
+    except (DaemonUnavailable, DaemonError, OSError, ValueError):
+        return False
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Resident skill-creator worker and its client")
+    parser.add_argument('--socket', type=Path, help="Socket path (default: HAPPYCAPY_DAEMON_SOCKET or the cache directory)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help="Run the daemon in the foreground")
+    serve_parser.add_argument('--no-warm', action='store_true', help="Skip loading the catalog and index up front")
+    commands.add_parser('status', help="Show whether the daemon is running")
+    commands.add_parser('stop', help="Stop the daemon")
+
+    for name in ('search', 'find'):
+        sub = commands.add_parser(name, help=f"{name} skills for a requirement")
+        sub.add_argument('requirement')
+    for name in ('check', 'test'):
+        sub = commands.add_parser(name, help=f"{name} a skill directory")
+        sub.add_argument('skill_path', type=Path)
+    package_parser = commands.add_parser('package', help="Package a skill directory")
+    package_parser.add_argument('skill_path', type=Path)
+    package_parser.add_argument('skill_name')
+    package_parser.add_argument('--output-dir', type=Path)
+    package_parser.add_argument('--force', action='store_true')
+    validate_parser = commands.add_parser('validate', help="Validate a skill, or every skill under a directory")
+    validate_parser.add_argument('path', type=Path)
+    validate_parser.add_argument('--tree', action='store_true', help="Validate every skill under path")
+    validate_parser.add_argument('--no-cache', action='store_true', help="Validate every skill again")
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        try:
+            serve(args.socket, warm=not args.no_warm)
+        except DaemonError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        return
+
+    op_args = {}
+    if args.command in ('search', 'find'):
+        op_args = {'requirement': args.requirement}
+    elif args.command in ('check', 'test', 'package'):
+        # Relative to the caller, not to the daemon's working directory
+        op_args = {'skill_path': str(args.skill_path.resolve())}
+        if args.command == 'package':
+            # package_skill's default ./outputs, of the caller
+            op_args.update(skill_name=args.skill_name, force=args.force,
+                           output_dir=str((args.output_dir or Path('outputs')).resolve()))
+    elif args.command == 'validate':
+        op_args = {'path': str(args.path.resolve()), 'tree': args.tree, 'use_cache': not args.no_cache}
+
+    op = {'status': 'ping', 'stop': 'shutdown'}.get(args.command, args.command)
+    try:
+        result = call(op, socket_path=args.socket, **op_args)
+    except DaemonUnavailable as e:
+        print(f"⚪ {e}" if args.command == 'status' else f"❌ {e}\n   Start it with: python {Path(__file__).name} serve")
+        sys.exit(1)
+    except DaemonError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.command == 'status':
+        print(f"🟢 Running (pid {result['pid']}, up {result['uptime']:.0f}s, {result['served']} request(s) served)")
+    elif args.command == 'stop':
+        print("⏹️  Daemon stopping")
+    else:
+        print(json.dumps(result, indent=2, default=str))
+        if args.command == 'validate' and any(result.values()):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
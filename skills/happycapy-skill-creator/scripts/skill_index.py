@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Local vector index over skill metadata
+
+Embeds name, description, tags and SKILL.md body of every skill and answers
+top-k cosine queries offline. The index is persisted to disk and only
+re-embeds skills whose content changed.
+
+Backends:
+- TF-IDF (default, no model needed)
+- sentence-transformers model, if installed and HAPPYCAPY_EMBEDDING_MODEL is set
+"""
+
+import os
+import math
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from cache_utils import get_cache_dir, hash_text, load_json, save_json
+from keyword_index import tokenize
+
+
+INDEX_VERSION = 2
+
+
+# Metadata is repeated so it is not drowned out by long SKILL.md bodies
+DOCUMENT_FIELD_REPEATS = {'name': 3, 'description': 2, 'tags': 2}
+DOCUMENT_BODY_CHARS = 2000
+
+
+def skill_document(skill: Dict) -> str:
+    """Build the text that gets embedded for a skill"""
+
+    fields = {
+        'name': skill['name'].replace('-', ' '),
+        'description': skill.get('description', ''),
+        'tags': ' '.join(skill.get('tags', [])),
+    }
+    parts = [text for field, text in fields.items() if text
+             for _ in range(DOCUMENT_FIELD_REPEATS[field])]
+    parts.append(skill.get('body', '')[:DOCUMENT_BODY_CHARS])
+    return '\n'.join(p for p in parts if p)
+
+
+class TfidfBackend:
+    """Sparse TF-IDF vectors - the no-model baseline"""
+
+    name = 'tfidf'
+
+    def features(self, texts: List[str]) -> List[Dict[str, int]]:
+        return [dict(Counter(tokenize(text))) for text in texts]
+
+    def build(self, docs: Dict[str, Dict[str, int]]) -> Dict:
+        """Turn stored term counts into normalized vectors and postings"""
+
+        n_docs = len(docs)
+        df = Counter()
+        for tf in docs.values():
+            df.update(tf.keys())
+
+        idf = {term: math.log((1 + n_docs) / (1 + freq)) + 1 for term, freq in df.items()}
+
+        postings = {}
+        for name, tf in docs.items():
+            weights = {t: (1 + math.log(c)) * idf[t] for t, c in tf.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for term, w in weights.items():
+                postings.setdefault(term, []).append((name, w / norm))
+
+        return {'idf': idf, 'postings': postings}
+
+    def score(self, state: Dict, query: str) -> Dict[str, float]:
+        idf = state['idf']
+        tf = Counter(t for t in tokenize(query) if t in idf)
+        if not tf:
+            return {}
+
+        weights = {t: (1 + math.log(c)) * idf[t] for t, c in tf.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+
+        scores = {}
+        for term, qw in weights.items():
+            for name, dw in state['postings'][term]:
+                scores[name] = scores.get(name, 0.0) + qw / norm * dw
+        return scores
+
+
+class SentenceTransformerBackend:
+    """Dense embeddings from a small local sentence-transformers model"""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.name = f'st:{model_name}'
+        self.model = SentenceTransformer(model_name)
+
+    def features(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(texts, normalize_embeddings=True, batch_size=32)
+        return [[round(float(x), 6) for x in v] for v in vectors]
+
+    def build(self, docs: Dict[str, List[float]]) -> Dict:
+        return {'vectors': docs}
+
+    def score(self, state: Dict, query: str) -> Dict[str, float]:
+        q = self.features([query])[0]
+        return {
+            name: sum(a * b for a, b in zip(q, vec))
+            for name, vec in state['vectors'].items()
+        }
+
+
+def default_backend():
+    """Use a local model if configured and installed, TF-IDF otherwise"""
+
+    model_name = os.environ.get('HAPPYCAPY_EMBEDDING_MODEL')
+    if model_name:
+        try:
+            return SentenceTransformerBackend(model_name)
+        except ImportError:
+            print("⚠️  sentence-transformers not installed, using TF-IDF index")
+    return TfidfBackend()
+
+
+class SkillIndex:
+    """Persistent, incrementally updated skill search index"""
+
+    def __init__(self, path: Optional[Path] = None, backend=None):
+        self.backend = backend or default_backend()
+        self.path = Path(path) if path else get_cache_dir() / 'skill_index.json'
+        self.docs = {}      # name -> {'hash': ..., 'features': ...}
+        self._state = None
+        self._load()
+
+    def _load(self):
+        data = load_json(self.path, {})
+        if data.get('version') == INDEX_VERSION and data.get('backend') == self.backend.name:
+            self.docs = data.get('docs', {})
+
+    def save(self):
+        save_json(self.path, {
+            'version': INDEX_VERSION,
+            'backend': self.backend.name,
+            'docs': self.docs
+        })
+
+    def update(self, skills: List[Dict]) -> int:
+        """
+        Sync the index with a list of skills
+
+        Only skills whose document text changed are re-embedded; skills that
+        are no longer present are dropped.
+
+        Returns:
+            Number of skills added, changed or removed
+        """
+
+        wanted = {}
+        for skill in skills:
+            text = skill_document(skill)
+            wanted[skill['name']] = (hash_text(text), text)
+
+        stale = [name for name, (digest, _) in wanted.items()
+                 if self.docs.get(name, {}).get('hash') != digest]
+        removed = [name for name in self.docs if name not in wanted]
+
+        if stale:
+            vectors = self.backend.features([wanted[name][1] for name in stale])
+            for name, features in zip(stale, vectors):
+                self.docs[name] = {'hash': wanted[name][0], 'features': features}
+
+        for name in removed:
+            del self.docs[name]
+
+        changed = len(stale) + len(removed)
+        if changed:
+            self._state = None
+            self.save()
+        return changed
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Top-k cosine search
+
+        Returns:
+            [(skill_name, score), ...] sorted by descending score, zero scores omitted
+        """
+
+        if self._state is None:
+            self._state = self.backend.build(
+                {name: doc['features'] for name, doc in self.docs.items()}
+            )
+
+        scores = self.backend.score(self._state, query)
+        ranked = sorted(
+            ((name, min(max(score, 0.0), 1.0)) for name, score in scores.items() if score > 0),
+            key=lambda item: (-item[1], item[0])
+        )
+        return ranked[:top_k]
+
+
+_index = None
+
+
+def get_index() -> SkillIndex:
+    """Process-wide index, loaded once"""
+
+    global _index
+    if _index is None:
+        _index = SkillIndex()
+    return _index
+
+
+def retrieve_candidates(query: str, skills: List[Dict], top_k: int = 5) -> List[Dict]:
+    """
+    Return the top-k skills for a query from the local index
+
+    Returns copies of the skill dicts with 'similarity' set to the cosine score.
+    """
+
+    index = get_index()
+    index.update(skills)
+
+    by_name = {s['name']: s for s in skills}
+    return [
+        dict(by_name[name], similarity=round(score, 4))
+        for name, score in index.search(query, top_k=top_k)
+        if name in by_name
+    ]
+
+
+if __name__ == "__main__":
+    import sys
+    from semantic_search import get_available_skills
+
+    query = sys.argv[1] if len(sys.argv) > 1 else "I need to compress PDF files"
+
+    for skill in retrieve_candidates(query, get_available_skills()):
+        print(f"{skill['similarity']:.3f}  {skill['name']}")
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Where skills are cloned from
+
+Sources are tried in priority order until one has the skill:
+- dir:     a skills directory, e.g. this repo's skills/
+- archive: a .skill zip file, or a directory of <name>.skill files
+- git:     a git repository (URL or local mirror path), via repo_mirror
+
+HAPPYCAPY_SKILL_SOURCES sets the list: entries separated by commas or
+newlines (never ':', which appears in kind prefixes and URLs), each
+optionally prefixed with its kind, e.g.
+"dir:/opt/skills,https://github.com/anthropics/skills.git". Without it,
+the local skills tree is tried first and anthropics/skills second.
+
+Copies into the workspace are incremental: files whose size and mtime
+(for archives, size and CRC-32, since package_skill stamps every entry
+with the same date) already match are left alone, so re-cloning into an
+existing workspace copy only touches what changed.
+"""
+
+import os
+import re
+import shutil
+import time
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from repo_mirror import DEFAULT_REPO_URL, clone_file, get_mirror
+
+
+SOURCE_KINDS = ('dir', 'archive', 'git')
+
+# Separates HAPPYCAPY_SKILL_SOURCES entries
+SOURCES_SEPARATOR = re.compile(r'[,\n]')
+
+
+def _skill_dir_names(skill_info: Dict) -> List[str]:
+    """Directory names a skill may live under, most specific first"""
+
+    names = []
+    repo_path = skill_info.get('repo_path')
+    if repo_path:
+        names.append(Path(repo_path).name)
+    names.append(skill_info['name'])
+    return list(dict.fromkeys(names))
+
+
+def sync_tree(src: Path, dst: Path) -> Dict[str, int]:
+    """
+    Make dst an exact copy of src, copying only files that differ
+
+    Returns:
+        {'copied', 'skipped', 'removed'}
+    """
+
+    stats = {'copied': 0, 'skipped': 0, 'removed': 0}
+    dst.mkdir(parents=True, exist_ok=True)
+    wanted = set()
+
+    for dirpath, dirnames, filenames in os.walk(src):
+        rel_dir = Path(dirpath).relative_to(src)
+        (dst / rel_dir).mkdir(parents=True, exist_ok=True)
+
+        for filename in filenames:
+            rel = rel_dir / filename
+            wanted.add(rel)
+            source, target = Path(dirpath) / filename, dst / rel
+
+            src_stat = source.stat()
+            try:
+                dst_stat = target.stat()
+                if dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime_ns == src_stat.st_mtime_ns:
+                    stats['skipped'] += 1
+                    continue
+                target.unlink()
+            except FileNotFoundError:
+                pass
+
+            clone_file(source, target)
+            stats['copied'] += 1
+
+    stats['removed'] = _remove_extra(dst, wanted)
+    return stats
+
+
+def _remove_extra(dst: Path, wanted: set) -> int:
+    """Delete files under dst that are not in wanted (relative paths)"""
+
+    removed = 0
+    for dirpath, dirnames, filenames in os.walk(dst, topdown=False):
+        rel_dir = Path(dirpath).relative_to(dst)
+        for filename in filenames:
+            if rel_dir / filename not in wanted:
+                os.unlink(os.path.join(dirpath, filename))
+                removed += 1
+        if rel_dir != Path('.') and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return removed
+
+
+class DirectorySource:
+    """Skills directory on disk (one sub-directory per skill)"""
+
+    kind = 'dir'
+
+    def __init__(self, root: Path):
+        self.root = Path(root).expanduser()
+
+    def __repr__(self):
+        return f"dir:{self.root}"
+
+    def locate(self, skill_info: Dict) -> Optional[Path]:
+        for name in _skill_dir_names(skill_info):
+            candidate = self.root / name
+            if (candidate / 'SKILL.md').is_file():
+                return candidate
+        return None
+
+    def fetch(self, skill_info: Dict, skill_path: Path) -> Optional[Dict[str, int]]:
+        source = self.locate(skill_info)
+        return sync_tree(source, skill_path) if source else None
+
+
+def _file_crc(path: Path) -> int:
+    """CRC-32 of a file, as stored for zip members"""
+    crc = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+class ArchiveSource:
+    """A .skill zip (as written by package_skill) or a directory of them"""
+
+    kind = 'archive'
+
+    def __init__(self, path: Path):
+        self.path = Path(path).expanduser()
+
+    def __repr__(self):
+        return f"archive:{self.path}"
+
+    def _archives(self, skill_info: Dict) -> List[Path]:
+        if self.path.is_file():
+            return [self.path]
+        return [self.path / f"{name}.skill" for name in _skill_dir_names(skill_info)
+                if (self.path / f"{name}.skill").is_file()]
+
+    def fetch(self, skill_info: Dict, skill_path: Path) -> Optional[Dict[str, int]]:
+        for archive in self._archives(skill_info):
+            with zipfile.ZipFile(archive) as zf:
+                members = zf.infolist()
+                for name in _skill_dir_names(skill_info):
+                    prefix = f"{name}/"
+                    if any(m.filename == f"{prefix}SKILL.md" for m in members):
+                        return self._extract(zf, [m for m in members if m.filename.startswith(prefix)],
+                                             prefix, skill_path)
+        return None
+
+    @staticmethod
+    def _extract(zf: zipfile.ZipFile, members, prefix: str, skill_path: Path) -> Dict[str, int]:
+        stats = {'copied': 0, 'skipped': 0, 'removed': 0}
+        skill_path.mkdir(parents=True, exist_ok=True)
+        wanted = set()
+
+        for member in members:
+            rel = Path(member.filename[len(prefix):])
+            if member.is_dir() or not rel.parts or '..' in rel.parts or rel.is_absolute():
+                continue
+            wanted.add(rel)
+            target = skill_path / rel
+            mtime = time.mktime(member.date_time + (0, 0, -1))
+
+            try:
+                # Entry dates carry no information (package_skill pins them),
+                # so equal sizes are confirmed by content
+                if target.stat().st_size == member.file_size and _file_crc(target) == member.CRC:
+                    stats['skipped'] += 1
+                    continue
+            except FileNotFoundError:
+                pass
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with zf.open(member) as fsrc, open(target, 'wb') as fdst:
+                shutil.copyfileobj(fsrc, fdst)
+            mode = (member.external_attr >> 16) & 0o777
+            if mode:
+                os.chmod(target, mode)
+            os.utime(target, (mtime, mtime))
+            stats['copied'] += 1
+
+        stats['removed'] = _remove_extra(skill_path, wanted)
+        return stats
+
+
+class GitSource:
+    """Git repository with skills under skills/<name>, via a sparse mirror"""
+
+    kind = 'git'
+
+    def __init__(self, location: str):
+        self.location = location
+        local = Path(location).expanduser()
+        if local.exists():
+            # A local mirror gets its own cache entry keyed by its path
+            self.mirror = get_mirror(str(local.resolve()))
+        else:
+            self.mirror = get_mirror(location)
+
+    def __repr__(self):
+        return f"git:{self.location}"
+
+    def fetch(self, skill_info: Dict, skill_path: Path) -> Optional[Dict[str, int]]:
+        candidates = [skill_info.get('repo_path')] + [f"skills/{n}" for n in _skill_dir_names(skill_info)]
+        for repo_path in dict.fromkeys(filter(None, candidates)):
+            source = self.mirror.checkout(repo_path)
+            if source:
+                return sync_tree(source, skill_path)
+        return None
+
+
+def _detect_kind(location: str) -> str:
+    if location.endswith(('.skill', '.zip')):
+        return 'archive'
+    if ('://' in location or location.endswith('.git') or location.startswith('git@')
+            or (Path(location).expanduser() / '.git').exists()):
+        return 'git'
+    return 'dir'
+
+
+def parse_source(entry: str):
+    """
+    Build a source from a config entry
+
+    "kind:location" picks the kind explicitly; otherwise .skill/.zip files
+    are archives, URLs and *.git paths are git repositories and anything
+    else is a skills directory.
+    """
+
+    kind, sep, location = entry.partition(':')
+    if not sep or kind not in SOURCE_KINDS or location.startswith('//'):
+        kind, location = _detect_kind(entry), entry
+
+    if kind == 'archive':
+        return ArchiveSource(Path(location))
+    if kind == 'git':
+        return GitSource(location)
+    return DirectorySource(Path(location))
+
+
+def configured_sources() -> list:
+    """Sources in priority order, from HAPPYCAPY_SKILL_SOURCES or the defaults"""
+
+    setting = os.environ.get('HAPPYCAPY_SKILL_SOURCES')
+    if setting:
+        return [parse_source(entry.strip()) for entry in SOURCES_SEPARATOR.split(setting) if entry.strip()]
+
+    from skill_catalog import default_skills_root
+    return [DirectorySource(default_skills_root()), GitSource(DEFAULT_REPO_URL)]
@@ -1,50 +1,357 @@
 #!/usr/bin/env python3
 """
 Basic skill testing
+
+Three stages, all reporting every failure instead of stopping at the first:
+
+1. Compile every script (in parallel)
+2. Import every script that compiled, each in its own subprocess with a
+   time limit and the HappyCapy memory limit (RLIMIT_AS), so import-time
+   crashes, missing modules and runaway top-level code are caught before
+   packaging
+3. Run the skill's bundled tests/ with pytest, in parallel (pytest-xdist
+   when installed, otherwise one pytest process per test file)
+
+Imports and tests share one worker pool. With a cache_dir, results are
+cached by content hash: a script's compile result by its own hash, import
+and test results by the hash of the file plus every script it could
+import.
 """
 
+import hashlib
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Optional
+
+from cache_utils import load_json, save_json
+
+
+RESULT_CACHE_VERSION = 1
+
+# HappyCapy environment limits
+MEMORY_LIMIT_BYTES = 4 * 1024 ** 3
+IMPORT_TIMEOUT = 20
+TEST_TIMEOUT = 300
+
+# Runs in the sandbox subprocess: limit memory, then import the script
+# under a module name other than __main__ so CLI entry points do not run
+IMPORT_RUNNER = r'''
+import importlib.util, json, sys
+try:
+    import resource
+    limit = int(sys.argv[2])
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+except (ImportError, ValueError, OSError):
+    pass
+path = sys.argv[1]
+sys.argv = [path]
+try:
+    spec = importlib.util.spec_from_file_location("skill_module_under_test", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+except BaseException as e:
+    print(json.dumps({"error": type(e).__name__, "message": str(e),
+                      "module": getattr(e, "name", None)}))
+    sys.exit(1)
+'''
 
 
-def test_skill_basic(skill_path: Path) -> dict:
+def test_skill_basic(
+    skill_path: Path,
+    cache_dir: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+    run_tests: bool = True
+) -> dict:
     """
     Run basic tests on skill
 
     Args:
         skill_path: Path to skill
+        cache_dir: Optional workspace directory for the per-file result cache
+        max_workers: Parallel compiles/imports/test processes (default: CPU count)
+        run_tests: Run the skill's tests/ directory with pytest
 
     Returns:
-        {'success': True/False, 'error': None or error message}
+        {'success': True/False, 'error': None or first error message,
+         'errors': [all error messages], 'warnings': [...],
+         'stats': {'compiled', 'imported', 'tests', 'cached'}}
     """
 
+    skill_path = Path(skill_path)
+    report = {
+        'success': False,
+        'error': None,
+        'errors': [],
+        'warnings': [],
+        'stats': {'compiled': 0, 'imported': 0, 'tests': 0, 'cached': 0},
+    }
+
     try:
         # Check structure
         required = ['SKILL.md', 'scripts']
 
         for item in required:
             if not (skill_path / item).exists():
-                return {
-                    'success': False,
-                    'error': f'Missing required: {item}'
-                }
+                report['error'] = f'Missing required: {item}'
+                report['errors'].append(report['error'])
+                return report
+
+        workers = max_workers or os.cpu_count() or 4
+        scripts = sorted((skill_path / 'scripts').glob('*.py'))
+        sources = {script: script.read_bytes() for script in scripts}
+        hashes = {script: hashlib.sha1(raw).hexdigest() for script, raw in sources.items()}
+        requirements = read_requirement_names(skill_path)
+
+        # Import and test results depend on every script they could import
+        tree_hash = hashlib.sha1(''.join(
+            f'{s.name}:{h}' for s, h in hashes.items()
+        ).encode() + sys.version.encode()).hexdigest()
+
+        cache_file = result_cache_path(cache_dir, skill_path) if cache_dir else None
+        cache = load_json(cache_file, {}) if cache_file else {}
+        entries = cache.get('entries', {}) if cache.get('version') == RESULT_CACHE_VERSION else {}
+        used = {}
+        lock = threading.Lock()
 
-        # Try to import Python scripts
-        scripts_dir = skill_path / 'scripts'
+        def cached(key, compute, cacheable=lambda r: True):
+            with lock:
+                if key in entries:
+                    report['stats']['cached'] += 1
+                    used[key] = entries[key]
+                    return entries[key]
+            result = compute()
+            if cacheable(result):
+                with lock:
+                    used[key] = result
+            return result
 
-        if scripts_dir.exists():
-            for script in scripts_dir.glob('*.py'):
-                # Basic syntax check
-                content = script.read_text()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Stage 1: compile everything
+            compiled = list(pool.map(
+                lambda s: cached(f'compile:{s.name}:{hashes[s]}', lambda: compile_script(s, sources[s])),
+                scripts
+            ))
+            report['stats']['compiled'] = len(scripts)
+            importable = []
+            for script, error in zip(scripts, compiled):
+                if error:
+                    report['errors'].append(error)
+                else:
+                    importable.append(script)
 
-                try:
-                    compile(content, str(script), 'exec')
-                except SyntaxError as e:
-                    return {
-                        'success': False,
-                        'error': f'Syntax error in {script.name}: {e}'
-                    }
+            # Stages 2 and 3 run side by side
+            imports = [
+                (script, pool.submit(
+                    cached, f'import:{script.name}:{hashes[script]}:{tree_hash}',
+                    lambda s=script: import_script(s), lambda r: not r.get('timeout')
+                ))
+                for script in importable
+            ]
+            test_runs = []
+            if run_tests:
+                runs = plan_test_runs(skill_path, workers)
+                tests_hash = hash_tests(skill_path) if runs else ''
+                for test_file, command in runs:
+                    key = f'test:{test_file}:{tests_hash}:{tree_hash}'
+                    test_runs.append((test_file, pool.submit(
+                        cached, key, lambda c=command: run_pytest(skill_path, c),
+                        lambda r: not r.get('timeout')
+                    )))
 
-        return {'success': True, 'error': None}
+            for script, future in imports:
+                result = future.result()
+                report['stats']['imported'] += 1
+                message = result.get('error')
+                if not message:
+                    continue
+                if result.get('module') and result['module'].split('.')[0].lower() in requirements:
+                    report['warnings'].append(
+                        f"{script.name}: dependency '{result['module']}' not installed here")
+                else:
+                    report['errors'].append(f'Import error in {script.name}: {message}')
+
+            for test_file, future in test_runs:
+                result = future.result()
+                report['stats']['tests'] += 1
+                if result.get('skipped'):
+                    report['warnings'].append(result['skipped'])
+                elif result.get('error'):
+                    report['errors'].append(f'Tests failed in {test_file}: {result["error"]}')
+
+        if cache_file and used != entries:
+            save_json(cache_file, {'version': RESULT_CACHE_VERSION, 'entries': used})
+
+        report['success'] = not report['errors']
+        report['error'] = report['errors'][0] if report['errors'] else None
+        return report
 
     except Exception as e:
-        return {'success': False, 'error': str(e)}
+        report['error'] = str(e)
+        report['errors'].append(str(e))
+        return report
+
+
+def result_cache_path(cache_dir: Path, skill_path: Path) -> Path:
+    """Per-skill result cache file inside a workspace"""
+    return Path(cache_dir) / '.test_cache' / f'{Path(skill_path).name}.json'
+
+
+def hash_tests(skill_path: Path) -> str:
+    """Hash of every Python file under tests/ (conftest changes affect every run)"""
+
+    digest = hashlib.sha1()
+    for path in sorted((skill_path / 'tests').rglob('*.py')):
+        digest.update(str(path.relative_to(skill_path)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def read_requirement_names(skill_path: Path) -> set:
+    """Lower-case package names listed in requirements.txt"""
+
+    req_file = skill_path / 'requirements.txt'
+    if not req_file.is_file():
+        return set()
+    names = set()
+    for line in req_file.read_text(errors='replace').split('\n'):
+        line = line.split('#')[0].strip()
+        if line and not line.startswith('-'):
+            name = line.split(';')[0]
+            for sep in ('[', '=', '<', '>', '!', '~', ' '):
+                name = name.split(sep)[0]
+            names.add(name.lower().replace('-', '_'))
+    return names
+
+
+def compile_script(script: Path, raw: bytes) -> Optional[str]:
+    """Syntax check one script; returns the error message or None"""
+
+    try:
+        compile(raw, str(script), 'exec')
+    except (SyntaxError, ValueError) as e:
+        return f'Syntax error in {script.name}: {e}'
+    return None
+
+
+def sandbox_env(skill_path: Path) -> Dict[str, str]:
+    """Environment for skill subprocesses: scripts importable, no bytecode in the skill"""
+
+    env = dict(os.environ)
+    scripts = str(skill_path / 'scripts')
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (scripts, env.get('PYTHONPATH')) if p)
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    env['MPLBACKEND'] = 'Agg'
+    return env
+
+
+def import_script(script: Path, timeout: float = IMPORT_TIMEOUT) -> Dict:
+    """
+    Import one script in a sandboxed subprocess
+
+    Returns:
+        {} on success, or {'error': message, 'module': missing module name
+        or None, 'timeout': True if it was killed}
+    """
+
+    try:
+        proc = subprocess.run(
+            [sys.executable, '-c', IMPORT_RUNNER, str(script), str(MEMORY_LIMIT_BYTES)],
+            cwd=str(script.parent),
+            env=sandbox_env(script.parent.parent),
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {'error': f'import did not finish within {timeout:g}s', 'timeout': True}
+
+    if proc.returncode == 0:
+        return {}
+
+    lines = proc.stdout.decode(errors='replace').strip().split('\n')
+    try:
+        info = json.loads(lines[-1])
+        return {'error': f"{info['error']}: {info['message']}", 'module': info.get('module')}
+    except (ValueError, KeyError):
+        # Killed before reporting, e.g. by the memory limit
+        stderr = proc.stderr.decode(errors='replace').strip()
+        detail = stderr.split('\n')[-1] if stderr else f'exit status {proc.returncode}'
+        return {'error': detail, 'module': None}
+
+
+def plan_test_runs(skill_path: Path, workers: int) -> List[tuple]:
+    """
+    pytest invocations for the skill's tests/ directory
+
+    Returns:
+        [(label, pytest arguments)]: one run with -n when pytest-xdist is
+        installed, otherwise one run per test file
+    """
+
+    tests_dir = skill_path / 'tests'
+    if not tests_dir.is_dir():
+        return []
+    test_files = sorted(tests_dir.rglob('test_*.py'))
+    if not test_files:
+        return []
+
+    if importlib.util.find_spec('pytest') is None:
+        return [('tests', None)]
+
+    base = ['-q', '-p', 'no:cacheprovider', '-o', 'addopts=']
+    if importlib.util.find_spec('xdist') is not None and len(test_files) > 1:
+        return [('tests', base + ['-n', str(min(workers, len(test_files))), 'tests'])]
+    return [(str(f.relative_to(skill_path)), base + [str(f.relative_to(skill_path))]) for f in test_files]
+
+
+def run_pytest(skill_path: Path, args: Optional[List[str]], timeout: float = TEST_TIMEOUT) -> Dict:
+    """
+    Run pytest on part of the skill's tests in a subprocess
+
+    Returns:
+        {} on success, {'error': summary} on failure, {'skipped': reason}
+        when pytest is unavailable or nothing was collected
+    """
+
+    if args is None:
+        return {'skipped': 'pytest not installed, bundled tests not run'}
+
+    try:
+        proc = subprocess.run(
+            [sys.executable, '-m', 'pytest', *args],
+            cwd=str(skill_path),
+            env=sandbox_env(skill_path),
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {'error': f'tests did not finish within {timeout:g}s', 'timeout': True}
+
+    # 5: no tests collected
+    if proc.returncode in (0, 5):
+        return {}
+
+    lines = [l for l in proc.stdout.decode(errors='replace').strip().split('\n') if l.strip()]
+    return {'error': lines[-1] if lines else f'exit status {proc.returncode}'}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python test_skill.py <skill-directory>")
+        sys.exit(1)
+
+    result = test_skill_basic(Path(sys.argv[1]))
+    for warning in result['warnings']:
+        print(f"⚠️  {warning}")
+    for error in result['errors']:
+        print(f"❌ {error}")
+    if result['success']:
+        print("✅ Tests passed")
+    sys.exit(0 if result['success'] else 1)
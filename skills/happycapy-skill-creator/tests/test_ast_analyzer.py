@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test cases for AST-based compatibility analysis
+
+Bug: Substring checks flagged "Gemini" as Ruby ("gem") and every .read() as a memory issue
+Solution: Resolve imports, subprocess arguments and file handles from the AST
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+def analyze(source):
+    from ast_analyzer import analyze_python_source
+    return [(i['type'], i['line']) for i in analyze_python_source('x.py', source)]
+
+
+class TestFalsePositives:
+    """Code that the old substring checks flagged wrongly"""
+
+    def test_gemini_is_not_ruby(self):
+        """Test that words containing runtime names are ignored"""
+        assert analyze('MODEL = "gemini-pro"\nJAVASCRIPT = True\nfrom os import path\n') == []
+
+    def test_non_file_reads_ignored(self):
+        """Test that .read() on non-file objects is ignored"""
+        source = (
+            "import sys, urllib.request\n"
+            "data = sys.stdin.read()\n"
+            "body = urllib.request.urlopen('http://x').read()\n"
+        )
+        assert analyze(source) == []
+
+    def test_bounded_reads_ignored(self):
+        """Test that chunked reads are not flagged"""
+        source = "with open('big.bin', 'rb') as f:\n    chunk = f.read(65536)\n"
+        assert analyze(source) == []
+
+
+class TestDetections:
+    """Real incompatibilities"""
+
+    def test_docker_import(self):
+        """Test detection of the Docker SDK"""
+        assert analyze("import docker\nclient = docker.from_env()\n") == [('docker_dependency', 1)]
+
+    def test_docker_command_list(self):
+        """Test detection of Docker invoked through subprocess"""
+        source = "import subprocess\nsubprocess.run(['docker', 'run', 'image'])\n"
+        assert analyze(source) == [('docker_dependency', 2)]
+
+    def test_aliased_shell_command_via_variable(self):
+        """Test that aliases and constant variables are resolved"""
+        source = (
+            "from subprocess import check_output as co\n"
+            "CMD = 'cd build && java -jar tool.jar'\n"
+            "co(CMD, shell=True)\n"
+        )
+        assert analyze(source) == [('unsupported_runtime', 3)]
+
+    def test_os_system_fstring(self):
+        """Test that f-string commands are resolved"""
+        source = "import os\nname = 'x'\nos.system(f'gem install {name}')\n"
+        assert analyze(source) == [('unsupported_runtime', 3)]
+
+    def test_unbounded_file_reads(self):
+        """Test detection of whole-file reads on handles"""
+        source = (
+            "def load(p):\n"
+            "    with open(p) as f:\n"
+            "        return f.read()\n"
+        )
+        assert analyze(source) == [('memory_concern', 3)]
+        assert analyze("data = open('x').readlines()\n") == [('memory_concern', 1)]
+
+
+class TestIntegration:
+    """Test use from check_compatibility"""
+
+    def test_syntax_error_falls_back_to_text_scan(self):
+        """Test that unparsable files are still scanned"""
+        from check_compatibility import scan_file
+
+        issues = scan_file('broken.py', "def broken(:\n    os.system('docker run x')\n")
+        assert [i['type'] for i in issues] == ['docker_dependency']
+
+    def test_ast_cached_by_content(self):
+        """Test that identical content is parsed once"""
+        from ast_analyzer import parse_cached
+
+        source = "x = 1  # cached\n"
+        assert parse_cached(source) is parse_cached(source)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
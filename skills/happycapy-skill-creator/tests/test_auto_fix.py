@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Test cases for concurrent, per-file auto-fix
+
+Bug: Issues in the same file were fixed one LLM call at a time, each call
+     rewriting the whole file and overwriting the previous fix
+Solution: Coalesce issues per file, fix files concurrently, write atomically
+"""
+
+import threading
+import time
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+class FakeClient:
+    """Records prompts and returns a patch (or fixed code in full mode)"""
+
+    def __init__(self, delay=0.0):
+        self.prompts = []
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def simple_prompt(self, prompt, **kwargs):
+        with self.lock:
+            self.prompts.append(prompt)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if 'SEARCH/REPLACE' in prompt:
+            return "<<<<<<< SEARCH\nimport docker\n=======\nprint('fixed')\n>>>>>>> REPLACE"
+        return "```python\nprint('fixed')\n```"
+
+
+class LineFixClient:
+    """Full-file mode: drops every line the prompt flags, so fixes really remove issues"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def simple_prompt(self, prompt, **kwargs):
+        import re
+
+        self.prompts.append(prompt)
+        flagged = {int(n) for n in re.findall(r'^- line (\d+):', prompt, re.MULTILINE)}
+        code = re.search(r'```python\n(.*?)\n```', prompt, re.DOTALL).group(1)
+        kept = [line for n, line in enumerate(code.split('\n'), 1) if n not in flagged]
+        return "```python\n" + '\n'.join(kept) + "\n```"
+
+
+def docker_commands(count):
+    """Python source with one Docker issue per line from line 2 on"""
+    return "import subprocess\n" + ''.join(
+        f'subprocess.run(["docker", "run", "image-{i}"])\n' for i in range(count)
+    )
+
+
+def docker_issue(rel_path, line):
+    return {'type': 'docker_dependency', 'file': rel_path, 'line': line,
+            'description': 'Uses Docker', 'suggestion': 'Remove Docker'}
+
+
+@pytest.fixture
+def skill(tmp_path, monkeypatch):
+    monkeypatch.setenv('AI_GATEWAY_API_KEY', 'test-key')
+    (tmp_path / 'scripts').mkdir()
+    for name in ('a.py', 'b.py', 'c.py'):
+        path = tmp_path / 'scripts' / name
+        path.write_text("import docker\n")
+        path.chmod(0o755)
+    (tmp_path / 'requirements.txt').write_text("requests\ntorch\n")
+    return tmp_path
+
+
+def use_client(monkeypatch, client):
+    import ai_gateway
+    monkeypatch.setattr(ai_gateway, 'create_client', lambda: client)
+
+
+class TestPerFileFixing:
+    """Test per-file coalescing"""
+
+    def test_one_call_per_file(self, skill, monkeypatch):
+        """Test that 21 issues in one file become one prompt per batch"""
+        from auto_fix_improved import fix_compatibility_issues
+
+        client = LineFixClient()
+        use_client(monkeypatch, client)
+
+        (skill / 'scripts' / 'a.py').write_text(docker_commands(21))
+        issues = [docker_issue('scripts/a.py', line) for line in range(2, 23)]
+        result = fix_compatibility_issues(skill, issues, batch_size=25, mode='full')
+
+        assert len(client.prompts) == 1
+        assert 'line 22' in client.prompts[0]
+        assert result == {'fixed': ['scripts/a.py'], 'failed': {}}
+
+    def test_batches_use_current_line_numbers(self, skill, monkeypatch):
+        """Test that each batch is re-scanned from the file the previous batch wrote"""
+        from auto_fix_improved import fix_compatibility_issues
+
+        client = LineFixClient()
+        use_client(monkeypatch, client)
+
+        path = skill / 'scripts' / 'a.py'
+        path.write_text(docker_commands(12))
+        issues = [docker_issue('scripts/a.py', line) for line in range(2, 14)]
+        result = fix_compatibility_issues(skill, issues, batch_size=5, mode='full')
+
+        assert result == {'fixed': ['scripts/a.py'], 'failed': {}}
+        assert len(client.prompts) == 3
+        # The first batch removed lines 2-6, so the next one starts at line 2 again
+        for prompt in client.prompts:
+            assert '- line 2:' in prompt
+        assert 'docker' not in path.read_text()
+
+    def test_batches_stop_when_nothing_remains(self, skill, monkeypatch):
+        """Test that issues an earlier batch already fixed cost no further call"""
+        from auto_fix_improved import fix_compatibility_issues
+
+        client = FakeClient()
+        use_client(monkeypatch, client)
+
+        # Every flagged line goes away with the single fix of the first batch
+        issues = [docker_issue('scripts/a.py', 1)] * 12
+        result = fix_compatibility_issues(skill, issues, batch_size=5)
+
+        assert len(client.prompts) == 1
+        assert result == {'fixed': ['scripts/a.py'], 'failed': {}}
+
+    def test_files_fixed_concurrently(self, skill, monkeypatch):
+        """Test that different files are fixed in parallel"""
+        from auto_fix_improved import fix_compatibility_issues
+
+        client = FakeClient(delay=0.1)
+        use_client(monkeypatch, client)
+
+        issues = [docker_issue(f'scripts/{n}.py', 1) for n in 'abc']
+        fix_compatibility_issues(skill, issues, max_workers=3)
+
+        assert len(client.prompts) == 3
+        assert client.max_active > 1
+
+    def test_atomic_write_keeps_mode(self, skill, monkeypatch):
+        """Test that fixed files keep their permissions"""
+        from auto_fix_improved import fix_compatibility_issues
+
+        use_client(monkeypatch, FakeClient())
+        fix_compatibility_issues(skill, [docker_issue('scripts/a.py', 1)])
+
+        path = skill / 'scripts' / 'a.py'
+        assert path.read_text() == "print('fixed')\n"
+        assert path.stat().st_mode & 0o777 == 0o755
+        assert not list((skill / 'scripts').glob('.*.tmp'))
+
+    def test_dependencies_fixed_without_llm(self, skill, monkeypatch):
+        """Test that requirements.txt is fixed locally"""
+        from auto_fix_improved import fix_compatibility_issues
+
+        client = FakeClient()
+        use_client(monkeypatch, client)
+
+        issue = {'type': 'unavailable_dependency', 'file': 'requirements.txt', 'line': 2,
+                 'description': 'torch', 'suggestion': ''}
+        fix_compatibility_issues(skill, [issue])
+
+        assert client.prompts == []
+        assert (skill / 'requirements.txt').read_text() == "requests\n"
+
+    def test_dockerfile_removed_without_llm(self, skill, monkeypatch):
+        """Test that a Dockerfile is deleted locally instead of rewritten as Python"""
+        from auto_fix_improved import fix_compatibility_issues
+        from check_compatibility import check_environment_compatibility
+
+        client = FakeClient()
+        use_client(monkeypatch, client)
+
+        (skill / 'Dockerfile').write_text("FROM python:3.11\n")
+        issues = [i for i in check_environment_compatibility(skill) if i['file'] == 'Dockerfile']
+        assert issues
+
+        result = fix_compatibility_issues(skill, issues)
+
+        assert client.prompts == []
+        assert result == {'fixed': ['Dockerfile'], 'failed': {}}
+        assert not (skill / 'Dockerfile').exists()
+
+    def test_other_files_not_sent_to_llm(self, skill, monkeypatch):
+        """Test that only Python files are rewritten by the LLM"""
+        from auto_fix_improved import fix_compatibility_issues
+
+        client = FakeClient()
+        use_client(monkeypatch, client)
+
+        (skill / 'run.sh').write_text("docker run app\n")
+        result = fix_compatibility_issues(skill, [docker_issue('run.sh', 1)])
+
+        assert client.prompts == []
+        assert result['fixed'] == [] and 'run.sh' in result['failed']
+        assert (skill / 'run.sh').read_text() == "docker run app\n"
+
+
+class SequenceClient:
+    """Returns the given responses in order"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def simple_prompt(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return self.responses[len(self.prompts) - 1]
+
+
+def patch_to(text):
+    return f"<<<<<<< SEARCH\nimport docker\n=======\n{text}\n>>>>>>> REPLACE"
+
+
+class TestVerification:
+    """Test post-fix verification and rollback"""
+
+    def test_broken_fix_retried_with_error(self, skill, monkeypatch):
+        """Test that a fix that does not compile is retried with the error"""
+        from auto_fix_improved import fix_compatibility_issues
+
+        # First attempt: no patch, so the small file is regenerated - broken
+        client = SequenceClient(
+            "no patch here",
+            "```python\ndef broken(:\n```",
+            patch_to("import os")
+        )
+        use_client(monkeypatch, client)
+
+        result = fix_compatibility_issues(skill, [docker_issue('scripts/a.py', 1)], max_retries=2)
+
+        assert result['fixed'] == ['scripts/a.py']
+        assert (skill / 'scripts' / 'a.py').read_text() == "import os\n"
+        assert 'does not compile' in client.prompts[-1]
+
+    def test_unfixed_issue_rolled_back(self, skill, monkeypatch):
+        """Test that a fix still using Docker is rolled back and reported"""
+        from auto_fix_improved import fix_compatibility_issues
+
+        client = SequenceClient(*[patch_to("import docker as d")] * 2)
+        use_client(monkeypatch, client)
+
+        result = fix_compatibility_issues(skill, [docker_issue('scripts/a.py', 1)], max_retries=1)
+
+        path = skill / 'scripts' / 'a.py'
+        assert path.read_text() == "import docker\n"
+        assert 'still has issues' in result['failed']['scripts/a.py']
+        assert 'still has issues' in client.prompts[1]
+        assert path.stat().st_mode & 0o777 == 0o755
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test cases for the single-pass compatibility scanner
+
+Bug: Each checker re-walked the skill and re-read every file
+Solution: One walk, one read per file, all issue types from one pass
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+SOURCE = '''import subprocess
+
+def build():
+    subprocess.run(["docker", "build", "."])
+
+def package():
+    subprocess.run(["java", "-jar", "tool.jar"])
+
+def load(path):
+    return open(path).read()
+'''
+
+
+@pytest.fixture
+def skill(tmp_path):
+    (tmp_path / 'scripts').mkdir()
+    (tmp_path / 'scripts' / 'tool.py').write_text(SOURCE)
+    (tmp_path / 'scripts' / 'clean.py').write_text("print('ok')\n")
+    (tmp_path / 'requirements.txt').write_text("requests\ntorch==2.0\n")
+    (tmp_path / 'Dockerfile').write_text("FROM python:3.11\n")
+    return tmp_path
+
+
+class TestSinglePassScanner:
+    """Test the unified scanner"""
+
+    def test_all_issue_types_found(self, skill):
+        """Test that every issue type is reported in order"""
+        from check_compatibility import check_environment_compatibility
+
+        issues = check_environment_compatibility(skill)
+        types = [i['type'] for i in issues]
+        assert types == [
+            'unavailable_dependency',
+            'docker_dependency', 'docker_dependency',
+            'unsupported_runtime',
+            'memory_concern',
+        ]
+
+    def test_accurate_line_numbers(self, skill):
+        """Test that runtime and memory issues carry real line numbers"""
+        from check_compatibility import check_environment_compatibility
+
+        issues = {(i['type'], i['file']): i['line'] for i in check_environment_compatibility(skill)}
+        assert issues[('docker_dependency', 'scripts/tool.py')] == 4
+        assert issues[('unsupported_runtime', 'scripts/tool.py')] == 7
+        assert issues[('memory_concern', 'scripts/tool.py')] == 10
+        assert issues[('unavailable_dependency', 'requirements.txt')] == 2
+
+    def test_each_file_read_once(self, skill, monkeypatch):
+        """Test that a full check reads every code file exactly once"""
+        from check_compatibility import check_environment_compatibility
+
+        reads = []
+        original = Path.read_bytes
+
+        def counting_read_bytes(self):
+            reads.append(self.name)
+            return original(self)
+
+        monkeypatch.setattr(Path, 'read_bytes', counting_read_bytes)
+        check_environment_compatibility(skill)
+
+        assert sorted(reads) == ['Dockerfile', 'clean.py', 'requirements.txt', 'tool.py']
+
+    def test_legacy_checkers_filter_by_type(self, skill):
+        """Test that the per-type checkers still work"""
+        from check_compatibility import check_docker_usage, check_memory_patterns
+
+        assert {i['type'] for i in check_docker_usage(skill)} == {'docker_dependency'}
+        assert len(check_memory_patterns(skill)) == 1
+
+
+
+class TestIncrementalRecheck:
+    """Test the per-file result cache"""
+
+    def _count_scans(self, monkeypatch):
+        import check_compatibility
+
+        scanned = []
+        original = check_compatibility.scan_file
+
+        def counting_scan_file(rel_path, content):
+            scanned.append(rel_path)
+            return original(rel_path, content)
+
+        monkeypatch.setattr(check_compatibility, 'scan_file', counting_scan_file)
+        return scanned
+
+    def test_recheck_only_scans_changed_files(self, skill, tmp_path, monkeypatch):
+        """Test that an unchanged skill is not rescanned"""
+        from check_compatibility import check_environment_compatibility
+
+        workspace = tmp_path / 'workspace'
+        first = check_environment_compatibility(skill, cache_dir=workspace)
+
+        scanned = self._count_scans(monkeypatch)
+        assert check_environment_compatibility(skill, cache_dir=workspace) == first
+        assert scanned == []
+
+        (skill / 'scripts' / 'tool.py').write_text("print('fixed')\n")
+        remaining = check_environment_compatibility(skill, cache_dir=workspace)
+        assert scanned == ['scripts/tool.py']
+        assert [i['type'] for i in remaining] == [
+            'unavailable_dependency', 'docker_dependency'
+        ]
+
+    def test_check_explicit_files(self, skill, tmp_path):
+        """Test checking only the files a fix touched"""
+        from check_compatibility import check_files
+
+        issues = check_files(skill, [skill / 'scripts' / 'tool.py', 'scripts/clean.py'],
+                             cache_dir=tmp_path / 'workspace')
+        assert {i['file'] for i in issues} == {'scripts/tool.py'}
+
+    def test_deleted_file_drops_issues(self, skill, tmp_path):
+        """Test that issues of a removed file disappear"""
+        from check_compatibility import check_environment_compatibility
+
+        workspace = tmp_path / 'workspace'
+        check_environment_compatibility(skill, cache_dir=workspace)
+        (skill / 'Dockerfile').unlink()
+
+        issues = check_environment_compatibility(skill, cache_dir=workspace)
+        assert 'Dockerfile' not in {i['file'] for i in issues}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
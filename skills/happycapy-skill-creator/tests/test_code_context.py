@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test cases for the context-budgeted code summarizer
+
+Bug: read_skill_code included the first 1000 characters of SKILL.md and
+     the first 500 of every script, cutting off key functions and bloating
+     prompts for big skills
+Solution: AST summaries ranked by relevance to the feature, packed into a
+          token budget, cached by content hash
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+FILLER = "\n".join(
+    f"def helper_{i}(value):\n    \"\"\"Unrelated helper {i}\"\"\"\n    return value + {i}\n"
+    for i in range(80)
+)
+
+PDF_SCRIPT = '''"""PDF utilities"""
+import sys
+
+
+def _read_pages(path):
+    """Read all pages of a PDF"""
+    return open(path, 'rb')
+
+
+def compress_pdf(path, quality=50):
+    """Compress a PDF by re-encoding its images"""
+    pages = _read_pages(path)
+    return pages
+
+
+class Merger:
+    """Merge PDF files"""
+
+    def merge(self, files):
+        return files
+
+
+def main():
+    compress_pdf(sys.argv[1])
+'''
+
+
+@pytest.fixture
+def skill(tmp_path, monkeypatch):
+    monkeypatch.setenv('HAPPYCAPY_CACHE_DIR', str(tmp_path / 'cache'))
+    path = tmp_path / 'pdf'
+    (path / 'scripts').mkdir(parents=True)
+    (path / 'SKILL.md').write_text("---\nname: pdf\ndescription: PDF tools\n---\n\n# PDF\n")
+    (path / 'scripts' / 'aaa_filler.py').write_text(f'"""Filler module"""\n\n{FILLER}')
+    (path / 'scripts' / 'pdf_tools.py').write_text(PDF_SCRIPT)
+    return path
+
+
+class TestSummaries:
+    """Test AST summaries"""
+
+    def test_summary_contents(self):
+        """Test signatures, docstrings and calls"""
+        from code_context import summarize_python
+
+        summary = summarize_python('scripts/pdf_tools.py', PDF_SCRIPT)
+        symbols = {s['name']: s for s in summary['symbols']}
+
+        assert summary['doc'] == 'PDF utilities'
+        assert summary['imports'] == ['sys']
+        assert symbols['compress_pdf']['signature'] == 'def compress_pdf(path, quality=50):'
+        assert symbols['compress_pdf']['doc'] == 'Compress a PDF by re-encoding its images'
+        assert symbols['compress_pdf']['calls'] == ['_read_pages']
+        assert 'Merger.merge' in symbols
+
+    def test_syntax_error(self):
+        """Test that broken files still summarize"""
+        from code_context import summarize_python
+
+        assert summarize_python('x.py', 'def broken(:')['parsed'] is False
+
+    def test_summary_cached_by_hash(self, skill, monkeypatch):
+        """Test that unchanged files are not summarized again"""
+        import code_context
+
+        content = PDF_SCRIPT
+        code_context.load_summary('scripts/pdf_tools.py', content)
+
+        monkeypatch.setattr(code_context, 'summarize_python',
+                            lambda *a: pytest.fail("summary should come from cache"))
+        summary = code_context.load_summary('scripts/pdf_tools.py', content)
+
+        assert summary['symbols'][0]['name'] == '_read_pages'
+
+
+class TestRanking:
+    """Test relevance ranking"""
+
+    def test_relevant_symbol_and_callee_first(self):
+        """Test that the matching function and its helper outrank filler"""
+        from code_context import rank_symbols, summarize_python
+
+        summaries = [
+            summarize_python('scripts/aaa_filler.py', FILLER),
+            summarize_python('scripts/pdf_tools.py', PDF_SCRIPT),
+        ]
+        ranked = [s['name'] for s in rank_symbols(summaries, 'compress pdf files')]
+
+        assert ranked[0] == 'compress_pdf'
+        assert ranked.index('_read_pages') < ranked.index('helper_0')
+
+
+class TestBudget:
+    """Test packing into a token budget"""
+
+    def test_context_fits_budget(self, skill):
+        """Test that the context stays within budget and keeps the key function"""
+        from code_context import build_code_context, estimate_tokens
+
+        context = build_code_context(skill, 'compress pdf', budget=600)
+
+        assert estimate_tokens(context) <= 600 * 1.05
+        assert 'def compress_pdf(path, quality=50):' in context
+        assert 'pages = _read_pages(path)' in context
+        assert '=== SKILL.md ===' in context
+
+    def test_old_preview_cut_off_key_function(self, skill):
+        """Test that the function a 500-char preview would miss is included"""
+        from integrate_feature import read_skill_code
+
+        context = read_skill_code(skill, 'merge pdf files')
+
+        assert 'class Merger:' in context
+        assert 'def merge(self, files):' in context
+
+    def test_method_ranked_above_its_class_shown_once(self, skill):
+        """Test that a method already added is dropped when its whole class is shown"""
+        from code_context import build_code_context, rank_symbols, load_summary
+
+        summary = load_summary('scripts/pdf_tools.py', PDF_SCRIPT)
+        ranked = [s['name'] for s in rank_symbols([summary], 'merge')]
+        assert ranked.index('Merger.merge') < ranked.index('Merger')
+
+        context = build_code_context(skill, 'merge', budget=2500)
+
+        assert 'class Merger:' in context
+        assert context.count('def merge(self, files):') == 1
+
+    def test_estimate_tokens(self):
+        """Test the fallback estimator on code"""
+        from code_context import estimate_tokens
+
+        assert estimate_tokens('') == 0
+        assert 5 <= estimate_tokens('def f(x): return x') <= 12
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Test cases for parallel multi-feature integration
+
+Bug: Features were integrated one at a time and save_integrated_code
+     overwrote files, so a later feature clobbered an earlier feature's
+     SKILL.md edits
+Solution: Generate every feature concurrently against one snapshot,
+          three-way merge the file sets, re-prompt only conflicting files.
+          Responses are streamed and each file is written and checked as
+          soon as its block closes
+"""
+
+import threading
+import time
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+SKILL_MD = "# PDF\n\nTools for PDF files.\n\n## Usage\n\nRun the scripts.\n"
+
+
+class FeatureClient:
+    """Answers integration prompts per feature and resolution prompts"""
+
+    def __init__(self, responses, resolution=None, delay=0.0):
+        self.responses = responses
+        self.resolution = resolution
+        self.delay = delay
+        self.prompts = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def simple_prompt(self, prompt, **kwargs):
+        with self.lock:
+            self.prompts.append(prompt)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if 'conflict' in prompt:
+            return self.resolution
+        for feature, response in self.responses.items():
+            if f"NEW FEATURE TO ADD: {feature}" in prompt:
+                return response
+        return ""
+
+
+def block(path, content):
+    return f"```filename: {path}\n{content}```\n"
+
+
+@pytest.fixture
+def skill(tmp_path, monkeypatch):
+    monkeypatch.setenv('HAPPYCAPY_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setenv('AI_GATEWAY_API_KEY', 'test-key')
+    path = tmp_path / 'pdf'
+    (path / 'scripts').mkdir(parents=True)
+    (path / 'SKILL.md').write_text(SKILL_MD)
+    return path
+
+
+def use_client(monkeypatch, client):
+    import ai_gateway
+    monkeypatch.setattr(ai_gateway, 'create_client', lambda *a, **k: client)
+
+
+class TestMergeThreeWay:
+    """Test the three-way merge helper"""
+
+    def test_disjoint_edits_merge(self):
+        """Test that edits to different lines merge cleanly"""
+        from feature_merge import merge_three_way
+
+        base = "a\nb\nc\nd\ne\n"
+        merged, conflicted = merge_three_way(base, "A\nb\nc\nd\ne\n", "a\nb\nc\nd\nE\n")
+
+        assert not conflicted
+        assert merged == "A\nb\nc\nd\nE\n"
+
+    def test_overlapping_edits_conflict(self):
+        """Test conflict detection and the union fallback"""
+        from feature_merge import has_conflict_markers, merge_three_way
+
+        merged, conflicted = merge_three_way("a\n", "a\nx\n", "a\ny\n")
+        assert conflicted and has_conflict_markers(merged)
+
+        union, conflicted = merge_three_way("a\n", "a\nx\n", "a\ny\n", union=True)
+        assert not conflicted
+        assert union == "a\nx\ny\n"
+
+    def test_union_fallback_only_for_markdown(self):
+        """Test that conflicting code keeps the first version and Markdown both sides"""
+        from feature_merge import merge_file_sets
+
+        snapshot = {'SKILL.md': "a\n", 'scripts/run.py': "a\n"}
+        proposals = [
+            ('one', {'SKILL.md': "a\nx\n", 'scripts/run.py': "a\nx\n"}),
+            ('two', {'SKILL.md': "a\ny\n", 'scripts/run.py': "a\ny\n"}),
+            ('three', {'scripts/run.py': "a\nz\n"}),
+        ]
+        merged, conflicts = merge_file_sets(snapshot, proposals)
+
+        assert set(conflicts) == {'SKILL.md', 'scripts/run.py'}
+        assert list(conflicts['scripts/run.py']['versions']) == ['one', 'two', 'three']
+        assert merged['SKILL.md'] == "a\nx\ny\n"
+        assert merged['scripts/run.py'] == "a\nx\n"
+
+
+class TestIntegrateFeatures:
+    """Test concurrent integration of several features"""
+
+    def test_parallel_generation_and_clean_merge(self, skill, monkeypatch):
+        """Test that both features' SKILL.md edits survive"""
+        from integrate_feature import integrate_features
+
+        client = FeatureClient({
+            'compress': block('scripts/compress.py', "print('compress')\n")
+            + block('SKILL.md', SKILL_MD.replace("# PDF\n", "# PDF\n\nNow compresses.\n")),
+            'merge': block('scripts/merge.py', "print('merge')\n")
+            + block('SKILL.md', SKILL_MD + "\n## Merge\n\nMerges PDFs.\n"),
+        }, delay=0.1)
+        use_client(monkeypatch, client)
+
+        result = integrate_features(skill, {'compress': {}, 'merge': {}}, "compress and merge PDFs")
+
+        skill_md = (skill / 'SKILL.md').read_text()
+        assert "Now compresses." in skill_md
+        assert "## Merge" in skill_md
+        assert (skill / 'scripts' / 'compress.py').read_text() == "print('compress')\n"
+        assert (skill / 'scripts' / 'merge.py').exists()
+        assert result['conflicts'] == []
+        assert client.max_active == 2
+
+    def test_conflict_reprompts_only_conflicting_file(self, skill, monkeypatch):
+        """Test that one resolution prompt is sent, for the conflicting file"""
+        from integrate_feature import integrate_features
+
+        resolved = SKILL_MD + "\n## Compress\n\n## Merge\n"
+        client = FeatureClient({
+            'compress': block('scripts/compress.py', "print('compress')\n")
+            + block('SKILL.md', SKILL_MD + "\n## Compress\n"),
+            'merge': block('scripts/merge.py', "print('merge')\n")
+            + block('SKILL.md', SKILL_MD + "\n## Merge\n"),
+        }, resolution=block('SKILL.md', resolved))
+        use_client(monkeypatch, client)
+
+        result = integrate_features(skill, {'compress': {}, 'merge': {}}, "compress and merge PDFs")
+
+        resolution_prompts = [p for p in client.prompts if 'conflict' in p]
+        assert len(resolution_prompts) == 1
+        assert 'SKILL.md' in resolution_prompts[0]
+        assert result['conflicts'] == ['SKILL.md']
+        assert result['resolved'] == ['SKILL.md']
+        assert (skill / 'SKILL.md').read_text() == resolved
+
+    def test_unusable_resolution_keeps_both_sides(self, skill, monkeypatch):
+        """Test the union fallback when the resolution has conflict markers"""
+        from integrate_feature import integrate_features
+
+        client = FeatureClient({
+            'compress': block('SKILL.md', SKILL_MD + "\n## Compress\n"),
+            'merge': block('SKILL.md', SKILL_MD + "\n## Merge\n"),
+        }, resolution=block('SKILL.md', "<<<<<<< ours\nx\n=======\ny\n>>>>>>> theirs\n"))
+        use_client(monkeypatch, client)
+
+        result = integrate_features(skill, {'compress': {}, 'merge': {}}, "compress and merge PDFs")
+
+        skill_md = (skill / 'SKILL.md').read_text()
+        assert result['resolved'] == []
+        assert "## Compress" in skill_md and "## Merge" in skill_md
+        assert '<<<<<<<' not in skill_md
+
+    def test_unresolved_code_keeps_first_version(self, skill, monkeypatch):
+        """Test that a conflicting Python file is never union-merged"""
+        from integrate_feature import integrate_features
+
+        base = "def run(x):\n    return 0\n"
+        first = "def run(x):\n    if x:\n        return 1\n    return 0\n"
+        second = "def run(x):\n    while x:\n        x -= 1\n    return 0\n"
+        (skill / 'scripts' / 'run.py').write_text(base)
+
+        client = FeatureClient({
+            'compress': block('scripts/run.py', first),
+            'merge': block('scripts/run.py', second),
+        }, resolution=block('scripts/run.py', "def run(x:\n"))
+        use_client(monkeypatch, client)
+
+        result = integrate_features(skill, {'compress': {}, 'merge': {}}, "compress and merge PDFs")
+
+        assert result['conflicts'] == ['scripts/run.py']
+        assert result['resolved'] == []
+        assert result['unresolved'] == ['scripts/run.py']
+        assert (skill / 'scripts' / 'run.py').read_text() == first
+
+    def test_templates_without_api_key(self, skill, monkeypatch):
+        """Test that template integration of two features keeps both sections"""
+        from integrate_feature import integrate_features
+
+        monkeypatch.delenv('AI_GATEWAY_API_KEY')
+        monkeypatch.delenv('ANTHROPIC_API_KEY', raising=False)
+
+        integrate_features(skill, {'compress': {}, 'rotate': {}}, "compress and rotate PDFs")
+
+        skill_md = (skill / 'SKILL.md').read_text()
+        assert "## Compress" in skill_md and "## Rotate" in skill_md
+        assert (skill / 'scripts' / 'compress.py').exists()
+        assert (skill / 'scripts' / 'rotate.py').exists()
+
+    def test_paths_outside_skill_ignored(self):
+        """Test that generated files cannot escape the skill directory"""
+        from integrate_feature import parse_file_blocks
+
+        files = parse_file_blocks(block('../evil.py', "x\n") + block('./scripts/ok.py', "y\n"))
+
+        assert files == {'scripts/ok.py': "y\n"}
+
+
+class StreamingClient:
+    """Streams a response in small chunks, optionally failing partway"""
+
+    def __init__(self, response, chunk_size=7, fail_after=None, on_chunk=None):
+        self.response = response
+        self.chunk_size = chunk_size
+        self.fail_after = fail_after
+        self.on_chunk = on_chunk
+
+    def stream_prompt(self, prompt, **kwargs):
+        for i in range(0, len(self.response), self.chunk_size):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise ConnectionError("stream dropped")
+            if self.on_chunk:
+                self.on_chunk(i)
+            yield self.response[i:i + self.chunk_size]
+
+
+class TestStreaming:
+    """Test incremental parsing and early writes"""
+
+    def test_stream_parser_matches_full_parse(self):
+        """Test that every chunking finds the same blocks as the regex"""
+        from integrate_feature import FileBlockStream, parse_file_blocks
+
+        response = ("Here you go.\n" + block('scripts/a.py', "print('a')\n")
+                    + "Then docs:\n" + block('SKILL.md', "# A\n") + "Done.")
+        for size in (1, 2, 3, 5, 13, len(response)):
+            stream = FileBlockStream()
+            closed = []
+            for i in range(0, len(response), size):
+                closed.extend(stream.feed(response[i:i + size]))
+            assert stream.files == parse_file_blocks(response)
+            assert [path for path, _ in closed] == ['scripts/a.py', 'SKILL.md']
+
+    def test_files_written_and_checked_while_streaming(self, skill, monkeypatch):
+        """Test that a closed file is on disk and being checked before the stream ends"""
+        import integrate_feature
+
+        first = block('scripts/a.py', "import docker\n")
+        response = first + "Some explanation in between.\n" * 20 + block('scripts/b.py', "print('b')\n")
+        seen = {}
+        checked = threading.Event()
+
+        real_check = integrate_feature.check_files
+
+        def check_files(skill_path, files, cache_dir=None):
+            issues = real_check(skill_path, files, cache_dir)
+            if files == ['scripts/a.py']:
+                checked.set()
+            return issues
+
+        def on_chunk(offset):
+            if offset > len(first) + 50 and 'written' not in seen:
+                seen['written'] = (skill / 'scripts' / 'a.py').exists()
+                seen['checked'] = checked.wait(2)
+
+        monkeypatch.setattr(integrate_feature, 'check_files', check_files)
+        use_client(monkeypatch, StreamingClient(response, on_chunk=on_chunk))
+
+        result = integrate_feature.integrate_features(skill, {'compress': {}}, "compress PDFs",
+                                                      cache_dir=skill.parent)
+
+        assert seen == {'written': True, 'checked': True}
+        assert (skill / 'scripts' / 'b.py').read_text() == "print('b')\n"
+        assert result['issues']['scripts/a.py'][0]['type'] == 'docker_dependency'
+        assert result['issues']['scripts/b.py'] == []
+
+    def test_dropped_stream_keeps_complete_files(self, skill, monkeypatch):
+        """Test that blocks closed before a failure are kept, not templated"""
+        from integrate_feature import integrate_features
+
+        response = block('scripts/a.py', "print('a')\n") + block('scripts/b.py', "print('b')\n" * 50)
+        use_client(monkeypatch, StreamingClient(response, fail_after=60))
+
+        result = integrate_features(skill, {'compress': {}}, "compress PDFs")
+
+        assert result['written'] == ['scripts/a.py']
+        assert not (skill / 'scripts' / 'b.py').exists()
+        assert not (skill / 'scripts' / 'compress.py').exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
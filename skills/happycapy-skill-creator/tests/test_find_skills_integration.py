@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test cases for the installed-skills scan
+
+Bug: Every create_skill run re-read and regex-parsed all installed SKILL.md files
+Solution: Installed skills come from the on-disk catalog, parsed in parallel on cold start
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    import skill_catalog
+
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('HAPPYCAPY_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(skill_catalog, '_catalogs', {})
+
+    skills_dir = tmp_path / '.claude' / 'skills'
+    for i in range(20):
+        skill_dir = skills_dir / f'skill-{i}'
+        skill_dir.mkdir(parents=True)
+        (skill_dir / 'SKILL.md').write_text(
+            f"---\nname: skill-{i}\ndescription: Generic helper number {i}\n---\n"
+        )
+    pdf_dir = skills_dir / 'pdf'
+    pdf_dir.mkdir()
+    (pdf_dir / 'SKILL.md').write_text(
+        "---\nname: pdf\ndescription: Manipulate PDF files - merge, split and compress\n---\n"
+    )
+    return tmp_path
+
+
+class TestInstalledSkills:
+    """Test installed skill discovery"""
+
+    def test_cold_start_parses_all(self, home):
+        """Test that all installed skills are found on a cold start"""
+        from find_skills_integration import get_installed_skills
+
+        skills = get_installed_skills()
+        assert len(skills) == 21
+        assert (home / 'cache' / 'catalog.sqlite').exists()
+
+    def test_warm_sync_parses_nothing(self, home):
+        """Test that a second process re-parses nothing"""
+        from skill_catalog import SkillCatalog
+
+        skills_dir = home / '.claude' / 'skills'
+        SkillCatalog(skills_dir).sync()
+        assert SkillCatalog(skills_dir).sync()['parsed'] == 0
+
+    def test_perfect_match(self, home):
+        """Test that matching uses the catalog entries"""
+        from find_skills_integration import find_existing_skill
+
+        match = find_existing_skill("compress and merge PDF files")
+        assert match['name'] == 'pdf'
+        assert match['perfect_match'] is True
+
+    def test_tokens_precomputed(self, home, monkeypatch):
+        """Test that matching reads the catalog token sets instead of re-tokenizing"""
+        import keyword_index
+        from find_skills_integration import get_installed_skills, is_perfect_match
+
+        skills = get_installed_skills()
+        pdf = next(s for s in skills if s['name'] == 'pdf')
+        assert {'manipulate', 'pdf', 'file', 'compress'} <= pdf['description_tokens']
+
+        # Requirement tokens are memoized; only descriptions must not be tokenized again
+        assert is_perfect_match("compress and merge PDF files", pdf)
+        monkeypatch.setattr(keyword_index, 'tokenize', lambda text: pytest.fail("re-tokenized"))
+        assert is_perfect_match("compress and merge PDF files", pdf)
+        assert not any(is_perfect_match("compress and merge PDF files", s) for s in skills if s is not pdf)
+
+    def test_skills_without_description_skipped(self, home):
+        """Test that a skill with an empty description is never a candidate"""
+        from find_skills_integration import get_installed_skills
+
+        bare = home / '.claude' / 'skills' / 'bare'
+        bare.mkdir()
+        (bare / 'SKILL.md').write_text("---\nname: bare\n---\n# No description\n")
+
+        names = {s['name'] for s in get_installed_skills()}
+        assert 'bare' not in names and 'pdf' in names
+
+    def test_no_installed_skills(self, tmp_path, monkeypatch):
+        """Test that a missing skills directory yields no skills"""
+        from find_skills_integration import get_installed_skills
+
+        monkeypatch.setenv('HOME', str(tmp_path / 'nobody'))
+        assert get_installed_skills() == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
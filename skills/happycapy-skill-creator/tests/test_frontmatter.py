@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test cases for the bounded frontmatter reader
+
+Bug: Getting a skill's name and description read the whole SKILL.md, and
+     some skills ship very long docs
+Solution: Read only the leading --- block, parse it with the C YAML
+          loader when available, memoize by (path, mtime, size)
+"""
+
+import builtins
+import os
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+FRONTMATTER = "---\nname: pdf\ndescription: |\n  Work with PDF files\n  of any size\n---\n"
+
+
+@pytest.fixture
+def counting_open(monkeypatch):
+    """Count bytes read through open() inside frontmatter.py"""
+    import frontmatter
+
+    stats = {'opens': 0, 'bytes': 0}
+
+    class CountingFile:
+        def __init__(self, f):
+            self._f = f
+
+        def readline(self, *args):
+            line = self._f.readline(*args)
+            stats['bytes'] += len(line)
+            return line
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self._f.close()
+
+    def fake_open(path, mode='r', *args, **kwargs):
+        stats['opens'] += 1
+        return CountingFile(builtins.open(path, mode, *args, **kwargs))
+
+    monkeypatch.setattr(frontmatter, 'open', fake_open, raising=False)
+    return stats
+
+
+class TestReadFrontmatter:
+    """Test bounded reads and memoization"""
+
+    def test_reads_only_the_block(self, tmp_path, counting_open):
+        """Test that a huge body is never read"""
+        from frontmatter import read_frontmatter
+
+        skill_md = tmp_path / 'SKILL.md'
+        skill_md.write_text(FRONTMATTER + "# Docs\n" + "long line of documentation\n" * 100000)
+
+        meta = read_frontmatter(skill_md)
+
+        assert meta == {'name': 'pdf', 'description': 'Work with PDF files\nof any size'}
+        assert counting_open['bytes'] == len(FRONTMATTER)
+
+    def test_memoized_by_stat(self, tmp_path, counting_open):
+        """Test that unchanged files are not opened again, changed ones are"""
+        from frontmatter import read_frontmatter
+
+        skill_md = tmp_path / 'SKILL.md'
+        skill_md.write_text(FRONTMATTER)
+
+        first = read_frontmatter(skill_md)
+        first['name'] = 'mutated by caller'
+        assert read_frontmatter(skill_md)['name'] == 'pdf'
+        assert counting_open['opens'] == 1
+
+        skill_md.write_text(FRONTMATTER.replace('name: pdf', 'name: pdf-tools'))
+        os.utime(skill_md, ns=(1, 1))
+        assert read_frontmatter(skill_md)['name'] == 'pdf-tools'
+        assert counting_open['opens'] == 2
+
+    def test_missing_and_unclosed(self, tmp_path):
+        """Test files without frontmatter and with an unclosed block"""
+        from frontmatter import FrontmatterError, read_frontmatter, read_frontmatter_text
+
+        plain = tmp_path / 'plain.md'
+        plain.write_text("# Just docs\n")
+        unclosed = tmp_path / 'unclosed.md'
+        unclosed.write_text("---\nname: x\n")
+
+        assert read_frontmatter_text(plain) is None
+        assert read_frontmatter(plain) == {}
+        with pytest.raises(FrontmatterError):
+            read_frontmatter_text(unclosed)
+        assert read_frontmatter(unclosed) == {}
+
+    def test_size_bound(self, tmp_path):
+        """Test that an opening --- followed by a whole document is rejected early"""
+        from frontmatter import FrontmatterError, read_frontmatter_text
+
+        skill_md = tmp_path / 'SKILL.md'
+        skill_md.write_text("---\n" + "not: frontmatter\n" * 1000)
+
+        with pytest.raises(FrontmatterError):
+            read_frontmatter_text(skill_md, max_bytes=1024)
+
+    def test_crlf_and_malformed_yaml(self, tmp_path):
+        """Test CRLF files and the fallback parser for broken YAML"""
+        from frontmatter import read_frontmatter
+
+        crlf = tmp_path / 'crlf.md'
+        crlf.write_bytes(b"---\r\nname: docx\r\ndescription: Word files\r\n---\r\nbody\r\n")
+        broken = tmp_path / 'broken.md'
+        broken.write_text("---\nname: x\ndescription: Uses: colons: badly\n  - oops\n---\n")
+
+        assert read_frontmatter(crlf) == {'name': 'docx', 'description': 'Word files'}
+        assert read_frontmatter(broken)['name'] == 'x'
+
+    def test_c_loader_preferred(self):
+        """Test that libyaml's loader is used when PyYAML has it"""
+        yaml = pytest.importorskip('yaml')
+        import frontmatter
+
+        expected = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        assert frontmatter.yaml_loader() == (yaml, expected)
+
+
+class TestCallers:
+    """Test the callers that moved to the bounded reader"""
+
+    def test_parse_skill_md(self, tmp_path, counting_open):
+        """Test find_skills' SKILL.md parser on a long document"""
+        from find_skills_integration import parse_skill_md
+
+        skill_md = tmp_path / 'pdf' / 'SKILL.md'
+        skill_md.parent.mkdir()
+        skill_md.write_text(FRONTMATTER + "x\n" * 100000)
+
+        info = parse_skill_md(skill_md)
+
+        assert info['name'] == 'pdf'
+        assert info['description'].startswith('Work with PDF files')
+        assert counting_open['bytes'] == len(FRONTMATTER)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
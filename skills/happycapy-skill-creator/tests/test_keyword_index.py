@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test cases for the BM25 keyword fallback
+
+Bug: Keyword fallback re-split every description per query and scored raw overlap
+Solution: Cached BM25F inverted index with field boosts and CJK tokenization
+"""
+
+import os
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+class TestTokenizer:
+    """Test tokenization"""
+
+    def test_hyphenated_names(self):
+        """Test that hyphenated names yield parts and the joined form"""
+        from keyword_index import tokenize
+
+        tokens = tokenize("image-enhancer")
+        assert {'image', 'enhancer', 'imageenhancer'} <= set(tokens)
+
+    def test_stemming(self):
+        """Test that inflected forms share a stem"""
+        from keyword_index import tokenize
+
+        assert tokenize("compressing files") == tokenize("compress file")
+
+    def test_cjk_bigrams(self):
+        """Test that CJK text is split into characters and bigrams"""
+        from keyword_index import tokenize
+
+        tokens = tokenize("小红书招聘")
+        assert '小红' in tokens and '招聘' in tokens
+
+
+class TestKeywordIndex:
+    """Test BM25 ranking"""
+
+    SKILLS = [
+        {'name': 'pdf', 'description': 'Toolkit for document manipulation', 'tags': ['document']},
+        {'name': 'docx', 'description': 'Word documents', 'tags': ['office'],
+         'body': 'Export to pdf is supported as a side feature.'},
+        {'name': 'xiaohongshu-recruiter', 'description': '在小红书上发布招聘帖子', 'tags': []},
+    ]
+
+    def test_name_match_outranks_body_match(self):
+        """Test that the name field boost dominates a body mention"""
+        from keyword_index import KeywordIndex
+
+        scores = KeywordIndex(self.SKILLS).search("pdf")
+        assert scores['pdf'] > scores['docx'] > 0
+
+    def test_chinese_query(self):
+        """Test that Chinese-language skills are found by Chinese queries"""
+        from keyword_index import KeywordIndex
+
+        scores = KeywordIndex(self.SKILLS).search("招聘")
+        assert max(scores, key=scores.get) == 'xiaohongshu-recruiter'
+
+    def test_scores_bounded(self):
+        """Test that similarity stays within (0, 1]"""
+        from keyword_index import KeywordIndex
+
+        scores = KeywordIndex(self.SKILLS).search("pdf document toolkit manipulation")
+        assert all(0 < s <= 1 for s in scores.values())
+
+    def test_index_cached(self):
+        """Test that the index is reused for an unchanged skill list"""
+        from keyword_index import get_keyword_index
+
+        first = get_keyword_index(self.SKILLS)
+        assert get_keyword_index([dict(s) for s in self.SKILLS]) is first
+        assert get_keyword_index(self.SKILLS[:2]) is not first
+
+        # A body edit that keeps the length
+        edited = [dict(s) for s in self.SKILLS]
+        edited[1]['body'] = edited[1]['body'].replace('pdf', 'odt')
+        assert get_keyword_index(edited) is not first
+        assert 'docx' not in get_keyword_index(edited).search("pdf")
+
+    def test_catalog_edit_of_same_length_rebuilds(self, tmp_path):
+        """Test that catalog skills are keyed on content hashes, not body lengths"""
+        from keyword_index import get_keyword_index
+        from skill_catalog import SkillCatalog
+
+        skill = tmp_path / 'skills' / 'pdf'
+        skill.mkdir(parents=True)
+        (skill / 'SKILL.md').write_text("---\nname: pdf\ndescription: PDF tools\n---\nMerge files\n")
+        catalog = SkillCatalog(tmp_path / 'skills', db_path=tmp_path / 'catalog.sqlite')
+        catalog.sync()
+
+        first = get_keyword_index(catalog.skills())
+        assert get_keyword_index(catalog.skills()) is first
+        assert first.search("merge")
+
+        (skill / 'SKILL.md').write_text("---\nname: pdf\ndescription: PDF tools\n---\nSplit files\n")
+        os.utime(skill / 'SKILL.md', ns=(1, 1))
+        catalog.sync()
+
+        second = get_keyword_index(catalog.skills())
+        assert second is not first
+        assert not second.search("merge") and second.search("split")
+
+    def test_rank_skills_by_keywords_sorted(self):
+        """Test that the fallback returns every skill sorted by score"""
+        from semantic_search import rank_skills_by_keywords
+
+        results = rank_skills_by_keywords("pdf", [dict(s) for s in self.SKILLS])
+        assert [r['name'] for r in results][:2] == ['pdf', 'docx']
+        assert results[-1]['similarity'] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
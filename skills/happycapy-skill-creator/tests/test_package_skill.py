@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test cases for reproducible, incremental packaging
+
+Bug: package_skill zipped every file (caches and __pycache__ included),
+     re-deflated already-compressed media, embedded file mtimes and
+     rebuilt the package on every run
+Solution: .skillignore, ZIP_STORED for compressed formats, fixed
+          timestamps and order, manifest hash in the archive comment to
+          skip unchanged packages, large files compressed in parallel
+"""
+
+import os
+import zipfile
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+@pytest.fixture
+def skill(tmp_path):
+    path = tmp_path / 'pdf'
+    (path / 'scripts' / '__pycache__').mkdir(parents=True)
+    (path / 'assets').mkdir()
+    (path / 'SKILL.md').write_text("---\nname: pdf\n---\n\n# PDF\n" + "Usage notes.\n" * 50)
+    (path / 'scripts' / 'run.py').write_text("print('pdf')\n")
+    (path / 'scripts' / 'run.py').chmod(0o755)
+    (path / 'scripts' / '__pycache__' / 'run.cpython-311.pyc').write_bytes(b'\0' * 10)
+    (path / 'assets' / 'logo.png').write_bytes(os.urandom(2048))
+    (path / 'assets' / 'big.txt').write_text("line of data\n" * 40000)
+    (path / 'notes.draft').write_text("private\n")
+    (path / '.skillignore').write_text("# drafts stay local\n*.draft\n")
+    return path
+
+
+def names(skill_file):
+    with zipfile.ZipFile(skill_file) as zf:
+        return zf.namelist()
+
+
+class TestPackageSkill:
+    """Test package contents and reproducibility"""
+
+    def test_contents_and_ignore(self, skill, tmp_path):
+        """Test ignore rules, sorted order and a valid archive"""
+        from package_skill import package_skill
+
+        skill_file = package_skill(skill, 'pdf', output_dir=tmp_path / 'out')
+
+        assert names(skill_file) == [
+            'pdf/SKILL.md', 'pdf/assets/big.txt', 'pdf/assets/logo.png', 'pdf/scripts/run.py',
+        ]
+        with zipfile.ZipFile(skill_file) as zf:
+            assert zf.testzip() is None
+            assert zf.read('pdf/assets/big.txt') == (skill / 'assets' / 'big.txt').read_bytes()
+            infos = {i.filename: i for i in zf.infolist()}
+
+        assert infos['pdf/assets/logo.png'].compress_type == zipfile.ZIP_STORED
+        assert infos['pdf/assets/big.txt'].compress_type == zipfile.ZIP_DEFLATED
+        assert infos['pdf/SKILL.md'].date_time == (1980, 1, 1, 0, 0, 0)
+        assert (infos['pdf/scripts/run.py'].external_attr >> 16) & 0o777 == 0o755
+
+    def test_byte_reproducible(self, skill, tmp_path):
+        """Test that the same content gives the same bytes, whatever the mtimes"""
+        from package_skill import package_skill
+
+        first = package_skill(skill, 'pdf', output_dir=tmp_path / 'a').read_bytes()
+        for path in skill.rglob('*'):
+            os.utime(path, (1_000_000, 1_000_000))
+        second = package_skill(skill, 'pdf', output_dir=tmp_path / 'b', max_workers=1).read_bytes()
+
+        assert first == second
+
+    def test_unchanged_skill_not_repackaged(self, skill, tmp_path):
+        """Test the manifest check"""
+        from package_skill import package_skill
+
+        skill_file = package_skill(skill, 'pdf', output_dir=tmp_path)
+        mtime = skill_file.stat().st_mtime_ns
+        os.utime(skill_file, ns=(mtime - 10 ** 9, mtime - 10 ** 9))
+
+        package_skill(skill, 'pdf', output_dir=tmp_path)
+        assert skill_file.stat().st_mtime_ns == mtime - 10 ** 9
+
+        (skill / 'scripts' / 'run.py').write_text("print('changed')\n")
+        package_skill(skill, 'pdf', output_dir=tmp_path)
+        assert skill_file.stat().st_mtime_ns != mtime - 10 ** 9
+
+        with zipfile.ZipFile(skill_file) as zf:
+            assert zf.read('pdf/scripts/run.py') == b"print('changed')\n"
+
+    def test_ignore_patterns(self):
+        """Test anchoring, directory-only patterns and negation"""
+        from package_skill import is_ignored
+
+        patterns = ['/build', 'cache/', '*.log', '!keep.log', 'docs/*.tmp']
+
+        assert is_ignored('build', patterns, is_dir=True)
+        assert not is_ignored('scripts/build', patterns, is_dir=True)
+        assert is_ignored('scripts/cache', patterns, is_dir=True)
+        assert not is_ignored('scripts/cache', patterns)
+        assert is_ignored('logs/run.log', patterns)
+        assert not is_ignored('logs/keep.log', patterns)
+        assert is_ignored('docs/a.tmp', patterns)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
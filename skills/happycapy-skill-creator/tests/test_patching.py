@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test cases for patch-mode auto-fix
+
+Bug: Auto-fix sent the whole file and asked for the whole file back with
+     max_tokens=3000, so large files came back truncated
+Solution: Send windows around the flagged lines, ask for SEARCH/REPLACE
+          blocks and apply/verify them locally
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+def big_file(n_funcs=200):
+    """Large module with one Docker call in the middle"""
+    lines = ['"""Big module"""', 'import os', 'import subprocess', '']
+    for i in range(n_funcs):
+        lines += [f'def func_{i}():', f'    return {i}', '']
+    lines += ['def build():', '    subprocess.run(["docker", "build", "."])', '']
+    for i in range(n_funcs, 2 * n_funcs):
+        lines += [f'def func_{i}():', f'    return {i}', '']
+    return '\n'.join(lines)
+
+
+def docker_line(code):
+    return code.split('\n').index('    subprocess.run(["docker", "build", "."])') + 1
+
+
+class PatchClient:
+    """Answers every prompt with a fixed response"""
+
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    def simple_prompt(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return self.response
+
+
+class TestWindows:
+    """Test excerpt selection"""
+
+    def test_windows_around_lines_plus_imports(self):
+        """Test that only the header and the flagged region are selected"""
+        from patching import select_windows
+
+        code = big_file()
+        line = docker_line(code)
+        windows = select_windows(code, [line], context=5)
+
+        assert windows == [(1, 3), (line - 5, line + 5)]
+
+    def test_overlapping_windows_merge(self):
+        """Test that nearby flagged lines share one window"""
+        from patching import select_windows
+
+        code = '\n'.join(f'x{i} = {i}' for i in range(100))
+        assert select_windows(code, [40, 45], context=5) == [(35, 50)]
+
+    def test_unknown_line_selects_whole_file(self):
+        """Test that line 0 (location unknown) shows the whole file"""
+        from patching import select_windows
+
+        code = 'a = 1\nb = 2\nc = 3'
+        assert select_windows(code, [0]) == [(1, 3)]
+
+    def test_prompt_is_much_smaller_than_file(self):
+        """Test that a large file is not sent in full"""
+        from patching import build_patch_prompt
+
+        code = big_file()
+        line = docker_line(code)
+        issue = {'type': 'docker_dependency', 'line': line, 'description': 'Uses Docker'}
+        prompt = build_patch_prompt('scripts/big.py', code, [issue], ['Remove all Docker usage'])
+
+        assert 'subprocess.run(["docker"' in prompt
+        assert 'def func_0():' not in prompt
+        assert len(prompt) < len(code) / 5
+
+
+class TestApply:
+    """Test parsing and applying SEARCH/REPLACE blocks"""
+
+    def test_apply_blocks(self):
+        """Test that several blocks are applied in order"""
+        from patching import apply_patch_response
+
+        code = 'import os\n\ndef f():\n    return os.getcwd()\n'
+        response = (
+            "Here you go:\n"
+            "<<<<<<< SEARCH\nimport os\n=======\nimport os\nimport sys\n>>>>>>> REPLACE\n"
+            "<<<<<<< SEARCH\n    return os.getcwd()\n=======\n    return sys.argv\n>>>>>>> REPLACE\n"
+        )
+
+        assert apply_patch_response(code, response, 'x.py') == (
+            'import os\nimport sys\n\ndef f():\n    return sys.argv\n'
+        )
+
+    def test_trailing_whitespace_tolerated(self):
+        """Test that SEARCH text differing only in trailing spaces still matches"""
+        from patching import apply_search_replace
+
+        code = 'a = 1   \nb = 2\n'
+        assert apply_search_replace(code, [('a = 1\nb = 2', 'a = 3\nb = 4')]) == 'a = 3\nb = 4\n'
+
+    def test_missing_or_ambiguous_search_rejected(self):
+        """Test that a patch that does not match exactly once is rejected"""
+        from patching import apply_search_replace, PatchError
+
+        with pytest.raises(PatchError):
+            apply_search_replace('a = 1\n', [('b = 2', 'c = 3')])
+        with pytest.raises(PatchError):
+            apply_search_replace('x = 1\nx = 1\n', [('x = 1', 'x = 2')])
+
+    def test_truncated_response_rejected(self):
+        """Test that a block cut off by max_tokens does not half-apply"""
+        from patching import parse_search_replace, PatchError
+
+        response = (
+            "<<<<<<< SEARCH\na = 1\n=======\na = 2\n>>>>>>> REPLACE\n"
+            "<<<<<<< SEARCH\nb = 1\n=======\nb ="
+        )
+        with pytest.raises(PatchError):
+            parse_search_replace(response)
+
+    def test_syntax_error_rejected(self):
+        """Test that a patch breaking the syntax is rejected"""
+        from patching import apply_patch_response, PatchError
+
+        response = "<<<<<<< SEARCH\nreturn 1\n=======\nreturn (\n>>>>>>> REPLACE"
+        with pytest.raises(PatchError):
+            apply_patch_response('def f():\n    return 1\n', response, 'x.py')
+
+
+class TestAutoFixPatchMode:
+    """Test patch mode in auto_fix"""
+
+    def test_large_file_patched(self, tmp_path):
+        """Test that a large file is fixed via a patch and stays intact"""
+        from auto_fix import fix_docker_issue
+
+        code = big_file()
+        (tmp_path / 'big.py').write_text(code)
+        client = PatchClient(
+            '<<<<<<< SEARCH\n    subprocess.run(["docker", "build", "."])\n'
+            '=======\n    subprocess.run(["make", "build"])\n>>>>>>> REPLACE'
+        )
+
+        fix_docker_issue(client, tmp_path, {'type': 'docker_dependency', 'file': 'big.py',
+                                            'line': docker_line(code), 'description': 'Uses Docker'})
+
+        fixed = (tmp_path / 'big.py').read_text()
+        assert fixed == code.replace('["docker", "build", "."]', '["make", "build"]')
+        assert len(client.prompts) == 1
+
+    def test_large_file_not_regenerated_on_bad_patch(self, tmp_path):
+        """Test that a failed patch on a large file leaves it untouched"""
+        from auto_fix import fix_docker_issue
+
+        code = big_file()
+        (tmp_path / 'big.py').write_text(code)
+        client = PatchClient("```python\nprint('truncated')\n```")
+
+        fix_docker_issue(client, tmp_path, {'type': 'docker_dependency', 'file': 'big.py',
+                                            'line': docker_line(code), 'description': 'Uses Docker'})
+
+        assert (tmp_path / 'big.py').read_text() == code
+        assert len(client.prompts) == 1
+
+    def test_small_file_falls_back_to_full_rewrite(self, tmp_path):
+        """Test that a failed patch on a small file regenerates it"""
+        from auto_fix import fix_docker_issue
+
+        (tmp_path / 'small.py').write_text('import docker\n')
+        client = PatchClient("```python\nimport os\n```")
+
+        fix_docker_issue(client, tmp_path, {'type': 'docker_dependency', 'file': 'small.py',
+                                            'line': 1, 'description': 'Uses Docker'})
+
+        assert (tmp_path / 'small.py').read_text() == 'import os'
+        assert len(client.prompts) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
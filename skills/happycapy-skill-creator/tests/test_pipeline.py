@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Test cases for the step DAG executor
+
+Bug: create_skill ran all steps strictly in sequence, and a failure at a
+     late step meant redoing everything
+Solution: Steps with declared inputs/outputs run as soon as their inputs
+          exist; a failed run can be resumed from its context
+"""
+
+import threading
+import time
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+def slow(output, delay=0.1, value=True):
+    def func(**kwargs):
+        time.sleep(delay)
+        return {output: value}
+    return func
+
+
+class TestPipeline:
+    """Test scheduling, timing and resume"""
+
+    def test_independent_steps_run_concurrently(self):
+        """Test that steps without mutual dependencies overlap"""
+        from pipeline import Pipeline, Step
+
+        pipeline = Pipeline([
+            Step('a', slow('x', 0.2), inputs=['req'], outputs=['x']),
+            Step('b', slow('y', 0.2), inputs=['req'], outputs=['y']),
+            Step('c', lambda x, y: {'z': x and y}, inputs=['x', 'y'], outputs=['z']),
+        ])
+
+        start = time.perf_counter()
+        context = pipeline.run({'req': 'r'})
+
+        assert context['z'] is True
+        assert time.perf_counter() - start < 0.35
+        assert set(pipeline.timings) == {'a', 'b', 'c'}
+        assert pipeline.timings['a'] >= 0.2
+
+    def test_after_orders_without_data(self):
+        """Test that 'after' delays a step until another finishes"""
+        from pipeline import Pipeline, Step
+
+        order = []
+        lock = threading.Lock()
+
+        def record(name, output, delay=0.0):
+            def func(**kwargs):
+                time.sleep(delay)
+                with lock:
+                    order.append(name)
+                return {output: name}
+            return func
+
+        Pipeline([
+            Step('slow', record('slow', 'a', 0.1), outputs=['a']),
+            Step('prompt', record('prompt', 'b'), outputs=['b'], after=['slow']),
+        ]).run()
+
+        assert order == ['slow', 'prompt']
+
+    def test_failure_then_resume(self):
+        """Test that a resumed run skips completed steps"""
+        from pipeline import Pipeline, PipelineError, Step
+
+        calls = []
+        attempts = {'n': 0}
+
+        def clone(req):
+            calls.append('clone')
+            return {'path': f'/tmp/{req}'}
+
+        def fix(path):
+            attempts['n'] += 1
+            if attempts['n'] == 1:
+                raise TimeoutError("gateway timeout")
+            return {'fixed': path}
+
+        def build():
+            return Pipeline([
+                Step('clone', clone, inputs=['req'], outputs=['path']),
+                Step('fix', fix, inputs=['path'], outputs=['fixed']),
+            ])
+
+        with pytest.raises(PipelineError) as exc:
+            build().run({'req': 'x'})
+
+        assert exc.value.step == 'fix'
+        assert exc.value.context['path'] == '/tmp/x'
+
+        context = build().run(exc.value.context)
+
+        assert context['fixed'] == '/tmp/x'
+        assert calls == ['clone']
+
+    def test_stop_pipeline(self):
+        """Test that a step can end the run early"""
+        from pipeline import Pipeline, Step, StopPipeline
+
+        def select(req):
+            raise StopPipeline(result='perfect match')
+
+        pipeline = Pipeline([
+            Step('select', select, inputs=['req'], outputs=['base']),
+            Step('clone', slow('path'), inputs=['base'], outputs=['path']),
+        ])
+        context = pipeline.run({'req': 'r'})
+
+        assert pipeline.stopped
+        assert context['result'] == 'perfect match'
+        assert 'clone' not in pipeline.timings
+
+    def test_invalid_graphs_rejected(self):
+        """Test cycle and duplicate-output detection"""
+        from pipeline import Pipeline, Step
+
+        with pytest.raises(ValueError):
+            Pipeline([
+                Step('a', slow('x'), inputs=['y'], outputs=['x']),
+                Step('b', slow('y'), inputs=['x'], outputs=['y']),
+            ])
+        with pytest.raises(ValueError):
+            Pipeline([
+                Step('a', slow('x'), outputs=['x']),
+                Step('b', slow('x'), outputs=['x']),
+            ])
+
+    def test_wrong_outputs_fail(self):
+        """Test that a step returning undeclared keys fails"""
+        from pipeline import Pipeline, PipelineError, Step
+
+        with pytest.raises(PipelineError):
+            Pipeline([Step('a', lambda: {'other': 1}, outputs=['x'])]).run()
+
+
+class TestCheckpoint:
+    """Test persisted checkpoints and resume across processes"""
+
+    def build(self, calls, fail_fix=False):
+        from pipeline import Pipeline, Step
+
+        def clone(req):
+            calls.append('clone')
+            path = Path(req) / 'skill'
+            path.mkdir(parents=True, exist_ok=True)
+            return {'path': path}
+
+        def integrate(path):
+            calls.append('integrate')
+            return {'integrated': ['compress']}
+
+        def fix(path, integrated):
+            calls.append('fix')
+            if fail_fix:
+                raise TimeoutError("gateway timeout")
+            return {'fixed': True}
+
+        return Pipeline([
+            Step('clone', clone, inputs=['req'], outputs=['path']),
+            Step('integrate', integrate, inputs=['path'], outputs=['integrated']),
+            Step('fix', fix, inputs=['path', 'integrated'], outputs=['fixed']),
+        ])
+
+    def test_resume_skips_completed_steps(self, tmp_path):
+        """Test that a new process resumes at the failed step"""
+        from checkpoint import Checkpoint
+        from pipeline import PipelineError
+
+        calls = []
+        with pytest.raises(PipelineError):
+            self.build(calls, fail_fix=True).run({'req': str(tmp_path)}, Checkpoint(tmp_path / 'run'))
+        assert (tmp_path / 'run' / 'manifest.json').exists()
+
+        calls.clear()
+        pipeline = self.build(calls)
+        context = pipeline.run({'req': str(tmp_path)}, Checkpoint(tmp_path / 'run'))
+
+        assert calls == ['fix']
+        assert context['path'] == tmp_path / 'skill'
+        assert pipeline.restored == {'clone', 'integrate'}
+
+    def test_changed_input_reruns_dependents(self, tmp_path):
+        """Test that a re-run step invalidates everything downstream"""
+        from checkpoint import Checkpoint
+
+        calls = []
+        self.build(calls).run({'req': str(tmp_path / 'a')}, Checkpoint(tmp_path / 'run'))
+
+        calls.clear()
+        self.build(calls).run({'req': str(tmp_path / 'b')}, Checkpoint(tmp_path / 'run'))
+
+        assert calls == ['clone', 'integrate', 'fix']
+
+    def test_missing_output_path_reruns(self, tmp_path):
+        """Test that a step whose output directory vanished runs again"""
+        import shutil
+        from checkpoint import Checkpoint
+
+        calls = []
+        self.build(calls).run({'req': str(tmp_path)}, Checkpoint(tmp_path / 'run'))
+        shutil.rmtree(tmp_path / 'skill')
+
+        calls.clear()
+        self.build(calls).run({'req': str(tmp_path)}, Checkpoint(tmp_path / 'run'))
+
+        assert calls == ['clone', 'integrate', 'fix']
+
+
+class TestCreateSkillPipeline:
+    """Test the create_skill workflow on the executor"""
+
+    def test_perfect_match_stops_early(self, tmp_path, monkeypatch):
+        """Test that a perfect match ends the run without cloning"""
+        import create_skill
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(create_skill, 'find_existing_skill',
+                            lambda req: {'name': 'pdf', 'perfect_match': True})
+        monkeypatch.setattr(create_skill, 'search_similar_skills',
+                            lambda req: [{'name': 'pdf', 'similarity': 0.9, 'description': ''}])
+        monkeypatch.setattr(create_skill, 'clone_skill_from_repo',
+                            lambda *a: pytest.fail("clone must not run"))
+
+        creator = create_skill.SkillCreator()
+        assert creator.create_skill("compress pdf", skill_name='x') is None
+        assert set(creator.pipeline.timings) == {'find_existing', 'search_similar', 'select_base'}
+
+    def test_auto_fix_reports_failures(self, tmp_path, monkeypatch, capsys):
+        """Test that failed fixes are reported and only applied fixes trigger a re-check"""
+        import create_skill
+
+        issues = [
+            {'type': 'docker_dependency', 'file': 'scripts/a.py', 'description': 'uses docker'},
+            {'type': 'memory_concern', 'file': 'scripts/b.py', 'description': 'loads everything'},
+        ]
+        checks = []
+
+        def recheck(skill_path, cache_dir=None):
+            checks.append(skill_path)
+            return issues[1:]
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(create_skill, 'check_environment_compatibility', recheck)
+        creator = create_skill.SkillCreator()
+
+        monkeypatch.setattr(create_skill, 'fix_compatibility_issues',
+                            lambda path, found: {'fixed': [], 'failed': {'scripts/b.py': 'timed out'}})
+        assert creator._step_auto_fix(tmp_path, issues) == {'remaining_issues': issues}
+        assert checks == []
+        out = capsys.readouterr().out
+        assert "Could not fix scripts/b.py: timed out" in out
+        assert "memory_concern: loads everything" in out
+        assert "No fixes applied" in out
+        assert "Issues fixed" not in out
+
+        monkeypatch.setattr(create_skill, 'fix_compatibility_issues',
+                            lambda path, found: {'fixed': ['scripts/a.py'], 'failed': {'scripts/b.py': 'timed out'}})
+        assert creator._step_auto_fix(tmp_path, issues) == {'remaining_issues': issues[1:]}
+        assert checks == [tmp_path]
+        assert "Fixed 1 file(s)" in capsys.readouterr().out
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
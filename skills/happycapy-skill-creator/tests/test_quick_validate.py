@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test cases for tree validation in skill-creator's quick_validate.py
+
+Bug: Validating a skills tree started one process per skill, stopped at the
+     first error and re-checked unchanged skills on every run
+Solution: validate_tree validates in one process (or a pool), caches results
+          by SKILL.md stat and frontmatter hash, and reports as text, JSON
+          or JUnit XML
+"""
+
+import importlib
+import json
+import xml.etree.ElementTree as ET
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+SKILL_CREATOR_SCRIPTS = Path(__file__).resolve().parents[2] / 'skill-creator' / 'scripts'
+
+
+@pytest.fixture
+def quick_validate():
+    """skill-creator's quick_validate, imported next to its own frontmatter.py"""
+    # Both skills ship a frontmatter module; swap ours out while importing
+    names = ('frontmatter', 'quick_validate')
+    saved = {name: sys.modules.pop(name, None) for name in names}
+    sys.path.insert(0, str(SKILL_CREATOR_SCRIPTS))
+    try:
+        yield importlib.import_module('quick_validate')
+    finally:
+        sys.path.remove(str(SKILL_CREATOR_SCRIPTS))
+        for name in names:
+            sys.modules.pop(name, None)
+            if saved[name] is not None:
+                sys.modules[name] = saved[name]
+
+
+def write_skill(root: Path, rel: str, frontmatter: str) -> Path:
+    skill_md = root / rel / 'SKILL.md'
+    skill_md.parent.mkdir(parents=True, exist_ok=True)
+    skill_md.write_text(f"---\n{frontmatter}\n---\n# Body\n")
+    return skill_md
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / 'skills'
+    write_skill(root, 'pdf', "name: pdf\ndescription: PDF tools")
+    write_skill(root, 'group/video', "name: Video\ndescription: <frames>")
+    return root
+
+
+@pytest.fixture
+def counted(quick_validate, monkeypatch):
+    """Skills actually validated (not answered from the cache)"""
+    validated = []
+    collect_errors = quick_validate.collect_errors
+
+    def counting(skill_path):
+        validated.append(Path(skill_path).name)
+        return collect_errors(skill_path)
+
+    monkeypatch.setattr(quick_validate, 'collect_errors', counting)
+    return validated
+
+
+class TestValidateTree:
+    """Test the cache and the reports of validate_tree"""
+
+    def test_cache_hit_on_unchanged_rerun(self, quick_validate, counted, tree, tmp_path):
+        """Test that an unchanged tree is answered from the cache"""
+        cache = tmp_path / 'cache.json'
+
+        first = quick_validate.validate_tree(tree, workers=1, cache_path=cache)
+        assert sorted(counted) == ['pdf', 'video']
+        assert first['pdf'] == []
+        assert len(first['group/video']) == 2
+
+        counted.clear()
+        assert quick_validate.validate_tree(tree, workers=1, cache_path=cache) == first
+        assert counted == []
+
+    def test_cache_miss_after_edit(self, quick_validate, counted, tree, tmp_path):
+        """Test that an edited SKILL.md is validated again, and only that one"""
+        cache = tmp_path / 'cache.json'
+        quick_validate.validate_tree(tree, workers=1, cache_path=cache)
+
+        write_skill(tree, 'pdf', "name: pdf\ndescription: PDF tools\nversion: 2")
+        counted.clear()
+
+        results = quick_validate.validate_tree(tree, workers=1, cache_path=cache)
+        assert counted == ['pdf']
+        assert results['pdf'][0].startswith("Unexpected key(s) in SKILL.md frontmatter: version")
+
+        counted.clear()
+        quick_validate.validate_tree(tree, workers=1, cache_path=cache, use_cache=False)
+        assert sorted(counted) == ['pdf', 'video']
+
+    def test_json_report(self, quick_validate, tree, tmp_path):
+        """Test the shape of the JSON report"""
+        results = quick_validate.validate_tree(tree, workers=1, cache_path=tmp_path / 'cache.json')
+        report = json.loads(quick_validate.format_json(results, tree))
+
+        assert report['root'] == str(tree)
+        assert (report['total'], report['failed']) == (2, 1)
+        assert [s['path'] for s in report['skills']] == ['group/video', 'pdf']
+        assert report['skills'][1] == {'path': 'pdf', 'valid': True, 'errors': []}
+        assert report['skills'][0]['valid'] is False
+        assert report['skills'][0]['errors'] == results['group/video']
+
+    def test_junit_report(self, quick_validate, tree, tmp_path):
+        """Test that the JUnit report is well-formed XML with one case per skill"""
+        results = quick_validate.validate_tree(tree, workers=1, cache_path=tmp_path / 'cache.json')
+        report = quick_validate.format_junit(results)
+
+        assert report.startswith("<?xml")
+        suite = ET.fromstring(report.encode('utf-8'))
+        assert suite.tag == 'testsuite'
+        assert (suite.get('tests'), suite.get('failures'), suite.get('errors')) == ('2', '1', '0')
+
+        cases = {case.get('name'): case for case in suite.iter('testcase')}
+        assert set(cases) == {'pdf', 'group/video'}
+        assert cases['pdf'].find('failure') is None
+        failure = cases['group/video'].find('failure')
+        assert failure.get('message') == results['group/video'][0]
+        assert failure.text.splitlines() == results['group/video']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test cases for the sparse repository mirror
+
+Bug: Every clone downloaded the whole skills repository, copied one
+     directory and deleted the clone
+Solution: Persistent sparse, blob-filtered mirror in the cache directory,
+          refreshed at most every N minutes
+"""
+
+import subprocess
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+def git(*args, cwd):
+    subprocess.run(["git", *args], cwd=str(cwd), check=True, capture_output=True)
+
+
+@pytest.fixture
+def upstream(tmp_path, monkeypatch):
+    """Local repository standing in for anthropics/skills"""
+    monkeypatch.setenv('HAPPYCAPY_CACHE_DIR', str(tmp_path / 'cache'))
+    for var in ('GIT_AUTHOR_NAME', 'GIT_COMMITTER_NAME'):
+        monkeypatch.setenv(var, 'test')
+    for var in ('GIT_AUTHOR_EMAIL', 'GIT_COMMITTER_EMAIL'):
+        monkeypatch.setenv(var, 'test@example.com')
+
+    repo = tmp_path / 'upstream'
+    for name in ('pdf', 'docx'):
+        (repo / 'skills' / name / 'scripts').mkdir(parents=True)
+        (repo / 'skills' / name / 'SKILL.md').write_text(f"---\nname: {name}\n---\n")
+        (repo / 'skills' / name / 'scripts' / 'run.py').write_text("print('v1')\n")
+    (repo / 'README.md').write_text("skills\n")
+
+    git("init", "-q", cwd=repo)
+    git("add", ".", cwd=repo)
+    git("commit", "-q", "-m", "initial", cwd=repo)
+    return repo
+
+
+class TestRepoMirror:
+    """Test sparse checkout and refresh"""
+
+    def test_only_requested_skill_checked_out(self, upstream, tmp_path):
+        """Test that the mirror only materializes the requested directory"""
+        from repo_mirror import RepoMirror
+
+        mirror = RepoMirror(f"file://{upstream}", tmp_path / 'mirror')
+        path = mirror.checkout('skills/pdf')
+
+        assert path == tmp_path / 'mirror' / 'skills' / 'pdf'
+        assert (path / 'SKILL.md').exists()
+        assert not (tmp_path / 'mirror' / 'skills' / 'docx').exists()
+
+    def test_missing_skill(self, upstream, tmp_path):
+        """Test that an unknown directory returns None"""
+        from repo_mirror import RepoMirror
+
+        mirror = RepoMirror(f"file://{upstream}", tmp_path / 'mirror')
+        assert mirror.checkout('skills/nope') is None
+
+    def test_refresh_interval(self, upstream, tmp_path, monkeypatch):
+        """Test that fetches happen only once the interval has passed"""
+        from repo_mirror import RepoMirror
+
+        mirror = RepoMirror(f"file://{upstream}", tmp_path / 'mirror')
+        assert mirror.update() is True
+        mirror.checkout('skills/pdf')
+
+        (upstream / 'skills' / 'pdf' / 'scripts' / 'run.py').write_text("print('v2')\n")
+        git("commit", "-q", "-am", "v2", cwd=upstream)
+
+        assert mirror.update() is False
+        monkeypatch.setenv('HAPPYCAPY_MIRROR_REFRESH_MINUTES', '0')
+        assert mirror.update() is True
+
+        assert (mirror.path / 'skills' / 'pdf' / 'scripts' / 'run.py').read_text() == "print('v2')\n"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
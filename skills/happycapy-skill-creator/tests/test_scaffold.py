@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test cases for template-bundle scaffolding
+
+Bug: create_template_skill built directories and formatted template
+     strings file by file, and a failure left a half-written skill
+Solution: Versioned template bundles (directories or zips) compiled once
+          per process, rendered with string.Template and written into a
+          temporary directory that is renamed into place
+"""
+
+import json
+import os
+import zipfile
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+@pytest.fixture
+def bundle_dir(tmp_path):
+    root = tmp_path / 'house'
+    (root / 'scripts').mkdir(parents=True)
+    (root / 'bundle.json').write_text(json.dumps({
+        'name': 'house', 'version': '2',
+        'executable': ['scripts/${skill_module}.sh'],
+        'directories': ['references'],
+        'defaults': {'owner': 'data-team'},
+    }))
+    (root / 'SKILL.md.tmpl').write_text("---\nname: ${skill_name}\ndescription: ${description}\n---\n\n# ${skill_title}\nOwner: $owner\n")
+    (root / 'scripts' / '${skill_module}.sh.tmpl').write_text('#!/bin/sh\necho "$$HOME ${skill_name}"\n')
+    (root / 'scripts' / 'logo.bin').write_bytes(b'\x89PNG\0$skill_name')
+    return root
+
+
+class TestScaffold:
+    """Test bundle compilation, rendering and writing"""
+
+    def test_fallback_bundle(self, tmp_path):
+        """Test the skill clone_skill creates when no source has it"""
+        from clone_skill import create_template_skill
+
+        skill = tmp_path / 'pdf-tools'
+        create_template_skill(skill, 'pdf-tools')
+
+        assert sorted(p.relative_to(skill).as_posix() for p in skill.rglob('*')) == [
+            'SKILL.md', 'assets', 'references', 'scripts', 'scripts/pdf_tools.py',
+        ]
+        assert (skill / 'SKILL.md').read_text().startswith("---\nname: pdf-tools\ndescription: [TODO")
+        assert os.access(skill / 'scripts' / 'pdf_tools.py', os.X_OK)
+        compile((skill / 'scripts' / 'pdf_tools.py').read_text(), 'pdf_tools.py', 'exec')
+
+    def test_render(self, bundle_dir):
+        """Test placeholders in paths and contents, $$ escapes, defaults and raw files"""
+        from scaffold import load_bundle
+
+        bundle = load_bundle(bundle_dir)
+        files = bundle.render('csv-report', {'description': 'Build CSV reports'})
+
+        assert str(bundle) == 'house@2'
+        assert files['SKILL.md'][0].decode() == (
+            "---\nname: csv-report\ndescription: Build CSV reports\n---\n\n# Csv Report\nOwner: data-team\n"
+        )
+        assert files['scripts/csv_report.sh'] == (b'#!/bin/sh\necho "$HOME csv-report"\n', 0o755)
+        assert files['scripts/logo.bin'] == (b'\x89PNG\0$skill_name', None)
+        assert files['references'] == (None, None)
+
+    def test_missing_variable(self, bundle_dir):
+        """Test that every unset placeholder is named before anything renders"""
+        from scaffold import BundleError, load_bundle
+
+        with pytest.raises(BundleError, match="no value for description"):
+            load_bundle(bundle_dir).render('csv-report')
+
+    def test_compiled_once_and_recompiled_on_change(self, bundle_dir):
+        """Test the per-process bundle cache"""
+        from scaffold import load_bundle
+
+        first = load_bundle(bundle_dir)
+        assert load_bundle(bundle_dir) is first
+
+        template = bundle_dir / 'SKILL.md.tmpl'
+        template.write_text(template.read_text() + "Version two\n")
+        os.utime(template, ns=(1, 1))
+
+        second = load_bundle(bundle_dir)
+        assert second is not first
+        assert second.render('x', {'description': 'd'})['SKILL.md'][0].endswith(b"Version two\n")
+
+    def test_zip_bundle(self, bundle_dir, tmp_path):
+        """Test a bundle archived under a top-level directory"""
+        from scaffold import load_bundle
+
+        archive = tmp_path / 'house.zip'
+        with zipfile.ZipFile(archive, 'w') as zf:
+            for path in sorted(bundle_dir.rglob('*')):
+                zf.write(path, Path('house') / path.relative_to(bundle_dir))
+
+        files = load_bundle(archive).render('csv-report', {'description': 'd'})
+        assert set(files) == {'SKILL.md', 'references', 'scripts', 'scripts/csv_report.sh', 'scripts/logo.bin'}
+
+    def test_write_is_all_or_nothing(self, tmp_path):
+        """Test that a failed write leaves neither the skill nor temporary files"""
+        from scaffold import write_skill
+
+        files = {'SKILL.md': (b'---\n', None), 'scripts/run.py': (b'', 0o755),
+                 'scripts/run.py/oops': (b'', None)}
+
+        with pytest.raises(OSError):
+            write_skill(tmp_path / 'broken', files)
+        assert list(tmp_path.iterdir()) == []
+
+        (tmp_path / 'kept').mkdir()
+        with pytest.raises(FileExistsError):
+            write_skill(tmp_path / 'kept', {'SKILL.md': (b'', None)})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test cases for the skill catalog
+
+Bug: get_available_skills returned four hard-coded mock skills
+Solution: SQLite catalog built from a skills tree with incremental re-sync
+"""
+
+import os
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+def write_skill(root: Path, name: str, description: str, body: str = "# Body\n"):
+    skill_dir = root / name
+    (skill_dir / 'scripts').mkdir(parents=True, exist_ok=True)
+    (skill_dir / 'SKILL.md').write_text(
+        f"---\nname: {name}\ndescription: {description}\n---\n{body}"
+    )
+    (skill_dir / 'scripts' / 'main.py').write_text("print('hi')\n")
+    return skill_dir
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    from skill_catalog import SkillCatalog
+
+    root = tmp_path / 'skills'
+    write_skill(root, 'pdf', 'PDF toolkit')
+    write_skill(root, 'weather', 'Weather forecasts')
+    (root / 'not-a-skill').mkdir()
+
+    cat = SkillCatalog(root, db_path=tmp_path / 'catalog.sqlite')
+    yield cat
+    cat.close()
+
+
+class TestSkillCatalog:
+    """Test catalog ingestion and incremental sync"""
+
+    def test_initial_scan(self, catalog):
+        """Test that every SKILL.md is parsed"""
+        stats = catalog.sync()
+        assert stats == {'scanned': 2, 'parsed': 2, 'removed': 0}
+
+        pdf = catalog.get('pdf')
+        assert pdf['description'] == 'PDF toolkit'
+        assert pdf['language'] == 'python'
+        assert pdf['repo_path'] == 'skills/pdf'
+        assert pdf['body'].startswith('# Body')
+
+    def test_resync_skips_unchanged(self, catalog):
+        """Test that unchanged skills are not re-parsed"""
+        catalog.sync()
+        assert catalog.sync()['parsed'] == 0
+
+    def test_resync_picks_up_changes(self, catalog):
+        """Test that edited, added and removed skills are detected"""
+        catalog.sync()
+
+        skill_md = catalog.root / 'pdf' / 'SKILL.md'
+        skill_md.write_text("---\nname: pdf\ndescription: Compress PDFs\n---\n")
+        st = skill_md.stat()
+        os.utime(skill_md, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+        write_skill(catalog.root, 'video-frames', 'Extract frames')
+        (catalog.root / 'weather' / 'SKILL.md').unlink()
+
+        stats = catalog.sync()
+        assert stats['parsed'] == 2
+        assert stats['removed'] == 1
+        assert catalog.get('pdf')['description'] == 'Compress PDFs'
+        assert catalog.get('weather') is None
+
+    def test_touch_without_content_change(self, catalog):
+        """Test that a stat change with identical content is not a re-parse"""
+        catalog.sync()
+        skill_md = catalog.root / 'pdf' / 'SKILL.md'
+        st = skill_md.stat()
+        os.utime(skill_md, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+        assert catalog.sync()['parsed'] == 0
+
+    def test_block_scalar_description(self, tmp_path):
+        """Test that multi-line YAML descriptions are parsed"""
+        from skill_catalog import parse_frontmatter
+
+        meta, body = parse_frontmatter("---\nname: x\ndescription: |\n  line one\n  line two\n---\nbody")
+        assert meta['description'].startswith('line one')
+        assert body == 'body'
+
+    def test_simple_parser_fallback(self):
+        """Test the parser used when PyYAML is missing"""
+        from frontmatter import parse_simple_yaml
+
+        meta = parse_simple_yaml('name: x\ndescription: "quoted text"\nother: |\n  a\n  b')
+        assert meta == {'name': 'x', 'description': 'quoted text', 'other': 'a\nb'}
+
+
+class TestRepoCatalog:
+    """Test against this repository's skills tree"""
+
+    def test_repo_skills_indexed(self):
+        """Test that search reads real skills instead of mock data"""
+        from semantic_search import get_available_skills
+
+        names = {s['name'] for s in get_available_skills()}
+        assert {'pdf', 'skill-creator', 'happycapy-skill-creator'} <= names
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
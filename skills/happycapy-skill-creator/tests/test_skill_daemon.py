@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Test cases for the resident skill daemon
+
+Bug: Every skill operation started a new process that re-imported the
+     pipeline, re-synced the catalog and reloaded the search index
+Solution: Optional daemon that keeps them warm and serves JSON requests
+          over a Unix socket, with a thin client
+"""
+
+import shutil
+import tempfile
+import threading
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+@pytest.fixture
+def socket_path():
+    # AF_UNIX paths are limited to ~100 bytes; pytest's tmp_path can be longer
+    directory = Path(tempfile.mkdtemp(prefix='hcd-', dir='/tmp'))
+    yield directory / 'daemon.sock'
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def start_daemon(socket_path):
+    """Start a SkillDaemon in a thread; stopped after the test"""
+    from skill_daemon import SkillDaemon
+
+    servers = []
+
+    def start(operations=None):
+        server = SkillDaemon(socket_path, operations=operations)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class TestSkillDaemon:
+    """Test the socket protocol and the client"""
+
+    def test_round_trip(self, socket_path, start_daemon):
+        """Test that operations run in the daemon and state persists across calls"""
+        from skill_daemon import call, is_running
+
+        seen = []
+        start_daemon({'echo': lambda text: seen.append(text) or {'text': text, 'calls': len(seen)}})
+
+        assert is_running(socket_path)
+        assert call('echo', socket_path=socket_path, text='a') == {'text': 'a', 'calls': 1}
+        assert call('echo', socket_path=socket_path, text='b')['calls'] == 2
+        assert call('ping', socket_path=socket_path)['served'] == 2
+
+    def test_errors_reported(self, socket_path, start_daemon):
+        """Test that failures come back as DaemonError and the daemon keeps serving"""
+        from skill_daemon import DaemonError, call
+
+        def fail():
+            raise ValueError("no such skill")
+
+        start_daemon({'fail': fail})
+
+        with pytest.raises(DaemonError, match="ValueError: no such skill"):
+            call('fail', socket_path=socket_path)
+        with pytest.raises(DaemonError, match="Unknown operation"):
+            call('missing', socket_path=socket_path)
+        with pytest.raises(DaemonError, match="unexpected keyword"):
+            call('fail', socket_path=socket_path, extra=1)
+        assert call('ping', socket_path=socket_path)['served'] == 2
+
+    def test_unavailable_and_stale_socket(self, socket_path, start_daemon):
+        """Test the client without a daemon, and a restart over a leftover socket file"""
+        import socket
+        from skill_daemon import DaemonError, DaemonUnavailable, call
+
+        with pytest.raises(DaemonUnavailable):
+            call('ping', socket_path=socket_path)
+
+        # A bound but never served socket, as left by a killed daemon
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(socket_path))
+        stale.close()
+
+        start_daemon({})
+        assert call('ping', socket_path=socket_path)['operations'] == []
+        assert oct(socket_path.stat().st_mode & 0o777) == oct(0o600)
+
+        with pytest.raises(DaemonError, match="already listening"):
+            start_daemon({})
+
+    def test_search_uses_refreshed_catalog(self, socket_path, start_daemon, tmp_path, monkeypatch):
+        """Test the search operation against a skills tree that changes while serving"""
+        import skill_catalog
+        import skill_index
+        from skill_daemon import call
+
+        root = tmp_path / 'skills'
+        (root / 'pdf').mkdir(parents=True)
+        (root / 'pdf' / 'SKILL.md').write_text("---\nname: pdf\ndescription: Compress PDF documents\n---\n")
+        monkeypatch.setenv('HAPPYCAPY_SKILLS_DIR', str(root))
+        monkeypatch.setenv('HAPPYCAPY_CACHE_DIR', str(tmp_path / 'cache'))
+        monkeypatch.delenv('AI_GATEWAY_API_KEY', raising=False)
+        monkeypatch.setattr(skill_catalog, '_catalogs', {})
+        monkeypatch.setattr(skill_index, '_index', None)
+
+        start_daemon()
+        assert [s['name'] for s in call('search', socket_path=socket_path, requirement='pdf')] == ['pdf']
+
+        (root / 'video').mkdir()
+        (root / 'video' / 'SKILL.md').write_text("---\nname: video\ndescription: Extract video frames\n---\n")
+
+        results = call('search', socket_path=socket_path, requirement='video frames')
+        assert results[0]['name'] == 'video'
+
+    def test_search_and_find_never_overlap(self, socket_path, start_daemon):
+        """Test that the two catalog operations share one lock"""
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from skill_daemon import call
+
+        running = []
+        overlaps = []
+
+        def catalog_op(requirement):
+            running.append(requirement)
+            if len(running) > 1:
+                overlaps.append(list(running))
+            time.sleep(0.01)
+            running.remove(requirement)
+            return requirement
+
+        start_daemon({'search': catalog_op, 'find': catalog_op, 'check': lambda: 'ok'})
+
+        ops = ['search', 'find'] * 8
+        with ThreadPoolExecutor(max_workers=len(ops)) as pool:
+            results = list(pool.map(
+                lambda i: call(ops[i], socket_path=socket_path, requirement=f'{ops[i]}-{i}'),
+                range(len(ops))))
+
+        assert results == [f'{op}-{i}' for i, op in enumerate(ops)]
+        assert overlaps == []
+
+    def test_parallel_search_and_find(self, socket_path, start_daemon, tmp_path, monkeypatch):
+        """Test real search and find requests fired in parallel while the tree changes"""
+        from concurrent.futures import ThreadPoolExecutor
+        import skill_catalog
+        import skill_index
+        from skill_daemon import call
+
+        root = tmp_path / 'skills'
+        installed = tmp_path / 'home' / '.claude' / 'skills'
+        for tree in (root, installed):
+            (tree / 'pdf').mkdir(parents=True)
+            (tree / 'pdf' / 'SKILL.md').write_text("---\nname: pdf\ndescription: Compress PDF documents\n---\n")
+        monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+        monkeypatch.setenv('HAPPYCAPY_SKILLS_DIR', str(root))
+        monkeypatch.setenv('HAPPYCAPY_CACHE_DIR', str(tmp_path / 'cache'))
+        monkeypatch.delenv('AI_GATEWAY_API_KEY', raising=False)
+        monkeypatch.setattr(skill_catalog, '_catalogs', {})
+        monkeypatch.setattr(skill_index, '_index', None)
+
+        start_daemon()
+
+        def request(i):
+            # Keep both catalogs changing so every refresh writes
+            for tree in (root, installed):
+                skill = tree / f'extra-{i}'
+                skill.mkdir()
+                (skill / 'SKILL.md').write_text(f"---\nname: extra-{i}\ndescription: Extra skill {i}\n---\n")
+            if i % 2:
+                return call('find', socket_path=socket_path, requirement='compress pdf documents')
+            return call('search', socket_path=socket_path, requirement='compress pdf documents')
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(request, range(16)))
+
+        for i, result in enumerate(results):
+            if i % 2:
+                assert result['name'] == 'pdf'
+            else:
+                assert result[0]['name'] == 'pdf'
+
+        names = {s['name'] for s in skill_catalog.load_catalog(root).skills()}
+        assert names == {'pdf'} | {f'extra-{i}' for i in range(16)}
+
+    def test_validate(self, socket_path, start_daemon, tmp_path, monkeypatch):
+        """Test skill-creator's quick_validate served by the daemon"""
+        from skill_daemon import call
+
+        root = tmp_path / 'skills'
+        for name, frontmatter in (('pdf', "name: pdf\ndescription: PDF tools"), ('bad', "name: Bad")):
+            (root / name).mkdir(parents=True)
+            (root / name / 'SKILL.md').write_text(f"---\n{frontmatter}\n---\n")
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+
+        start_daemon()
+        results = call('validate', socket_path=socket_path, path=str(root), tree=True)
+        assert results['pdf'] == []
+        assert "Missing 'description' in frontmatter" in results['bad']
+        assert call('validate', socket_path=socket_path, path=str(root / 'pdf')) == {'pdf': []}
+        assert list((tmp_path / 'cache').rglob('validate-*.json'))
+
+        # Our frontmatter module is back in place for the catalog
+        import frontmatter
+        assert hasattr(frontmatter, 'parse_frontmatter_block')
+
+    def test_client_paths_resolved_by_caller(self, tmp_path, monkeypatch, capsys):
+        """Test that package sends the caller's ./outputs, not the daemon's"""
+        import skill_daemon
+
+        sent = {}
+        monkeypatch.setattr(skill_daemon, 'call', lambda op, socket_path=None, **args: sent.update(args, op=op))
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(sys, 'argv', ['skill_daemon.py', 'package', 'my-skill', 'my-skill'])
+
+        skill_daemon.main()
+
+        assert sent['op'] == 'package'
+        assert sent['skill_path'] == str(tmp_path / 'my-skill')
+        assert sent['output_dir'] == str(tmp_path / 'outputs')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
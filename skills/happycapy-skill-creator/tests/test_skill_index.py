@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test cases for the local skill index
+
+Bug: Every search sent the whole catalog to the LLM
+Solution: Offline TF-IDF index with incremental updates; LLM only re-ranks
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+SKILLS = [
+    {'name': 'pdf', 'description': 'PDF manipulation toolkit for merging and compressing documents',
+     'tags': ['pdf', 'document']},
+    {'name': 'video-frames', 'description': 'Extract frames or short clips from videos using ffmpeg',
+     'tags': ['video', 'ffmpeg']},
+    {'name': 'image-enhancer', 'description': 'Improves the quality of images and screenshots',
+     'tags': ['image', 'quality']},
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    from skill_index import SkillIndex, TfidfBackend
+    return SkillIndex(path=tmp_path / 'index.json', backend=TfidfBackend())
+
+
+class TestSkillIndex:
+    """Test index search and persistence"""
+
+    def test_top_result_is_relevant(self, index):
+        """Test that the closest skill ranks first"""
+        index.update(SKILLS)
+
+        results = index.search("compress PDF files", top_k=2)
+        assert results[0][0] == 'pdf'
+        assert all(0 < score <= 1 for _, score in results)
+
+    def test_hyphenated_name_is_searchable(self, index):
+        """Test that skill names contribute to the document"""
+        index.update(SKILLS)
+
+        assert index.search("enhancer")[0][0] == 'image-enhancer'
+
+    def test_incremental_update(self, index):
+        """Test that only changed skills are re-embedded"""
+        assert index.update(SKILLS) == 3
+        assert index.update(SKILLS) == 0
+
+        changed = [dict(SKILLS[0], description='Split PDF pages')] + SKILLS[1:]
+        assert index.update(changed) == 1
+        assert index.update(changed[:2]) == 1
+
+    def test_index_persisted(self, index, tmp_path):
+        """Test that a reloaded index needs no re-embedding"""
+        from skill_index import SkillIndex, TfidfBackend
+
+        index.update(SKILLS)
+
+        reloaded = SkillIndex(path=tmp_path / 'index.json', backend=TfidfBackend())
+        assert reloaded.update(SKILLS) == 0
+        assert reloaded.search("video frames")[0][0] == 'video-frames'
+
+
+class TestSearchUsesIndex:
+    """Test that semantic search goes through the index"""
+
+    def test_offline_search_returns_index_scores(self, monkeypatch, tmp_path):
+        """Test that offline search returns cosine-ranked candidates"""
+        import skill_index
+        import semantic_search
+
+        monkeypatch.delenv('AI_GATEWAY_API_KEY', raising=False)
+        monkeypatch.setenv('HAPPYCAPY_CACHE_DIR', str(tmp_path))
+        monkeypatch.setattr(skill_index, '_index', None)
+        monkeypatch.setattr(semantic_search, 'get_available_skills', lambda: [dict(s) for s in SKILLS])
+
+        results = semantic_search.search_similar_skills("extract frames from a video")
+        assert results[0]['name'] == 'video-frames'
+        assert (tmp_path / 'skill_index.json').exists()
+
+    def test_no_candidates_never_prompts_whole_catalog(self, monkeypatch, tmp_path):
+        """Test that a query the index cannot match falls back to keywords, not the LLM"""
+        import skill_index
+        import semantic_search
+
+        monkeypatch.setenv('AI_GATEWAY_API_KEY', 'test-key')
+        monkeypatch.setenv('HAPPYCAPY_CACHE_DIR', str(tmp_path))
+        monkeypatch.setattr(skill_index, '_index', None)
+        monkeypatch.setattr(semantic_search, 'get_available_skills', lambda: [dict(s) for s in SKILLS])
+        monkeypatch.setattr(skill_index, 'retrieve_candidates', lambda query, skills, top_k=5: [])
+
+        def fail(requirement, skills):
+            raise AssertionError(f"LLM prompted with {len(skills)} skills")
+
+        monkeypatch.setattr(semantic_search, 'rank_skills_by_llm', fail)
+
+        results = semantic_search.search_similar_skills("ffmpeg clips")
+        assert [s['name'] for s in results] == ['video-frames']
+        assert semantic_search.search_similar_skills("quantum chromodynamics") == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test cases for the sandboxed skill test stage
+
+Bug: test_skill_basic only compiled scripts one by one and stopped at the
+     first syntax error; scripts that crash on import were packaged
+Solution: Parallel compile reporting every error, sandboxed subprocess
+          imports with time and memory limits, bundled tests run with
+          pytest, results cached by content hash
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+@pytest.fixture
+def skill(tmp_path):
+    path = tmp_path / 'pdf'
+    (path / 'scripts').mkdir(parents=True)
+    (path / 'SKILL.md').write_text("---\nname: pdf\n---\n")
+    (path / 'scripts' / 'helpers.py').write_text("def double(x):\n    return 2 * x\n")
+    (path / 'scripts' / 'main.py').write_text(
+        "from helpers import double\n\n\nif __name__ == '__main__':\n    raise SystemExit('must not run')\n")
+    return path
+
+
+class TestCompileAndImport:
+    """Test the compile and import stages"""
+
+    def test_clean_skill_passes(self, skill):
+        """Test that a working skill passes and CLI entry points are not run"""
+        from test_skill import test_skill_basic
+
+        result = test_skill_basic(skill)
+
+        assert result['success'], result['errors']
+        assert result['stats']['compiled'] == 2
+        assert result['stats']['imported'] == 2
+
+    def test_reports_every_error(self, skill):
+        """Test that all syntax and import errors are reported, not just the first"""
+        from test_skill import test_skill_basic
+
+        (skill / 'scripts' / 'a_broken.py').write_text("def f(:\n")
+        (skill / 'scripts' / 'b_broken.py').write_text("x = = 1\n")
+        (skill / 'scripts' / 'c_crash.py').write_text("raise RuntimeError('boom at import')\n")
+        (skill / 'scripts' / 'd_missing.py').write_text("import module_that_does_not_exist\n")
+
+        result = test_skill_basic(skill)
+
+        assert not result['success']
+        assert len(result['errors']) == 4
+        assert any('a_broken.py' in e and 'Syntax' in e for e in result['errors'])
+        assert any('b_broken.py' in e for e in result['errors'])
+        assert any('c_crash.py' in e and 'boom at import' in e for e in result['errors'])
+        assert any('d_missing.py' in e and 'ModuleNotFoundError' in e for e in result['errors'])
+        assert result['error'] == result['errors'][0]
+
+    def test_declared_dependency_is_warning(self, skill):
+        """Test that a missing package listed in requirements.txt only warns"""
+        from test_skill import test_skill_basic
+
+        (skill / 'requirements.txt').write_text("some-uninstalled-package>=1.0\n")
+        (skill / 'scripts' / 'uses_dep.py').write_text("import some_uninstalled_package\n")
+
+        result = test_skill_basic(skill)
+
+        assert result['success'], result['errors']
+        assert any('some_uninstalled_package' in w for w in result['warnings'])
+
+    def test_import_timeout(self, skill):
+        """Test that runaway top-level code is killed"""
+        from test_skill import import_script
+
+        script = skill / 'scripts' / 'hang.py'
+        script.write_text("import time\ntime.sleep(30)\n")
+
+        result = import_script(script, timeout=0.5)
+
+        assert result['timeout'] is True
+
+    def test_memory_limit(self, skill, monkeypatch):
+        """Test that imports run under an address-space limit"""
+        import test_skill
+
+        pytest.importorskip('resource')
+        monkeypatch.setattr(test_skill, 'MEMORY_LIMIT_BYTES', 512 * 1024 ** 2)
+        script = skill / 'scripts' / 'greedy.py'
+        script.write_text("data = bytearray(1024 ** 3)\n")
+
+        result = test_skill.import_script(script)
+
+        assert 'MemoryError' in result['error']
+
+    def test_missing_structure(self, tmp_path):
+        """Test the structure check"""
+        from test_skill import test_skill_basic
+
+        result = test_skill_basic(tmp_path)
+
+        assert result['success'] is False
+        assert result['error'] == 'Missing required: SKILL.md'
+
+
+class TestBundledTestsAndCache:
+    """Test running the skill's own tests and the result cache"""
+
+    def test_bundled_tests_run(self, skill):
+        """Test that failing bundled tests fail the stage"""
+        from test_skill import test_skill_basic
+
+        (skill / 'tests').mkdir()
+        (skill / 'tests' / 'test_ok.py').write_text(
+            "from helpers import double\n\ndef test_double():\n    assert double(2) == 4\n")
+        (skill / 'tests' / 'test_bad.py').write_text(
+            "from helpers import double\n\ndef test_double():\n    assert double(2) == 5\n")
+
+        result = test_skill_basic(skill)
+
+        assert result['stats']['tests'] == 2
+        assert len(result['errors']) == 1
+        assert 'tests/test_bad.py' in result['errors'][0]
+
+    def test_results_cached_by_hash(self, skill, tmp_path, monkeypatch):
+        """Test that unchanged files are not re-imported, changed ones are"""
+        import test_skill
+
+        test_skill.test_skill_basic(skill, cache_dir=tmp_path)
+
+        calls = []
+        real_import = test_skill.import_script
+        monkeypatch.setattr(test_skill, 'import_script', lambda s: calls.append(s.name) or real_import(s))
+
+        second = test_skill.test_skill_basic(skill, cache_dir=tmp_path)
+        assert calls == []
+        assert second['stats']['cached'] == 4
+
+        (skill / 'scripts' / 'helpers.py').write_text("def double(x):\n    return x + x\n")
+        test_skill.test_skill_basic(skill, cache_dir=tmp_path)
+
+        # Changing a script invalidates imports of every script that could import it
+        assert sorted(calls) == ['helpers.py', 'main.py']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Test cases for configurable skill sources
+
+Bug: clone_skill_from_repo only knew the GitHub URL and produced an empty
+     template when offline, re-copying every file on each clone
+Solution: Directory, .skill archive and git sources tried in priority
+          order, with incremental copies into the workspace
+"""
+
+import os
+import subprocess
+import zipfile
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+@pytest.fixture
+def skills_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('HAPPYCAPY_CACHE_DIR', str(tmp_path / 'cache'))
+    root = tmp_path / 'skills'
+    (root / 'pdf' / 'scripts').mkdir(parents=True)
+    (root / 'pdf' / 'SKILL.md').write_text("---\nname: pdf\n---\n")
+    (root / 'pdf' / 'scripts' / 'run.py').write_text("print('pdf')\n")
+    (root / 'pdf' / 'scripts' / 'run.py').chmod(0o755)
+    return root
+
+
+def make_archive(skill_dir: Path, archive: Path):
+    """Archive laid out like package_skill output"""
+    with zipfile.ZipFile(archive, 'w') as zf:
+        for path in sorted(skill_dir.rglob('*')):
+            if path.is_file():
+                zf.write(path, path.relative_to(skill_dir.parent))
+    return archive
+
+
+class TestSources:
+    """Test each source kind"""
+
+    def test_directory_source_incremental(self, skills_dir, tmp_path):
+        """Test that a second sync only copies what changed"""
+        from skill_sources import DirectorySource
+
+        source = DirectorySource(skills_dir)
+        target = tmp_path / 'workspace' / 'pdf'
+
+        first = source.fetch({'name': 'pdf'}, target)
+        assert first == {'copied': 2, 'skipped': 0, 'removed': 0}
+
+        (target / 'scripts' / 'run.py').write_text("print('edited in workspace')\n")
+        (target / 'scripts' / 'extra.py').write_text("x = 1\n")
+
+        second = source.fetch({'name': 'pdf'}, target)
+        assert second == {'copied': 1, 'skipped': 1, 'removed': 1}
+        assert (target / 'scripts' / 'run.py').read_text() == "print('pdf')\n"
+        assert os.access(target / 'scripts' / 'run.py', os.X_OK)
+
+    def test_directory_source_uses_repo_path(self, skills_dir, tmp_path):
+        """Test that the directory name from repo_path is tried first"""
+        from skill_sources import DirectorySource
+
+        source = DirectorySource(skills_dir)
+        assert source.locate({'name': 'PDF tools', 'repo_path': 'skills/pdf'}) == skills_dir / 'pdf'
+        assert source.locate({'name': 'docx'}) is None
+
+    def test_archive_source(self, skills_dir, tmp_path):
+        """Test cloning from a .skill archive, incrementally"""
+        from skill_sources import ArchiveSource
+
+        archive = make_archive(skills_dir / 'pdf', tmp_path / 'pdf.skill')
+        target = tmp_path / 'workspace' / 'pdf'
+
+        assert ArchiveSource(archive).fetch({'name': 'pdf'}, target)['copied'] == 2
+        assert (target / 'scripts' / 'run.py').read_text() == "print('pdf')\n"
+        assert os.access(target / 'scripts' / 'run.py', os.X_OK)
+
+        # A directory of archives works too, and unchanged files are skipped
+        stats = ArchiveSource(tmp_path).fetch({'name': 'pdf'}, target)
+        assert stats == {'copied': 0, 'skipped': 2, 'removed': 0}
+
+    def test_archive_edit_with_pinned_dates(self, skills_dir, tmp_path):
+        """Test that a same-size edit is copied although package_skill pins entry dates"""
+        from package_skill import package_skill
+        from skill_sources import ArchiveSource
+
+        run = skills_dir / 'pdf' / 'scripts' / 'run.py'
+        out = tmp_path / 'out'
+        target = tmp_path / 'workspace' / 'pdf'
+
+        archive = package_skill(skills_dir / 'pdf', 'pdf', output_dir=out)
+        assert ArchiveSource(archive).fetch({'name': 'pdf'}, target)['copied'] == 2
+
+        run.write_text("print('PDF')\n")
+        archive = package_skill(skills_dir / 'pdf', 'pdf', output_dir=out, force=True)
+
+        stats = ArchiveSource(archive).fetch({'name': 'pdf'}, target)
+        assert stats == {'copied': 1, 'skipped': 1, 'removed': 0}
+        assert (target / 'scripts' / 'run.py').read_text() == "print('PDF')\n"
+
+    def test_git_source(self, skills_dir, tmp_path, monkeypatch):
+        """Test cloning from a local git repository"""
+        from skill_sources import GitSource
+
+        for var in ('GIT_AUTHOR_NAME', 'GIT_COMMITTER_NAME'):
+            monkeypatch.setenv(var, 'test')
+        for var in ('GIT_AUTHOR_EMAIL', 'GIT_COMMITTER_EMAIL'):
+            monkeypatch.setenv(var, 'test@example.com')
+
+        repo = tmp_path / 'repo'
+        (repo / 'skills').mkdir(parents=True)
+        subprocess.run(['cp', '-r', str(skills_dir / 'pdf'), str(repo / 'skills')], check=True)
+        for args in (['init', '-q'], ['add', '.'], ['commit', '-q', '-m', 'init']):
+            subprocess.run(['git', *args], cwd=repo, check=True, capture_output=True)
+
+        target = tmp_path / 'workspace' / 'pdf'
+        stats = GitSource(str(repo)).fetch({'name': 'pdf', 'repo_path': 'skills/pdf'}, target)
+
+        assert stats['copied'] == 2
+        assert (target / 'SKILL.md').exists()
+
+    def test_parse_source(self, tmp_path):
+        """Test kind detection for config entries"""
+        from skill_sources import parse_source, ArchiveSource, DirectorySource, GitSource
+
+        assert isinstance(parse_source(str(tmp_path / 'a.skill')), ArchiveSource)
+        assert isinstance(parse_source(f"archive:{tmp_path}"), ArchiveSource)
+        assert isinstance(parse_source(str(tmp_path)), DirectorySource)
+        assert isinstance(parse_source("https://example.com/skills.git"), GitSource)
+
+
+class TestCloneSkill:
+    """Test clone_skill_from_repo over a source list"""
+
+    def test_priority_order(self, skills_dir, tmp_path):
+        """Test that the first source holding the skill wins"""
+        from clone_skill import clone_skill_from_repo
+        from skill_sources import DirectorySource
+
+        empty = tmp_path / 'empty'
+        empty.mkdir()
+
+        path = clone_skill_from_repo({'name': 'pdf'}, tmp_path / 'workspace',
+                                     sources=[DirectorySource(empty), DirectorySource(skills_dir)])
+
+        assert (path / 'scripts' / 'run.py').read_text() == "print('pdf')\n"
+
+    def test_failing_source_skipped(self, skills_dir, tmp_path):
+        """Test that a broken source does not stop the search"""
+        from clone_skill import clone_skill_from_repo
+        from skill_sources import ArchiveSource, DirectorySource
+
+        broken = tmp_path / 'pdf.skill'
+        broken.write_text("not a zip")
+
+        path = clone_skill_from_repo({'name': 'pdf'}, tmp_path / 'workspace',
+                                     sources=[ArchiveSource(broken), DirectorySource(skills_dir)])
+
+        assert (path / 'SKILL.md').exists()
+
+    def test_template_when_not_found(self, tmp_path):
+        """Test the template fallback when no source has the skill"""
+        from clone_skill import clone_skill_from_repo
+
+        path = clone_skill_from_repo({'name': 'pdf'}, tmp_path / 'workspace', sources=[])
+
+        assert (path / 'scripts' / 'pdf.py').exists()
+
+    def test_sources_from_environment(self, skills_dir, tmp_path, monkeypatch):
+        """Test HAPPYCAPY_SKILL_SOURCES configuration"""
+        from clone_skill import clone_skill_from_repo
+
+        monkeypatch.setenv('HAPPYCAPY_SKILL_SOURCES', ','.join([str(tmp_path / 'none'), str(skills_dir)]))
+
+        path = clone_skill_from_repo({'name': 'pdf'}, tmp_path / 'workspace')
+
+        assert (path / 'scripts' / 'run.py').exists()
+
+    def test_kind_prefixed_and_url_entries(self, monkeypatch):
+        """Test that kind prefixes and URLs are not split apart"""
+        from skill_sources import configured_sources
+
+        monkeypatch.setenv('HAPPYCAPY_SKILL_SOURCES',
+                           'dir:/opt/skills, https://github.com/anthropics/skills.git\narchive:/srv/pdf.skill')
+
+        assert [str(s) for s in configured_sources()] == [
+            'dir:/opt/skills',
+            'git:https://github.com/anthropics/skills.git',
+            'archive:/srv/pdf.skill',
+        ]
+
+    def test_kind_prefixed_git_url(self, monkeypatch):
+        """Test an explicit git: prefix in front of an https URL"""
+        from skill_sources import configured_sources
+
+        monkeypatch.setenv('HAPPYCAPY_SKILL_SOURCES', 'git:https://example.com/skills.git,/opt/skills')
+
+        assert [str(s) for s in configured_sources()] == [
+            'git:https://example.com/skills.git', 'dir:/opt/skills',
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test cases for SSE streaming
+
+Bug: stream_prompt dropped multi-line SSE events and parsed tiny line chunks
+Solution: Incremental SSE decoder fed with large chunks
+"""
+
+import asyncio
+import json
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+def _delta(text):
+    return json.dumps({'choices': [{'delta': {'content': text}}]})
+
+
+class FakeStreamResponse:
+    """Minimal stand-in for a streaming requests.Response"""
+
+    def __init__(self, body: bytes, chunk_size: int = 7):
+        self.body = body
+        self.split = chunk_size
+        self.closed = False
+
+    def iter_content(self, chunk_size=None):
+        for i in range(0, len(self.body), self.split):
+            yield self.body[i:i + self.split]
+
+    def close(self):
+        self.closed = True
+
+
+class TestSSEDecoder:
+    """Test the incremental SSE decoder"""
+
+    def test_events_split_across_chunks(self):
+        """Test that events survive arbitrary chunk boundaries"""
+        from ai_gateway import iter_sse_events
+
+        body = b'data: one\n\ndata: two\n\n'
+        chunks = [body[i:i + 3] for i in range(0, len(body), 3)]
+
+        events = list(iter_sse_events(chunks))
+        assert [e['data'] for e in events] == ['one', 'two']
+
+    def test_multiline_data_is_joined(self):
+        """Test that multiple data fields form one event"""
+        from ai_gateway import iter_sse_events
+
+        events = list(iter_sse_events([b'data: first\ndata: second\n\n']))
+        assert len(events) == 1
+        assert events[0]['data'] == 'first\nsecond'
+
+    def test_comments_and_fields(self):
+        """Test that comments are ignored and event/id fields are kept"""
+        from ai_gateway import iter_sse_events
+
+        body = b': keep-alive\r\nevent: delta\r\nid: 7\r\ndata: x\r\n\r\n'
+        events = list(iter_sse_events([body[:14], body[14:]]))
+        assert events == [{'event': 'delta', 'data': 'x', 'id': '7'}]
+
+    def test_crlf_split_between_chunks(self):
+        """Test that a CRLF split across chunks is a single line ending"""
+        from ai_gateway import iter_sse_events
+
+        events = list(iter_sse_events([b'data: a\r', b'\n\r\ndata: b\r\n\r\n']))
+        assert [e['data'] for e in events] == ['a', 'b']
+
+    def test_unterminated_event_flushed(self):
+        """Test that a trailing event without blank line is still emitted"""
+        from ai_gateway import iter_sse_events
+
+        events = list(iter_sse_events([b'data: tail']))
+        assert [e['data'] for e in events] == ['tail']
+
+    def test_utf8_split_across_chunks(self):
+        """Test that multi-byte characters split across chunks decode correctly"""
+        from ai_gateway import iter_sse_events
+
+        body = 'data: 技能\n\n'.encode('utf-8')
+        chunks = [body[i:i + 1] for i in range(len(body))]
+        events = list(iter_sse_events(chunks))
+        assert events[0]['data'] == '技能'
+
+
+class TestStreamPrompt:
+    """Test stream_prompt end to end with a fake response"""
+
+    def _client(self, monkeypatch, body):
+        from ai_gateway import AIGatewayClient
+
+        monkeypatch.setenv('AI_GATEWAY_API_KEY', 'test-key')
+        client = AIGatewayClient()
+        response = FakeStreamResponse(body)
+        monkeypatch.setattr(client, 'chat_completion', lambda **kwargs: response)
+        return client, response
+
+    def test_yields_deltas_until_done(self, monkeypatch):
+        """Test that deltas are yielded in order and [DONE] stops the stream"""
+        body = (
+            f'data: {_delta("Hello")}\n\n'
+            ': ping\n\n'
+            f'data: {_delta(", world")}\n\n'
+            'data: [DONE]\n\n'
+            f'data: {_delta("ignored")}\n\n'
+        ).encode('utf-8')
+        client, response = self._client(monkeypatch, body)
+
+        assert list(client.stream_prompt("hi")) == ['Hello', ', world']
+        assert response.closed
+
+    def test_async_variant(self, monkeypatch):
+        """Test that astream_prompt yields the same deltas"""
+        body = f'data: {_delta("a")}\n\ndata: {_delta("b")}\n\ndata: [DONE]\n\n'.encode('utf-8')
+        client, _ = self._client(monkeypatch, body)
+
+        async def collect():
+            return [chunk async for chunk in client.astream_prompt("hi")]
+
+        assert asyncio.run(collect()) == ['a', 'b']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
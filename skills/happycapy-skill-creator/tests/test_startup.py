@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test cases for CLI startup cost
+
+Bug: create_skill.py imported every pipeline module (and through them
+     requests, PyYAML, AST analysis) before parsing its arguments, so even
+     `--help` paid for the whole stack
+Solution: Pipeline modules are imported on first call, requests and PyYAML
+          on first use; startup is measured with `python -X importtime`
+"""
+
+import subprocess
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
+
+# A --help run may spend at most this share of the import time of loading
+# every step module and dependency up front, measured in the same run (lazy
+# imports measure about a quarter of it here). A ratio, not a wall-clock
+# budget, so a slow or loaded machine does not fail the test.
+IMPORT_BUDGET_RATIO = 0.5
+
+# What create_skill.py would import without its lazy stand-ins
+EAGER_IMPORTS = (
+    'import create_skill, semantic_search, find_skills_integration, clone_skill, '
+    'search_implementation, integrate_feature, check_compatibility, auto_fix_improved, '
+    'test_skill, package_skill, requests, yaml'
+)
+
+# Never needed to print help or a version
+HEAVY_MODULES = {
+    'requests', 'urllib3', 'yaml', 'asyncio',
+    'ai_gateway', 'integrate_feature', 'check_compatibility', 'auto_fix_improved',
+    'clone_skill', 'semantic_search', 'test_skill', 'package_skill',
+}
+
+
+def import_profile(*args):
+    """({module: cumulative us} of top-level imports after site, all module names)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        capture_output=True, text=True, cwd=SCRIPTS_DIR, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+
+    top_level = {}
+    names = set()
+    after_site = False
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        names.add(name.strip())
+        if name.strip() == 'site' and not name.startswith('  '):
+            after_site = True
+        elif after_site and not name[1:].startswith(' '):
+            top_level[name.strip()] = int(cumulative)
+    return top_level, names
+
+
+class TestStartup:
+    """Test what the CLIs import before doing any work"""
+
+    @pytest.mark.parametrize('flag', ['--help', '--version'])
+    def test_create_skill_skips_heavy_modules(self, flag):
+        """Test that help and version output load no pipeline or HTTP modules"""
+        _, names = import_profile('create_skill.py', flag)
+
+        assert not names & HEAVY_MODULES
+
+    def test_create_skill_import_budget(self):
+        """Test `create_skill.py --help` import time against importing everything up front"""
+        # Best of three each, interleaved, to keep scheduler noise out of the comparison
+        lazy, eager = [], []
+        for _ in range(3):
+            lazy.append(sum(import_profile('create_skill.py', '--help')[0].values()))
+            eager.append(sum(import_profile('-c', EAGER_IMPORTS)[0].values()))
+
+        assert min(lazy) < min(eager) * IMPORT_BUDGET_RATIO
+
+    def test_library_modules_defer_dependencies(self):
+        """Test that importing ai_gateway / frontmatter loads neither requests nor PyYAML"""
+        _, names = import_profile('-c', 'import ai_gateway, frontmatter, skill_catalog')
+
+        assert not names & {'requests', 'urllib3', 'yaml', 'asyncio'}
+
+    def test_lazy_steps_resolve(self):
+        """Test that create_skill's stand-ins call the real functions"""
+        import create_skill
+
+        assert create_skill.search_feature_implementation('compress')['source']
+        assert create_skill.package_skill.__name__ == 'package_skill'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Bounded SKILL.md frontmatter reader
+
+Reads only the leading `---` block of a file, line by line, and stops at
+the closing `---` (or after MAX_FRONTMATTER_BYTES), so large skill docs
+cost a few KB of I/O. Results are memoized by (path, mtime, size), and
+YAML is parsed with the C loader (CSafeLoader) when PyYAML was built
+with libyaml. PyYAML is imported on first parse, so runs answered from
+the validation cache never load it.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+# Frontmatter is a few lines; anything bigger is not frontmatter
+MAX_FRONTMATTER_BYTES = 64 * 1024
+
+MEMO_SIZE = 4096
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+# (yaml module, loader) once imported
+_yaml = None
+
+
+class FrontmatterError(ValueError):
+    """The file opens a frontmatter block that is not closed (or is too big)"""
+
+
+def _read_block(path, max_bytes):
+    with open(path, 'rb') as f:
+        first = f.readline(max_bytes)
+        if first.startswith(b'\xef\xbb\xbf'):
+            first = first[3:]
+        if not first.startswith(b'---'):
+            return None
+        if first.rstrip() != b'---':
+            raise FrontmatterError("Opening '---' line has trailing text")
+
+        lines = []
+        used = len(first)
+        while used < max_bytes:
+            line = f.readline(max_bytes - used)
+            if not line:
+                raise FrontmatterError("Frontmatter is not closed with '---'")
+            used += len(line)
+            if line.rstrip() == b'---':
+                return b''.join(lines).decode('utf-8', errors='replace').rstrip('\r\n')
+            lines.append(line)
+
+    raise FrontmatterError(f"Frontmatter is larger than {max_bytes} bytes")
+
+
+def read_frontmatter_text(path, max_bytes=MAX_FRONTMATTER_BYTES):
+    """
+    Text between the leading `---` lines of a file
+
+    Returns:
+        The frontmatter text, or None if the file does not start with `---`
+
+    Raises:
+        FrontmatterError: the block is not closed within max_bytes
+        OSError: the file cannot be read
+    """
+    path = os.fspath(path)
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            result = _memo[key]
+            if isinstance(result, FrontmatterError):
+                raise FrontmatterError(str(result))
+            return result
+
+    try:
+        result = _read_block(path, max_bytes)
+    except FrontmatterError as e:
+        result = e
+
+    with _memo_lock:
+        _memo[key] = result
+        if len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+
+    if isinstance(result, FrontmatterError):
+        raise result
+    return result
+
+
+def yaml_loader():
+    """(yaml module, fastest safe loader), imported on first use"""
+    global _yaml
+    if _yaml is None:
+        import yaml
+        _yaml = (yaml, getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+    return _yaml
+
+
+def load_yaml(text):
+    """Parse YAML with the fastest safe loader available"""
+    yaml, loader = yaml_loader()
+    return yaml.load(text, Loader=loader)
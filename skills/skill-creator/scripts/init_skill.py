@@ -1,203 +1,51 @@
 #!/usr/bin/env python3
 """
-Skill Initializer - Creates a new skill from template
+Skill Initializer - Creates new skills from a template bundle
 
 Usage:
-    init_skill.py <skill-name> --path <path>
+    init_skill.py <skill-name> --path <path> [--bundle <dir-or-zip>]
+    init_skill.py --manifest <skills.json|skills.yaml> --path <path> [--bundle <dir-or-zip>]
 
 Examples:
     init_skill.py my-new-skill --path skills/public
     init_skill.py my-api-helper --path skills/private
     init_skill.py custom-skill --path /custom/location
-"""
-
-import sys
-from pathlib import Path
-
-
-SKILL_TEMPLATE = """---
-name: {skill_name}
-description: [TODO: Complete and informative explanation of what the skill does and when to use it. Include WHEN to use this skill - specific scenarios, file types, or tasks that trigger it.]
----
-
-# {skill_title}
-
-## Overview
-
-[TODO: 1-2 sentences explaining what this skill enables]
-
-## Structuring This Skill
-
-[TODO: Choose the structure that best fits this skill's purpose. Common patterns:
-
-**1. Workflow-Based** (best for sequential processes)
-- Works well when there are clear step-by-step procedures
-- Example: DOCX skill with "Workflow Decision Tree" → "Reading" → "Creating" → "Editing"
-- Structure: ## Overview → ## Workflow Decision Tree → ## Step 1 → ## Step 2...
-
-**2. Task-Based** (best for tool collections)
-- Works well when the skill offers different operations/capabilities
-- Example: PDF skill with "Quick Start" → "Merge PDFs" → "Split PDFs" → "Extract Text"
-- Structure: ## Overview → ## Quick Start → ## Task Category 1 → ## Task Category 2...
-
-**3. Reference/Guidelines** (best for standards or specifications)
-- Works well for brand guidelines, coding standards, or requirements
-- Example: Brand styling with "Brand Guidelines" → "Colors" → "Typography" → "Features"
-- Structure: ## Overview → ## Guidelines → ## Specifications → ## Usage...
-
-**4. Capabilities-Based** (best for integrated systems)
-- Works well when the skill provides multiple interrelated features
-- Example: Product Management with "Core Capabilities" → numbered capability list
-- Structure: ## Overview → ## Core Capabilities → ### 1. Feature → ### 2. Feature...
-
-Patterns can be mixed and matched as needed. Most skills combine patterns (e.g., start with task-based, add workflow for complex operations).
-
-Delete this entire "Structuring This Skill" section when done - it's just guidance.]
-
-## [TODO: Replace with the first main section based on chosen structure]
-
-[TODO: Add content here. See examples in existing skills:
-- Code samples for technical skills
-- Decision trees for complex workflows
-- Concrete examples with realistic user requests
-- References to scripts/templates/references as needed]
-
-## Resources
-
-This skill includes example resource directories that demonstrate how to organize different types of bundled resources:
-
-### scripts/
-Executable code (Python/Bash/etc.) that can be run directly to perform specific operations.
-
-**Examples from other skills:**
-- PDF skill: `fill_fillable_fields.py`, `extract_form_field_info.py` - utilities for PDF manipulation
-- DOCX skill: `document.py`, `utilities.py` - Python modules for document processing
+    init_skill.py --manifest family.json --path skills/public
 
-**Appropriate for:** Python scripts, shell scripts, or any executable code that performs automation, data processing, or specific operations.
+Templates come from assets/templates/default unless --bundle names another
+bundle (see scaffold.py). A manifest creates a whole family of skills in
+one run:
 
-**Note:** Scripts may be executed without loading into context, but can still be read by Claude for patching or environment adjustments.
+    {"bundle": "templates/house-style",
+     "defaults": {"license": "MIT"},
+     "skills": ["pdf-merge", {"name": "pdf-split", "description": "Split PDF files"}]}
 
-### references/
-Documentation and reference material intended to be loaded into context to inform Claude's process and thinking.
-
-**Examples from other skills:**
-- Product management: `communication.md`, `context_building.md` - detailed workflow guides
-- BigQuery: API reference documentation and query examples
-- Finance: Schema documentation, company policies
-
-**Appropriate for:** In-depth documentation, API references, database schemas, comprehensive guides, or any detailed information that Claude should reference while working.
-
-### assets/
-Files not intended to be loaded into context, but rather used within the output Claude produces.
-
-**Examples from other skills:**
-- Brand styling: PowerPoint template files (.pptx), logo files
-- Frontend builder: HTML/React boilerplate project directories
-- Typography: Font files (.ttf, .woff2)
-
-**Appropriate for:** Templates, boilerplate code, document templates, images, icons, fonts, or any files meant to be copied or used in the final output.
-
----
-
-**Any unneeded directories can be deleted.** Not every skill requires all three types of resources.
-"""
-
-EXAMPLE_SCRIPT = '''#!/usr/bin/env python3
-"""
-Example helper script for {skill_name}
-
-This is a placeholder script that can be executed directly.
-Replace with actual implementation or delete if not needed.
-
-Example real scripts from other skills:
-- pdf/scripts/fill_fillable_fields.py - Fills PDF form fields
-- pdf/scripts/convert_pdf_to_images.py - Converts PDF pages to images
+"bundle" is relative to the manifest; "defaults" are template variables
+for every skill.
 """
 
-def main():
-    print("This is an example script for {skill_name}")
-    # TODO: Add actual script logic here
-    # This could be data processing, file conversion, API calls, etc.
-
-if __name__ == "__main__":
-    main()
-'''
-
-EXAMPLE_REFERENCE = """# Reference Documentation for {skill_title}
-
-This is a placeholder for detailed reference documentation.
-Replace with actual reference content or delete if not needed.
-
-Example real reference docs from other skills:
-- product-management/references/communication.md - Comprehensive guide for status updates
-- product-management/references/context_building.md - Deep-dive on gathering context
-- bigquery/references/ - API references and query examples
-
-## When Reference Docs Are Useful
-
-Reference docs are ideal for:
-- Comprehensive API documentation
-- Detailed workflow guides
-- Complex multi-step processes
-- Information too lengthy for main SKILL.md
-- Content that's only needed for specific use cases
-
-## Structure Suggestions
-
-### API Reference Example
-- Overview
-- Authentication
-- Endpoints with examples
-- Error codes
-- Rate limits
-
-### Workflow Guide Example
-- Prerequisites
-- Step-by-step instructions
-- Common patterns
-- Troubleshooting
-- Best practices
-"""
-
-EXAMPLE_ASSET = """# Example Asset File
-
-This placeholder represents where asset files would be stored.
-Replace with actual asset files (templates, images, fonts, etc.) or delete if not needed.
-
-Asset files are NOT intended to be loaded into context, but rather used within
-the output Claude produces.
-
-Example asset files from other skills:
-- Brand guidelines: logo.png, slides_template.pptx
-- Frontend builder: hello-world/ directory with HTML/React boilerplate
-- Typography: custom-font.ttf, font-family.woff2
-- Data: sample_data.csv, test_dataset.json
-
-## Common Asset Types
-
-- Templates: .pptx, .docx, boilerplate directories
-- Images: .png, .jpg, .svg, .gif
-- Fonts: .ttf, .otf, .woff, .woff2
-- Boilerplate code: Project directories, starter files
-- Icons: .ico, .svg
-- Data files: .csv, .json, .xml, .yaml
+import sys
+from pathlib import Path
 
-Note: This is a text placeholder. Actual assets can be any file type.
-"""
+from scaffold import BundleError, load_bundle, scaffold_skills, title_case_skill_name, write_skill
 
 
-def title_case_skill_name(skill_name):
-    """Convert hyphenated skill name to Title Case for display."""
-    return ' '.join(word.capitalize() for word in skill_name.split('-'))
+def print_next_steps():
+    print("\nNext steps:")
+    print("1. Edit SKILL.md to complete the TODO items and update the description")
+    print("2. Customize or delete the example files in scripts/, references/, and assets/")
+    print("3. Run the validator when ready to check the skill structure")
 
 
-def init_skill(skill_name, path):
+def init_skill(skill_name, path, bundle=None, variables=None):
     """
-    Initialize a new skill directory with template SKILL.md.
+    Initialize a new skill directory from a template bundle.
 
     Args:
         skill_name: Name of the skill
         path: Path where the skill directory should be created
+        bundle: Template bundle directory or archive (default: built-in bundle)
+        variables: Extra template variables, e.g. {'description': ...}
 
     Returns:
         Path to created skill directory, or None if error
@@ -210,88 +58,145 @@ def init_skill(skill_name, path):
         print(f"❌ Error: Skill directory already exists: {skill_dir}")
         return None
 
-    # Create skill directory
+    # Render every file first, then write the directory in one go
     try:
-        skill_dir.mkdir(parents=True, exist_ok=False)
-        print(f"✅ Created skill directory: {skill_dir}")
-    except Exception as e:
-        print(f"❌ Error creating directory: {e}")
+        template = load_bundle(bundle)
+        files = template.render(skill_name, variables)
+        write_skill(skill_dir, files)
+    except BundleError as e:
+        print(f"❌ Error: {e}")
         return None
-
-    # Create SKILL.md from template
-    skill_title = title_case_skill_name(skill_name)
-    skill_content = SKILL_TEMPLATE.format(
-        skill_name=skill_name,
-        skill_title=skill_title
-    )
-
-    skill_md_path = skill_dir / 'SKILL.md'
-    try:
-        skill_md_path.write_text(skill_content)
-        print("✅ Created SKILL.md")
-    except Exception as e:
-        print(f"❌ Error creating SKILL.md: {e}")
+    except OSError as e:
+        print(f"❌ Error creating skill: {e}")
         return None
 
-    # Create resource directories with example files
-    try:
-        # Create scripts/ directory with example script
-        scripts_dir = skill_dir / 'scripts'
-        scripts_dir.mkdir(exist_ok=True)
-        example_script = scripts_dir / 'example.py'
-        example_script.write_text(EXAMPLE_SCRIPT.format(skill_name=skill_name))
-        example_script.chmod(0o755)
-        print("✅ Created scripts/example.py")
-
-        # Create references/ directory with example reference doc
-        references_dir = skill_dir / 'references'
-        references_dir.mkdir(exist_ok=True)
-        example_reference = references_dir / 'api_reference.md'
-        example_reference.write_text(EXAMPLE_REFERENCE.format(skill_title=skill_title))
-        print("✅ Created references/api_reference.md")
-
-        # Create assets/ directory with example asset placeholder
-        assets_dir = skill_dir / 'assets'
-        assets_dir.mkdir(exist_ok=True)
-        example_asset = assets_dir / 'example_asset.txt'
-        example_asset.write_text(EXAMPLE_ASSET)
-        print("✅ Created assets/example_asset.txt")
-    except Exception as e:
-        print(f"❌ Error creating resource directories: {e}")
-        return None
+    print(f"✅ Created skill directory: {skill_dir} (template {template})")
+    for rel, (data, _) in sorted(files.items()):
+        if data is not None:
+            print(f"✅ Created {rel}")
 
     # Print next steps
     print(f"\n✅ Skill '{skill_name}' initialized successfully at {skill_dir}")
-    print("\nNext steps:")
-    print("1. Edit SKILL.md to complete the TODO items and update the description")
-    print("2. Customize or delete the example files in scripts/, references/, and assets/")
-    print("3. Run the validator when ready to check the skill structure")
+    print_next_steps()
 
     return skill_dir
 
 
-def main():
-    if len(sys.argv) < 4 or sys.argv[2] != '--path':
-        print("Usage: init_skill.py <skill-name> --path <path>")
-        print("\nSkill name requirements:")
-        print("  - Hyphen-case identifier (e.g., 'data-analyzer')")
-        print("  - Lowercase letters, digits, and hyphens only")
-        print("  - Max 40 characters")
-        print("  - Must match directory name exactly")
-        print("\nExamples:")
-        print("  init_skill.py my-new-skill --path skills/public")
-        print("  init_skill.py my-api-helper --path skills/private")
-        print("  init_skill.py custom-skill --path /custom/location")
-        sys.exit(1)
+def load_manifest(manifest_path):
+    """
+    Skill entries, template variables and bundle of a manifest file
 
-    skill_name = sys.argv[1]
-    path = sys.argv[3]
+    Returns:
+        (skills, bundle path or None); every skill is a dict with 'name'
+        and the variables it is rendered with
+    """
+    manifest_path = Path(manifest_path)
+    text = manifest_path.read_text()
+    if manifest_path.suffix in ('.yaml', '.yml'):
+        from frontmatter import load_yaml
+        manifest = load_yaml(text)
+    else:
+        import json
+        manifest = json.loads(text)
+
+    if isinstance(manifest, list):
+        manifest = {'skills': manifest}
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('skills'), list):
+        raise BundleError(f"{manifest_path}: expected a list of skills or a mapping with 'skills'")
+
+    defaults = manifest.get('defaults') or {}
+    skills = []
+    for entry in manifest['skills']:
+        if not isinstance(entry, dict):
+            entry = {'name': entry}
+        skills.append({**defaults, **entry})
+
+    bundle = manifest.get('bundle')
+    if bundle:
+        bundle = manifest_path.parent / bundle
+    return skills, bundle
+
+
+def init_skills_from_manifest(manifest_path, path, bundle=None, workers=None):
+    """
+    Initialize every skill listed in a manifest.
+
+    The whole batch is rendered before anything is written; skills whose
+    directory already exists are skipped.
+
+    Args:
+        manifest_path: JSON or YAML manifest (see module docstring)
+        path: Path where the skill directories should be created
+        bundle: Template bundle, overriding the manifest's
+        workers: Writer threads
+
+    Returns:
+        List of created skill directories, or None if error
+    """
+    try:
+        skills, manifest_bundle = load_manifest(manifest_path)
+        results = scaffold_skills(skills, path, bundle=bundle or manifest_bundle, workers=workers)
+    except (BundleError, OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return None
+
+    created = []
+    for name, skill_dir, is_new in results:
+        if is_new:
+            created.append(skill_dir)
+            print(f"✅ Created {name}")
+        else:
+            print(f"⏭️  Skipped {name} (already exists)")
+
+    print(f"\n✅ {len(created)} skill(s) initialized at {Path(path).resolve()}, "
+          f"{len(results) - len(created)} skipped")
+    if created:
+        print_next_steps()
+    return created
 
-    print(f"🚀 Initializing skill: {skill_name}")
-    print(f"   Location: {path}")
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Create a new skill (or a batch of skills) from a template bundle",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Skill name requirements:
+  - Hyphen-case identifier (e.g., 'data-analyzer')
+  - Lowercase letters, digits, and hyphens only
+  - Max 40 characters
+  - Must match directory name exactly
+
+Examples:
+  init_skill.py my-new-skill --path skills/public
+  init_skill.py my-api-helper --path skills/private
+  init_skill.py custom-skill --path /custom/location
+  init_skill.py --manifest family.json --path skills/public
+        """
+    )
+    parser.add_argument('skill_name', nargs='?', help="Name of the skill to create")
+    parser.add_argument('--path', required=True, help="Directory the skill is created in")
+    parser.add_argument('--bundle', help="Template bundle directory or .zip (default: assets/templates/default)")
+    parser.add_argument('--manifest', help="JSON/YAML file listing skills to create in one run")
+    parser.add_argument('--workers', type=int, default=None, help="Writer threads for --manifest")
+    args = parser.parse_args()
+
+    if bool(args.skill_name) == bool(args.manifest):
+        parser.error("give either a skill name or --manifest")
+
+    if args.manifest:
+        print(f"🚀 Initializing skills from: {args.manifest}")
+        print(f"   Location: {args.path}")
+        print()
+        result = init_skills_from_manifest(args.manifest, args.path, bundle=args.bundle, workers=args.workers)
+        sys.exit(0 if result is not None else 1)
+
+    print(f"🚀 Initializing skill: {args.skill_name}")
+    print(f"   Location: {args.path}")
     print()
 
-    result = init_skill(skill_name, path)
+    result = init_skill(args.skill_name, args.path, bundle=args.bundle)
 
     if result:
         sys.exit(0)
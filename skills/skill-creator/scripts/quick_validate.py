@@ -1,95 +1,325 @@
 #!/usr/bin/env python3
 """
 Quick validation script for skills - minimal version
+
+Usage:
+    python quick_validate.py <skill_directory>
+    python quick_validate.py --tree <skills_root> [--workers N] [--format text|json|junit] [--output FILE] [--no-cache]
+
+With --tree, every skill (directory holding a SKILL.md) under the root is
+validated in one process, in parallel, and every error of every skill is
+reported. Results are cached by SKILL.md stat and frontmatter hash, so
+unchanged skills are not validated again.
+
+Only the frontmatter block of SKILL.md is read (see frontmatter.py).
+PyYAML and the process pool are imported only when needed, so --help and
+fully cached tree runs start quickly.
 """
 
 import sys
 import os
 import re
-import yaml
+import json
+import hashlib
 from pathlib import Path
 
+from frontmatter import FrontmatterError, load_yaml, read_frontmatter_text, yaml_loader
+
+# Define allowed properties
+ALLOWED_PROPERTIES = {'name', 'description', 'license', 'allowed-tools', 'metadata'}
+
+# Directories never searched for skills
+SKIP_DIRS = {'.git', 'node_modules', '__pycache__', '.venv', 'venv'}
+
+# Below this many skills, a process pool costs more than it saves
+MIN_PARALLEL_SKILLS = 16
+
+CACHE_VERSION = 1
+
+
 def validate_skill(skill_path):
     """Basic validation of a skill"""
+    errors = collect_errors(skill_path)
+    if errors:
+        return False, errors[0]
+    return True, "Skill is valid!"
+
+
+def collect_errors(skill_path):
+    """All validation errors of a skill, in check order (empty if valid)"""
     skill_path = Path(skill_path)
 
     # Check SKILL.md exists
     skill_md = skill_path / 'SKILL.md'
     if not skill_md.exists():
-        return False, "SKILL.md not found"
+        return ["SKILL.md not found"]
+
+    # Read only the frontmatter block
+    try:
+        frontmatter_text = read_frontmatter_text(skill_md)
+    except FrontmatterError:
+        return ["Invalid frontmatter format"]
+    if frontmatter_text is None:
+        return ["No YAML frontmatter found"]
 
-    # Read and validate frontmatter
-    content = skill_md.read_text()
-    if not content.startswith('---'):
-        return False, "No YAML frontmatter found"
+    return frontmatter_errors(frontmatter_text)
 
-    # Extract frontmatter
-    match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-    if not match:
-        return False, "Invalid frontmatter format"
 
-    frontmatter_text = match.group(1)
+def frontmatter_errors(frontmatter_text):
+    """All validation errors of a frontmatter block"""
 
     # Parse YAML frontmatter
     try:
-        frontmatter = yaml.safe_load(frontmatter_text)
+        frontmatter = load_yaml(frontmatter_text)
         if not isinstance(frontmatter, dict):
-            return False, "Frontmatter must be a YAML dictionary"
-    except yaml.YAMLError as e:
-        return False, f"Invalid YAML in frontmatter: {e}"
+            return ["Frontmatter must be a YAML dictionary"]
+    except yaml_loader()[0].YAMLError as e:
+        return [f"Invalid YAML in frontmatter: {e}"]
 
-    # Define allowed properties
-    ALLOWED_PROPERTIES = {'name', 'description', 'license', 'allowed-tools', 'metadata'}
+    errors = []
 
     # Check for unexpected properties (excluding nested keys under metadata)
     unexpected_keys = set(frontmatter.keys()) - ALLOWED_PROPERTIES
     if unexpected_keys:
-        return False, (
+        errors.append(
             f"Unexpected key(s) in SKILL.md frontmatter: {', '.join(sorted(unexpected_keys))}. "
             f"Allowed properties are: {', '.join(sorted(ALLOWED_PROPERTIES))}"
         )
 
     # Check required fields
     if 'name' not in frontmatter:
-        return False, "Missing 'name' in frontmatter"
+        errors.append("Missing 'name' in frontmatter")
     if 'description' not in frontmatter:
-        return False, "Missing 'description' in frontmatter"
+        errors.append("Missing 'description' in frontmatter")
 
     # Extract name for validation
     name = frontmatter.get('name', '')
     if not isinstance(name, str):
-        return False, f"Name must be a string, got {type(name).__name__}"
+        errors.append(f"Name must be a string, got {type(name).__name__}")
+        name = ''
     name = name.strip()
     if name:
         # Check naming convention (hyphen-case: lowercase with hyphens)
         if not re.match(r'^[a-z0-9-]+$', name):
-            return False, f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)"
-        if name.startswith('-') or name.endswith('-') or '--' in name:
-            return False, f"Name '{name}' cannot start/end with hyphen or contain consecutive hyphens"
+            errors.append(f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)")
+        elif name.startswith('-') or name.endswith('-') or '--' in name:
+            errors.append(f"Name '{name}' cannot start/end with hyphen or contain consecutive hyphens")
         # Check name length (max 64 characters per spec)
         if len(name) > 64:
-            return False, f"Name is too long ({len(name)} characters). Maximum is 64 characters."
+            errors.append(f"Name is too long ({len(name)} characters). Maximum is 64 characters.")
 
     # Extract and validate description
     description = frontmatter.get('description', '')
     if not isinstance(description, str):
-        return False, f"Description must be a string, got {type(description).__name__}"
+        errors.append(f"Description must be a string, got {type(description).__name__}")
+        description = ''
     description = description.strip()
     if description:
         # Check for angle brackets
         if '<' in description or '>' in description:
-            return False, "Description cannot contain angle brackets (< or >)"
+            errors.append("Description cannot contain angle brackets (< or >)")
         # Check description length (max 1024 characters per spec)
         if len(description) > 1024:
-            return False, f"Description is too long ({len(description)} characters). Maximum is 1024 characters."
+            errors.append(f"Description is too long ({len(description)} characters). Maximum is 1024 characters.")
+
+    return errors
+
+
+def discover_skills(root):
+    """Directories under root that hold a SKILL.md, sorted (nested skills are not searched)"""
+    root = Path(root)
+    skills = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if 'SKILL.md' in filenames:
+            skills.append(Path(dirpath))
+            dirnames[:] = []
+            continue
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+    return sorted(skills)
+
+
+def default_cache_path(root):
+    """Per-tree cache file under the user cache directory"""
+    cache_home = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache')
+    key = hashlib.sha1(str(Path(root).resolve()).encode()).hexdigest()[:12]
+    return cache_home / 'skill-creator' / f'validate-{key}.json'
+
+
+def _rules_version():
+    """Cache entries are only valid for this exact version of the rules"""
+    digest = hashlib.sha1()
+    for name in ('quick_validate.py', 'frontmatter.py'):
+        digest.update((Path(__file__).parent / name).read_bytes())
+    return f"{CACHE_VERSION}:{digest.hexdigest()}"
+
+
+def _frontmatter_hash(skill_md):
+    """Hash of what validation looks at: the frontmatter block, or its absence"""
+    try:
+        text = read_frontmatter_text(skill_md)
+    except FrontmatterError as e:
+        text = f'\0invalid:{e}'
+    except OSError:
+        return None
+    return hashlib.sha1(('\0none' if text is None else text).encode()).hexdigest()
+
+
+def _validate_file(skill_md):
+    """(errors, frontmatter hash) for one SKILL.md; runs in worker processes"""
+    skill_md = Path(skill_md)
+    return collect_errors(skill_md.parent), _frontmatter_hash(skill_md)
+
+
+def validate_tree(root, workers=None, cache_path=None, use_cache=True):
+    """
+    Validate every skill under a directory tree
+
+    Args:
+        root: Directory to search for skills
+        workers: Worker processes (default: CPU count); 1 validates in-process
+        cache_path: Cache file (default: under ~/.cache/skill-creator)
+        use_cache: Reuse results of skills whose SKILL.md did not change
+
+    Returns:
+        {skill path relative to root: [errors]} in sorted order; an empty
+        list means the skill is valid
+    """
+    root = Path(root)
+    skills = discover_skills(root)
+
+    cache_file = Path(cache_path) if cache_path else default_cache_path(root)
+    version = _rules_version()
+    entries = {}
+    if use_cache:
+        try:
+            cache = json.loads(cache_file.read_text())
+            if cache.get('version') == version:
+                entries = cache.get('skills', {})
+        except (OSError, ValueError):
+            pass
+
+    results = {}
+    fresh = {}
+    todo = []
+    for skill in skills:
+        rel = skill.relative_to(root).as_posix() if skill != root else '.'
+        skill_md = skill / 'SKILL.md'
+        try:
+            st = skill_md.stat()
+        except OSError:
+            results[rel] = ["SKILL.md not found"]
+            continue
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = entries.get(rel)
+
+        # Same stat: trust it. Different stat, same frontmatter: refresh the stat only
+        if entry and (entry['stat'] == stamp or entry['hash'] == _frontmatter_hash(skill_md)):
+            results[rel] = entry['errors']
+            fresh[rel] = dict(entry, stat=stamp)
+        else:
+            results[rel] = None
+            todo.append((rel, skill_md, stamp))
+
+    workers = workers or os.cpu_count() or 1
+    paths = [str(skill_md) for _, skill_md, _ in todo]
+    if workers > 1 and len(todo) >= MIN_PARALLEL_SKILLS:
+        # multiprocessing is only worth importing when there is work to spread
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(_validate_file, paths, chunksize=max(1, len(paths) // (workers * 4))))
+    else:
+        outcomes = [_validate_file(path) for path in paths]
+
+    for (rel, _, stamp), (errors, digest) in zip(todo, outcomes):
+        results[rel] = errors
+        if digest:
+            fresh[rel] = {'stat': stamp, 'hash': digest, 'errors': errors}
+
+    if use_cache and fresh != entries:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f'.{cache_file.name}.{os.getpid()}.tmp')
+        tmp_file.write_text(json.dumps({'version': version, 'skills': fresh}))
+        os.replace(tmp_file, cache_file)
+
+    return results
+
+
+def format_json(results, root=None):
+    """Tree results as a JSON report"""
+    return json.dumps({
+        'root': str(root) if root is not None else None,
+        'total': len(results),
+        'failed': sum(1 for errors in results.values() if errors),
+        'skills': [
+            {'path': rel, 'valid': not errors, 'errors': errors}
+            for rel, errors in results.items()
+        ],
+    }, indent=2)
+
+
+def format_junit(results, suite_name='skills'):
+    """Tree results as JUnit XML, one test case per skill"""
+    import xml.etree.ElementTree as ET
+
+    suite = ET.Element('testsuite', {
+        'name': suite_name,
+        'tests': str(len(results)),
+        'failures': str(sum(1 for errors in results.values() if errors)),
+        'errors': '0',
+    })
+    for rel, errors in results.items():
+        case = ET.SubElement(suite, 'testcase', {'classname': suite_name, 'name': rel})
+        if errors:
+            failure = ET.SubElement(case, 'failure', {'message': errors[0]})
+            failure.text = '\n'.join(errors)
+    return ET.tostring(suite, encoding='unicode', xml_declaration=True)
+
+
+def format_text(results):
+    lines = []
+    for rel, errors in results.items():
+        if errors:
+            lines.append(f"❌ {rel}")
+            lines.extend(f"   - {error}" for error in errors)
+    failed = sum(1 for errors in results.values() if errors)
+    lines.append(f"{'❌' if failed else '✅'} {len(results) - failed}/{len(results)} skills valid")
+    return '\n'.join(lines)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate a skill, or every skill under a directory")
+    parser.add_argument('path', help="Skill directory, or skills root with --tree")
+    parser.add_argument('--tree', action='store_true', help="Validate every skill under path")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--format', choices=['text', 'json', 'junit'], default='text')
+    parser.add_argument('--output', help="Write the report to this file instead of stdout")
+    parser.add_argument('--cache', help="Cache file (default: under ~/.cache/skill-creator)")
+    parser.add_argument('--no-cache', action='store_true', help="Validate every skill again")
+    args = parser.parse_args()
+
+    if not args.tree:
+        valid, message = validate_skill(args.path)
+        print(message)
+        sys.exit(0 if valid else 1)
+
+    results = validate_tree(args.path, workers=args.workers, cache_path=args.cache,
+                            use_cache=not args.no_cache)
+    if args.format == 'json':
+        report = format_json(results, args.path)
+    elif args.format == 'junit':
+        report = format_junit(results)
+    else:
+        report = format_text(results)
+
+    if args.output:
+        Path(args.output).write_text(report + '\n')
+    else:
+        print(report)
+    sys.exit(1 if any(results.values()) else 0)
 
-    return True, "Skill is valid!"
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python quick_validate.py <skill_directory>")
-        sys.exit(1)
-    
-    valid, message = validate_skill(sys.argv[1])
-    print(message)
-    sys.exit(0 if valid else 1)
\ No newline at end of file
+    main()
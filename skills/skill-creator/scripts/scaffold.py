@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Template bundles for skill scaffolding
+
+A bundle is a directory, or a .zip archive of one, holding bundle.json and
+the files of a new skill:
+
+    bundle.json                     {"name": "default", "version": "1",
+                                     "executable": ["scripts/example.py"],
+                                     "directories": ["assets"],
+                                     "defaults": {"description": "..."}}
+    SKILL.md.tmpl                   rendered, written as SKILL.md
+    scripts/${skill_module}.py.tmpl paths may use placeholders too
+    assets/logo.png                 copied as is
+
+"directories" are created even when empty (git keeps no empty
+directories). `.tmpl` files and all paths are string.Template text:
+$name or ${name}, and $$ for a literal $. Every template gets skill_name,
+skill_title and skill_module; bundle.json defaults and per-skill
+variables add more.
+
+Bundles are compiled once per process and recompiled only when one of
+their files changes, so scaffolding a batch is substitution plus writes.
+Each skill is written into a temporary sibling directory and renamed into
+place: a failed scaffold never leaves a half-written skill behind.
+"""
+
+import json
+import os
+import shutil
+import string
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+
+BUNDLE_FILE = 'bundle.json'
+TEMPLATE_SUFFIX = '.tmpl'
+
+DEFAULT_BUNDLE = Path(__file__).resolve().parent.parent / 'assets' / 'templates' / 'default'
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+class BundleError(ValueError):
+    """A bundle that cannot be loaded, or variables it cannot be rendered with"""
+
+
+def title_case_skill_name(skill_name):
+    """Convert hyphenated skill name to Title Case for display."""
+    return ' '.join(word.capitalize() for word in skill_name.split('-'))
+
+
+def skill_variables(skill_name):
+    """Variables every template can use"""
+    return {
+        'skill_name': skill_name,
+        'skill_title': title_case_skill_name(skill_name),
+        'skill_module': skill_name.replace('-', '_'),
+    }
+
+
+class Bundle:
+    """A compiled template bundle"""
+
+    def __init__(self, source, meta, entries):
+        self.source = source
+        self.name = meta.get('name') or Path(source).stem
+        self.version = str(meta.get('version', '0'))
+        self.defaults = dict(meta.get('defaults') or {})
+        executable = set(meta.get('executable') or [])
+
+        # (path template, content template or raw bytes, mode) per file;
+        # directories carry content None
+        self.entries = []
+        required = set()
+        entries = [(rel, None, False) for rel in meta.get('directories') or []] + list(entries)
+        for rel, data, is_exec in entries:
+            if data is not None and rel.endswith(TEMPLATE_SUFFIX):
+                rel = rel[:-len(TEMPLATE_SUFFIX)]
+                try:
+                    data = string.Template(data.decode('utf-8'))
+                except UnicodeDecodeError as e:
+                    raise BundleError(f"{source}: {rel}{TEMPLATE_SUFFIX} is not UTF-8 text: {e}")
+            path = string.Template(rel)
+            for template in (path, data):
+                if isinstance(template, string.Template):
+                    if not template.is_valid():
+                        raise BundleError(f"{source}: invalid placeholder in {rel}")
+                    required.update(template.get_identifiers())
+            mode = 0o755 if is_exec or rel in executable else None
+            self.entries.append((path, data, mode))
+
+        self.required = required
+
+    def __str__(self):
+        return f"{self.name}@{self.version}"
+
+    def render(self, skill_name, variables=None):
+        """
+        Files of one skill
+
+        Returns:
+            {relative path: (bytes or None for a directory, mode or None)}
+
+        Raises:
+            BundleError: a placeholder has no value, or a path leaves the skill
+        """
+        values = dict(self.defaults)
+        values.update(skill_variables(skill_name))
+        values.update(variables or {})
+
+        missing = self.required - set(values)
+        if missing:
+            raise BundleError(f"{skill_name}: no value for {', '.join(sorted(missing))} (bundle {self})")
+
+        values = {key: str(value) for key, value in values.items()}
+        files = {}
+        for path, data, mode in self.entries:
+            rel = PurePosixPath(path.substitute(values))
+            if rel.is_absolute() or '..' in rel.parts or not rel.parts:
+                raise BundleError(f"{skill_name}: template path {path.template!r} renders outside the skill")
+            if isinstance(data, string.Template):
+                data = data.substitute(values).encode('utf-8')
+            files[str(rel)] = (data, mode)
+        return files
+
+
+def _walk_directory(root):
+    """(relative path, bytes or None for a directory, executable) under a bundle directory"""
+    entries = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        base = Path(dirpath)
+        for name in dirnames:
+            entries.append(((base / name).relative_to(root).as_posix(), None, False))
+        for name in sorted(filenames):
+            path = base / name
+            rel = path.relative_to(root).as_posix()
+            if rel != BUNDLE_FILE:
+                entries.append((rel, path.read_bytes(), bool(path.stat().st_mode & 0o111)))
+    return entries
+
+
+def _read_archive(archive):
+    """bundle.json text and entries of a zipped bundle (optionally under one top-level directory)"""
+    with zipfile.ZipFile(archive) as zf:
+        names = zf.namelist()
+        prefix = ''
+        if BUNDLE_FILE not in names:
+            candidates = [n[:-len(BUNDLE_FILE)] for n in names if n.endswith('/' + BUNDLE_FILE) and n.count('/') == 1]
+            if not candidates:
+                raise BundleError(f"{archive}: no {BUNDLE_FILE} in archive")
+            prefix = candidates[0]
+
+        meta = zf.read(prefix + BUNDLE_FILE).decode('utf-8')
+        entries = []
+        for info in sorted(zf.infolist(), key=lambda i: i.filename):
+            if not info.filename.startswith(prefix):
+                continue
+            rel = info.filename[len(prefix):].rstrip('/')
+            if not rel or rel == BUNDLE_FILE:
+                continue
+            if info.is_dir():
+                entries.append((rel, None, False))
+            else:
+                entries.append((rel, zf.read(info), bool((info.external_attr >> 16) & 0o111)))
+    return meta, entries
+
+
+def _signature(source):
+    """Changes whenever any file of the bundle changes"""
+    if source.is_file():
+        st = source.stat()
+        return (st.st_mtime_ns, st.st_size)
+    stamps = []
+    for dirpath, _, filenames in os.walk(source):
+        for name in filenames:
+            st = os.stat(os.path.join(dirpath, name))
+            stamps.append((dirpath, name, st.st_mtime_ns, st.st_size))
+    return tuple(sorted(stamps))
+
+
+def load_bundle(source=None):
+    """
+    Compiled bundle for a directory or .zip archive (default: the built-in bundle)
+
+    Compiled bundles are shared within the process and recompiled when
+    their files change.
+    """
+    source = Path(source).expanduser().resolve() if source else DEFAULT_BUNDLE
+    if not source.exists():
+        raise BundleError(f"Template bundle not found: {source}")
+
+    signature = _signature(source)
+    with _compiled_lock:
+        cached = _compiled.get(source)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+    try:
+        if source.is_file():
+            meta_text, entries = _read_archive(source)
+        else:
+            meta_text = (source / BUNDLE_FILE).read_text()
+            entries = _walk_directory(source)
+        meta = json.loads(meta_text)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        raise BundleError(f"Cannot load template bundle {source}: {e}")
+
+    bundle = Bundle(source, meta, entries)
+    with _compiled_lock:
+        _compiled[source] = (signature, bundle)
+    return bundle
+
+
+def write_skill(skill_dir, files, replace=False):
+    """
+    Write rendered files as a new skill directory, all or nothing
+
+    Everything goes into a temporary sibling directory first, which is
+    then renamed to skill_dir.
+
+    Raises:
+        FileExistsError: skill_dir exists and replace is False
+    """
+    skill_dir = Path(skill_dir)
+    if skill_dir.exists() and not replace:
+        raise FileExistsError(f"Skill directory already exists: {skill_dir}")
+
+    skill_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = skill_dir.parent / f'.{skill_dir.name}.tmp-{os.getpid()}-{threading.get_ident()}'
+    old_dir = None
+    try:
+        tmp_dir.mkdir()
+        directories = {tmp_dir / rel for rel, (data, _) in files.items() if data is None}
+        directories.update((tmp_dir / rel).parent for rel, (data, _) in files.items() if data is not None)
+        for directory in sorted(directories):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        for rel, (data, mode) in files.items():
+            if data is None:
+                continue
+            path = tmp_dir / rel
+            path.write_bytes(data)
+            if mode is not None:
+                path.chmod(mode)
+
+        if skill_dir.exists():
+            old_dir = skill_dir.parent / f'.{skill_dir.name}.old-{os.getpid()}-{threading.get_ident()}'
+            os.rename(skill_dir, old_dir)
+        os.rename(tmp_dir, skill_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if old_dir is not None and not skill_dir.exists():
+            os.rename(old_dir, skill_dir)
+        raise
+
+    if old_dir is not None:
+        shutil.rmtree(old_dir, ignore_errors=True)
+    return skill_dir
+
+
+def scaffold_skills(skills, path, bundle=None, workers=None):
+    """
+    Create many skills from one bundle
+
+    Every skill is rendered before anything is written, so a bad entry
+    (missing variable, invalid or duplicate name) stops the whole batch.
+    Skills whose directory already exists are skipped.
+
+    Args:
+        skills: [{'name': ..., other template variables...}]
+        path: Directory the skills are created in
+        bundle: Bundle, bundle path, or None for the built-in bundle
+        workers: Writer threads (default: min(8, CPU count + 4))
+
+    Returns:
+        [(name, skill directory, created)] in input order
+
+    Raises:
+        BundleError: the bundle cannot be loaded or an entry cannot be rendered
+    """
+    if not isinstance(bundle, Bundle):
+        bundle = load_bundle(bundle)
+    path = Path(path).resolve()
+
+    errors = []
+    seen = set()
+    rendered = []
+    for entry in skills:
+        variables = dict(entry)
+        name = str(variables.pop('name', '') or '').strip()
+        if not name or name in ('.', '..') or '/' in name or '\\' in name:
+            errors.append(f"Invalid skill name: {name!r}")
+            continue
+        if name in seen:
+            errors.append(f"Duplicate skill name: {name}")
+            continue
+        seen.add(name)
+        try:
+            rendered.append((name, bundle.render(name, variables)))
+        except BundleError as e:
+            errors.append(str(e))
+    if errors:
+        raise BundleError('\n'.join(errors))
+
+    def write(item):
+        name, files = item
+        skill_dir = path / name
+        try:
+            write_skill(skill_dir, files)
+            return name, skill_dir, True
+        except FileExistsError:
+            return name, skill_dir, False
+
+    workers = workers or min(8, (os.cpu_count() or 1) + 4)
+    if workers == 1 or len(rendered) <= 1:
+        return [write(item) for item in rendered]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(write, rendered))